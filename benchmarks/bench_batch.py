@@ -0,0 +1,61 @@
+"""Measures how BatchTranslator scales with the number of processes.
+
+Usage: python benchmarks/bench_batch.py [rows]
+"""
+from __future__ import absolute_import
+from __future__ import print_function
+from __future__ import unicode_literals
+
+import multiprocessing
+import sys
+import time
+from decimal import Decimal
+
+from flask_xuanzang import BatchTranslator, MappingLoader
+from flask_xuanzang.extension import Attan
+
+
+def build_loader():
+    loader = MappingLoader()
+    loader.set_messages('de', {
+        ('%(num)s item', 0): '%(num)s Artikel',
+        ('%(num)s item', 1): '%(num)s Artikel',
+        'Price': 'Preis',
+    })
+    return loader
+
+
+def render_row(translator, n):
+    return '{0}: {1} ({2})'.format(
+        translator.ugettext('Price'),
+        translator.format_decimal(Decimal(n) / 100),
+        translator.ungettext('%(num)s item', '%(num)s items', n % 7))
+
+
+def main():
+    rows = int(sys.argv[1]) if len(sys.argv) > 1 else 200000
+    loader = build_loader()
+
+    translator = Attan(None, 'de', None, loader=loader).bind('de')
+    start = time.time()
+    for n in range(rows):
+        render_row(translator, n)
+    serial = time.time() - start
+    print('{0} rows, {1} CPUs'.format(rows, multiprocessing.cpu_count()))
+    print('serial     {0:8.2f} s'.format(serial))
+
+    workers = 1
+    while workers <= max(multiprocessing.cpu_count(), 2):
+        with BatchTranslator(loader, 'de', max_workers=workers,
+                             chunksize=1024) as batch:
+            start = time.time()
+            for _ in batch.map(render_row, range(rows)):
+                pass
+            elapsed = time.time() - start
+        print('{0:2} procs   {1:8.2f} s  {2:5.2f}x'.format(
+            workers, elapsed, serial / elapsed))
+        workers *= 2
+
+
+if __name__ == '__main__':
+    main()
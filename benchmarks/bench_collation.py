@@ -0,0 +1,63 @@
+"""Measures sorting lists of translated labels with sort_localized.
+
+Compares plain code point order with locale-aware sorting that computes
+every key, and with sorting labels whose keys were cached by an earlier
+sort.
+
+Usage: python benchmarks/bench_collation.py [items]
+"""
+from __future__ import absolute_import
+from __future__ import print_function
+from __future__ import unicode_literals
+
+import random
+import sys
+import time
+
+from flask_xuanzang.collation import Collator, _fallback_key
+
+
+SYLLABLES = ['ka', 'Zé', 'lo', 'mü', 'Ån', 'ri', 'ße', 'tu', 'Ça', 'ni']
+
+
+def make_labels(count, distinct):
+    rng = random.Random(0)
+    labels = [''.join(rng.choice(SYLLABLES) for _ in range(4))
+              for _ in range(distinct)]
+    return [rng.choice(labels) for _ in range(count)]
+
+
+def measure(func, repeat=3):
+    best = None
+    for _ in range(repeat):
+        start = time.time()
+        func()
+        elapsed = time.time() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+    # Labels of a menu or a country list repeat a lot in a long table
+    labels = make_labels(count, 2000)
+    collator = Collator('de')
+    print('{0} items, {1} distinct, keys from {2}'.format(
+        count, len(set(labels)),
+        'ICU' if collator.sort_key is not _fallback_key else 'fallback'))
+
+    def cold():
+        Collator('de').sort(labels)
+
+    print('code points     {0:8.1f} ms'.format(
+        measure(lambda: sorted(labels)) * 1000))
+    print('uncached keys   {0:8.1f} ms'.format(
+        measure(lambda: sorted(labels, key=collator.sort_key)) * 1000))
+    print('cold cache      {0:8.1f} ms'.format(measure(cold) * 1000))
+    collator.sort(labels)
+    print('warm cache      {0:8.1f} ms'.format(
+        measure(lambda: collator.sort(labels)) * 1000))
+
+
+if __name__ == '__main__':
+    main()
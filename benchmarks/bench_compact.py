@@ -0,0 +1,86 @@
+"""Compares the memory taken by loaded catalogs with and without
+``XUANZANG_COMPACT_CATALOGS``.
+
+Usage: python benchmarks/bench_compact.py [messages] [locales]
+"""
+from __future__ import absolute_import
+from __future__ import print_function
+from __future__ import unicode_literals
+
+import gc
+import os
+import shutil
+import sys
+import tempfile
+import tracemalloc
+
+from babel.messages.catalog import Catalog
+from babel.messages.mofile import write_mo
+
+from flask_xuanzang.compact import MessageIndex, compact_translations
+from flask_xuanzang.loaders import DirectoryLoader
+
+
+LOCALES = [
+    'ar', 'bg', 'ca', 'cs', 'da', 'de', 'el', 'es', 'et', 'fi',
+    'fr', 'he', 'hi', 'hr', 'hu', 'id', 'it', 'ja', 'ko', 'lt',
+    'lv', 'ms', 'nb', 'nl', 'pl', 'pt', 'ro', 'ru', 'sk', 'sl',
+    'sr', 'sv', 'th', 'tr', 'uk', 'vi', 'zh', 'fa', 'bn', 'ta',
+]
+
+
+def write_catalogs(directory, messages, locales):
+    for locale in locales:
+        catalog = Catalog(locale=locale)
+        for n in range(messages):
+            msgid = 'Help text number {0} shown under a form field'.format(n)
+            catalog.add(msgid, '[{0}] {1}'.format(locale, msgid))
+            catalog.add(('{0} item'.format(n), '{0} items'.format(n)),
+                        ('[{0}] item'.format(locale),
+                         '[{0}] items'.format(locale)))
+        path = os.path.join(directory, locale, 'LC_MESSAGES')
+        os.makedirs(path)
+        with open(os.path.join(path, 'messages.mo'), 'wb') as f:
+            write_mo(f, catalog)
+
+
+def measure(load):
+    gc.collect()
+    tracemalloc.start()
+    catalogs = load()
+    gc.collect()
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return size, catalogs
+
+
+def main():
+    messages = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    locales = LOCALES[:int(sys.argv[2]) if len(sys.argv) > 2 else 40]
+
+    directory = tempfile.mkdtemp()
+    try:
+        write_catalogs(directory, messages, locales)
+        loader = DirectoryLoader(directory)
+
+        def load_plain():
+            return [loader.load(locale) for locale in locales]
+
+        def load_compact():
+            index = MessageIndex()
+            return [compact_translations(loader.load(locale), index)
+                    for locale in locales]
+
+        plain, _ = measure(load_plain)
+        compact, _ = measure(load_compact)
+    finally:
+        shutil.rmtree(directory)
+
+    print('{0} locales x {1} keys'.format(len(locales), messages * 3))
+    print('Translations:   {0:10.1f} KiB'.format(plain / 1024.0))
+    print('Compact:        {0:10.1f} KiB'.format(compact / 1024.0))
+    print('Reduction:      {0:10.2f}x'.format(float(plain) / compact))
+
+
+if __name__ == '__main__':
+    main()
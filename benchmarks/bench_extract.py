@@ -0,0 +1,80 @@
+"""Times message extraction on a generated source tree, in one process and
+with a process pool, without and with the per-file cache.
+
+Usage: python benchmarks/bench_extract.py [files] [jobs]
+"""
+from __future__ import absolute_import
+from __future__ import print_function
+from __future__ import unicode_literals
+
+import io
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+from flask_xuanzang.extract import extract_messages
+
+
+MODULE = '''
+from flask_xuanzang import gettext, lazy_gettext, ngettext, pgettext
+
+LABEL = lazy_gettext('Label {0}')
+
+'''
+
+FUNCTION = '''
+def view_{0}(count):
+    # NOTE: Message {0}
+    title = pgettext('view', 'Title {0}')
+    body = ngettext('%(num)s item {0}', '%(num)s items {0}', count)
+    return gettext('Shared message') + title + body
+
+'''
+
+
+def generate(directory, files):
+    for i in range(files):
+        package = os.path.join(directory, 'package{0}'.format(i % 20))
+        if not os.path.isdir(package):
+            os.makedirs(package)
+        with io.open(os.path.join(package, 'module{0}.py'.format(i)), 'w',
+                     encoding='utf-8') as f:
+            f.write(MODULE.replace('{0}', str(i)))
+            for j in range(40):
+                f.write(FUNCTION.format(i * 40 + j))
+
+
+def timed(label, directory, **kwargs):
+    start = time.time()
+    report = extract_messages([directory],
+                              os.path.join(directory, 'messages.pot'),
+                              comment_tags=['NOTE:'], **kwargs)
+    print('{0:<28} {1:7.2f} s  {2}'.format(label, time.time() - start,
+                                           report))
+
+
+def main():
+    files = int(sys.argv[1]) if len(sys.argv) > 1 else 400
+    jobs = int(sys.argv[2]) if len(sys.argv) > 2 else None
+    directory = tempfile.mkdtemp()
+    cache = os.path.join(directory, 'cache.json')
+    try:
+        generate(directory, files)
+        timed('one process', directory, jobs=1)
+        timed('process pool', directory, jobs=jobs)
+        timed('process pool, cold cache', directory, jobs=jobs,
+              cache_path=cache)
+        timed('warm cache', directory, jobs=jobs, cache_path=cache)
+        with io.open(os.path.join(directory, 'package0', 'module0.py'), 'a',
+                     encoding='utf-8') as f:
+            f.write(FUNCTION.format('changed'))
+        timed('warm cache, 1 file changed', directory, jobs=jobs,
+              cache_path=cache)
+    finally:
+        shutil.rmtree(directory)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,107 @@
+"""Compares rendering jobs of mixed locales with LocaleGroupRenderer
+against switching the locale of an application context for every job.
+
+Usage: python benchmarks/bench_grouped.py [jobs] [workers]
+"""
+from __future__ import absolute_import
+from __future__ import print_function
+from __future__ import unicode_literals
+
+import random
+import sys
+import time
+from decimal import Decimal
+
+from flask import Flask, g
+
+from flask_xuanzang import LocaleGroupRenderer, MappingLoader, Xuanzang
+from flask_xuanzang import format_decimal, ugettext, ungettext
+
+
+LOCALES = ['de', 'fr', 'es', 'it', 'nl', 'pt', 'sv', 'pl', 'ja', 'zh']
+
+
+def build_loader():
+    loader = MappingLoader()
+    for locale in LOCALES:
+        loader.set_messages(locale, {
+            'Hello %(name)s': '[{0}] Hello %(name)s'.format(locale),
+            'Your total is %(total)s': '[{0}] Total %(total)s'.format(locale),
+            ('%(num)s item', 0): '[{0}] %(num)s item'.format(locale),
+            ('%(num)s item', 1): '[{0}] %(num)s items'.format(locale),
+        })
+    return loader
+
+
+def render(translator, payload):
+    name, items, cents = payload
+    return '\n'.join([
+        translator.ugettext('Hello %(name)s', name=name),
+        translator.ungettext('%(num)s item', '%(num)s items', items),
+        translator.ugettext('Your total is %(total)s',
+                            total=translator.format_decimal(
+                                Decimal(cents) / 100)),
+    ])
+
+
+def render_in_context(payload):
+    name, items, cents = payload
+    return '\n'.join([
+        ugettext('Hello %(name)s', name=name),
+        ungettext('%(num)s item', '%(num)s items', items),
+        ugettext('Your total is %(total)s',
+                 total=format_decimal(Decimal(cents) / 100)),
+    ])
+
+
+def report(label, elapsed, count, baseline=None):
+    line = '{0:<28} {1:7.2f} s  {2:9.0f} jobs/s'.format(
+        label, elapsed, count / elapsed)
+    if baseline is not None:
+        line += '  {0:5.1f}x'.format(baseline / elapsed)
+    print(line)
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+    workers = int(sys.argv[2]) if len(sys.argv) > 2 else 2
+    random.seed(0)
+    jobs = [(random.choice(LOCALES),
+             ('user{0}'.format(i), i % 9, random.randrange(100000)))
+            for i in range(count)]
+    loader = build_loader()
+
+    app = Flask(__name__)
+    xuanzang = Xuanzang(app, loader=loader,
+                        locale_selector=lambda: g.job_locale)
+
+    start = time.time()
+    for locale, payload in jobs:
+        with app.test_request_context():
+            g.job_locale = locale
+            render_in_context(payload)
+    baseline = time.time() - start
+    report('context per job', baseline, count)
+
+    start = time.time()
+    with app.app_context():
+        for locale, payload in jobs:
+            g.job_locale = locale
+            xuanzang.refresh()
+            render_in_context(payload)
+    report('refresh per job', time.time() - start, count, baseline)
+
+    for label, kwargs in (('grouped', {}),
+                          ('grouped, {0} threads'.format(workers),
+                           {'max_workers': workers}),
+                          ('grouped, {0} processes'.format(workers),
+                           {'max_workers': workers, 'processes': True})):
+        with LocaleGroupRenderer.for_app(app, **kwargs) as renderer:
+            start = time.time()
+            for _ in renderer.map(render, jobs):
+                pass
+            report(label, time.time() - start, count, baseline)
+
+
+if __name__ == '__main__':
+    main()
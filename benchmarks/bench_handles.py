@@ -0,0 +1,45 @@
+"""Compares looking up long messages by msgid and by message handle.
+
+Usage: python benchmarks/bench_handles.py [length]
+"""
+from __future__ import absolute_import
+from __future__ import print_function
+from __future__ import unicode_literals
+
+import sys
+import timeit
+
+from flask import Flask
+
+from flask_xuanzang import Xuanzang, MappingLoader
+from flask_xuanzang import ugettext, message
+
+
+def main():
+    length = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    texts = ['{0} {1}'.format(n, 'x' * length) for n in range(100)]
+
+    loader = MappingLoader()
+    loader.set_messages('de', dict((t, t.upper()) for t in texts))
+    app = Flask(__name__)
+    app.config['XUANZANG_DEFAULT_LOCALE'] = 'de'
+    Xuanzang(app, loader=loader)
+    messages = [message(t) for t in texts]
+
+    with app.test_request_context():
+        def by_msgid():
+            for text in texts:
+                ugettext(text)
+
+        def by_handle():
+            for m in messages:
+                m.value
+
+        for name, func in (('msgid', by_msgid), ('handle', by_handle)):
+            seconds = min(timeit.repeat(func, number=100, repeat=5))
+            print('{0:8} {1:8.2f} us/lookup'.format(
+                name, seconds / (100 * len(texts)) * 1e6))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,65 @@
+"""Reports the cost of ``import flask_xuanzang`` using ``python -X
+importtime``, and fails if heavy modules that should only be imported on
+first use are imported eagerly.
+
+Usage: python benchmarks/bench_import.py [runs]
+"""
+from __future__ import absolute_import
+from __future__ import print_function
+from __future__ import unicode_literals
+
+import subprocess
+import sys
+
+
+# Modules that `import flask_xuanzang` and `init_app` must not import
+DEFERRED = ('babel', 'sqlite3', 'concurrent', 'multiprocessing')
+
+SCRIPT = '''
+from flask import Flask
+import flask_xuanzang
+flask_xuanzang.Xuanzang(Flask(__name__))
+'''
+
+
+def importtime(statement):
+    output = subprocess.check_output(
+        [sys.executable, '-X', 'importtime', '-c', statement],
+        stderr=subprocess.STDOUT, universal_newlines=True)
+    modules = {}
+    for line in output.splitlines():
+        if not line.startswith('import time:') or 'self [us]' in line:
+            continue
+        fields = line.split(':', 1)[1].split('|')
+        modules[fields[2].strip()] = (int(fields[0]), int(fields[1]))
+    return modules
+
+
+def main():
+    runs = int(sys.argv[1]) if len(sys.argv) > 1 else 5
+    # Warm up, so that bytecode compilation is not measured
+    importtime(SCRIPT)
+    baseline = [importtime('from flask import Flask; Flask(__name__)')]
+    measured = [importtime(SCRIPT) for _ in range(runs)]
+
+    flask_modules = set(baseline[0])
+
+    def added(modules):
+        return sum(self_us for name, (self_us, _) in modules.items()
+                   if name not in flask_modules) / 1000.0
+
+    timings = sorted(added(m) for m in measured)
+    print('Modules imported on top of Flask: {0}'.format(
+        len(set(measured[0]) - flask_modules)))
+    print('Import time on top of Flask: {0:.1f} ms (median {1:.1f} ms)'.format(
+        timings[0], timings[len(timings) // 2]))
+
+    deferred = sorted(name for name in measured[0]
+                      if name.split('.')[0] in DEFERRED)
+    if deferred:
+        print('Imported eagerly: {0}'.format(', '.join(deferred)))
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
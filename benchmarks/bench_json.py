@@ -0,0 +1,86 @@
+"""Compares encoding a large nested payload of lazy strings with
+XuanzangJSONProvider against a provider forcing each lazy string in its
+`default` hook.
+
+Usage: python benchmarks/bench_json.py [rows] [runs]
+"""
+from __future__ import absolute_import
+from __future__ import print_function
+from __future__ import unicode_literals
+
+import sys
+import time
+
+from flask import Flask
+from flask.json.provider import DefaultJSONProvider
+
+from flask_xuanzang import MappingLoader, Xuanzang
+from flask_xuanzang import lazy_pgettext, lazy_ugettext, lazy_ungettext
+from flask_xuanzang.json_provider import XuanzangJSONProvider
+from flask_xuanzang.lazy import LazyString
+
+
+class ForcingJSONProvider(DefaultJSONProvider):
+    @staticmethod
+    def default(o):
+        if isinstance(o, LazyString):
+            return str(o)
+        return DefaultJSONProvider.default(o)
+
+
+# Labels of a serializer schema, created once at import time
+FIELDS = dict(('field{0}'.format(i), lazy_ugettext('Field {0}'.format(i)))
+              for i in range(20))
+STATUSES = [lazy_pgettext('status', name)
+            for name in ('open', 'closed', 'pending')]
+
+
+def payload(rows):
+    return {
+        'title': lazy_ugettext('Orders'),
+        'fields': FIELDS,
+        'rows': [{
+            'id': i,
+            'status': STATUSES[i % 3],
+            'items': lazy_ungettext('%(num)s item', '%(num)s items', i % 7),
+            'labels': [FIELDS['field{0}'.format(j)] for j in range(5)],
+        } for i in range(rows)],
+    }
+
+
+def main():
+    rows = int(sys.argv[1]) if len(sys.argv) > 1 else 500
+    runs = int(sys.argv[2]) if len(sys.argv) > 2 else 20
+    loader = MappingLoader()
+    messages = dict(('Field {0}'.format(i), 'Feld {0}'.format(i))
+                    for i in range(20))
+    messages.update({
+        'Orders': 'Bestellungen',
+        'status\x04open': 'offen',
+        'status\x04closed': 'geschlossen',
+        'status\x04pending': 'ausstehend',
+        ('%(num)s item', 0): '%(num)s Artikel',
+        ('%(num)s item', 1): '%(num)s Artikel',
+    })
+    loader.set_messages('de', messages)
+    app = Flask(__name__)
+    app.config['XUANZANG_DEFAULT_LOCALE'] = 'de'
+    Xuanzang(app, loader=loader, locale_selector=lambda: 'de')
+    data = payload(rows)
+
+    results = {}
+    for label, provider in (('default hook', ForcingJSONProvider(app)),
+                            ('one pass', XuanzangJSONProvider(app))):
+        with app.test_request_context():
+            provider.dumps(data)
+            start = time.time()
+            for _ in range(runs):
+                results[label] = provider.dumps(data)
+            elapsed = (time.time() - start) / runs
+        print('{0:<14} {1:8.2f} ms/payload'.format(label, elapsed * 1e3))
+    assert results['default hook'] == results['one pass']
+    print('{0} rows, {1} lazy strings'.format(rows, 1 + 20 + rows * 7))
+
+
+if __name__ == '__main__':
+    main()
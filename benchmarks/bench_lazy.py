@@ -0,0 +1,70 @@
+"""Compares LazyString with the babel LazyProxy wrapping a
+functools.partial that lazy strings used to be, in creation time, memory
+and resolution time.
+
+Usage: python benchmarks/bench_lazy.py [count]
+"""
+from __future__ import absolute_import
+from __future__ import print_function
+from __future__ import unicode_literals
+
+import functools
+import sys
+import time
+import tracemalloc
+
+from babel.support import LazyProxy
+from flask import Flask
+
+from flask_xuanzang import Xuanzang, MappingLoader
+from flask_xuanzang.extension import _translate
+from flask_xuanzang.lazy import LazyString
+
+
+def proxy(name, *args, **variables):
+    func = functools.partial(_translate, name, *args, **variables)
+    return LazyProxy(func, enable_cache=False)
+
+
+def lazy_string(name, *args, **variables):
+    return LazyString(None, name, args, variables)
+
+
+def create(factory, messages):
+    # Form labels usually have no variables, plural labels have a count
+    return ([factory('ugettext', message) for message in messages] +
+            [factory('ungettext', message, message, 2) for message in messages])
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 10000
+    messages = ['Label {0}'.format(i) for i in range(count)]
+    loader = MappingLoader()
+    loader.set_messages('de', dict((m, m.upper()) for m in messages))
+    app = Flask(__name__)
+    app.config['XUANZANG_DEFAULT_LOCALE'] = 'de'
+    Xuanzang(app, loader=loader)
+
+    print('{0} lazy strings'.format(2 * count))
+    print('{0:14} {1:>12} {2:>12} {3:>12}'.format(
+        '', 'create us', 'bytes each', 'resolve us'))
+    for label, factory in (('LazyProxy', proxy), ('LazyString', lazy_string)):
+        tracemalloc.start()
+        start = time.time()
+        strings = create(factory, messages)
+        created = time.time() - start
+        size, _ = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+        with app.test_request_context():
+            start = time.time()
+            for s in strings:
+                '{0}'.format(s)
+            resolved = time.time() - start
+        print('{0:14} {1:12.2f} {2:12.0f} {3:12.2f}'.format(
+            label, created / len(strings) * 1e6, size / len(strings),
+            resolved / len(strings) * 1e6))
+
+
+if __name__ == '__main__':
+    main()
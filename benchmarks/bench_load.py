@@ -0,0 +1,194 @@
+"""Drives a sample application with many threads, reporting throughput and
+latency percentiles per endpoint, and counting responses rendered in
+another locale than the requested one.
+
+Requests go through the Flask test client by default, or through a local
+threaded WSGI server with --server.
+
+Usage: python benchmarks/bench_load.py [--threads N] [--requests N]
+                                       [--server] [--memo-size N]
+"""
+from __future__ import absolute_import
+from __future__ import print_function
+from __future__ import unicode_literals
+
+import argparse
+import logging
+import random
+import sys
+import threading
+import time
+from decimal import Decimal
+
+from flask import Flask, request
+
+from flask_xuanzang import Xuanzang, MappingLoader
+from flask_xuanzang import format_decimal, lazy_ugettext, ugettext
+
+
+LOCALES = ('de', 'fr', 'ja', 'zh_Hans_CN')
+MESSAGES = ['Label {0}'.format(i) for i in range(50)]
+NUMBERS = [Decimal(i * 7919) / 100 for i in range(50)]
+ENDPOINTS = ('/text', '/numbers', '/lazy')
+
+LAZY_MESSAGES = [lazy_ugettext(message) for message in MESSAGES]
+
+
+def build_loader():
+    loader = MappingLoader()
+    for locale in LOCALES:
+        # Every translation names its locale, so that a response rendered
+        # in the wrong locale can be told apart
+        loader.set_messages(locale, dict(
+            (message, '[{0}] {1}'.format(locale, message))
+            for message in MESSAGES))
+    return loader
+
+
+def create_app(memo_size):
+    app = Flask(__name__)
+    app.config['XUANZANG_REQUEST_MEMO_SIZE'] = memo_size
+    xuanzang = Xuanzang(app, loader=build_loader(),
+                        locale_selector=lambda: request.args['locale'])
+
+    @app.route('/text')
+    def text():
+        return '\n'.join(ugettext(message) for message in MESSAGES)
+
+    @app.route('/numbers')
+    def numbers():
+        return '\n'.join(format_decimal(number) for number in NUMBERS)
+
+    @app.route('/lazy')
+    def lazy():
+        return '\n'.join('{0}'.format(message) for message in LAZY_MESSAGES)
+
+    return app, xuanzang
+
+
+def expected_responses(app, xuanzang):
+    expected = {}
+    with app.app_context():
+        for locale in LOCALES:
+            translator = xuanzang.bind(locale)
+            text = '\n'.join(translator.ugettext(message)
+                             for message in MESSAGES)
+            expected['/text', locale] = text
+            expected['/lazy', locale] = text
+            expected['/numbers', locale] = '\n'.join(
+                translator.format_decimal(number) for number in NUMBERS)
+    return expected
+
+
+class TestClientTransport(object):
+    def __init__(self, app):
+        self.app = app
+
+    def session(self):
+        client = self.app.test_client()
+
+        def get(url):
+            response = client.get(url)
+            return response.status_code, response.get_data(as_text=True)
+        return get
+
+    def close(self):
+        pass
+
+
+class ServerTransport(object):
+    def __init__(self, app):
+        from werkzeug.serving import make_server
+        logging.getLogger('werkzeug').setLevel(logging.ERROR)
+        self.server = make_server('127.0.0.1', 0, app, threaded=True)
+        self.thread = threading.Thread(target=self.server.serve_forever)
+        self.thread.daemon = True
+        self.thread.start()
+
+    def session(self):
+        try:
+            from http.client import HTTPConnection
+        except ImportError:
+            from httplib import HTTPConnection
+        connection = HTTPConnection('127.0.0.1', self.server.server_port)
+
+        def get(url):
+            connection.request('GET', url)
+            response = connection.getresponse()
+            return response.status, response.read().decode('utf-8')
+        return get
+
+    def close(self):
+        self.server.shutdown()
+
+
+def worker(transport, expected, requests, seed, results):
+    rng = random.Random(seed)
+    get = transport.session()
+    for _ in range(requests):
+        endpoint = rng.choice(ENDPOINTS)
+        locale = rng.choice(LOCALES)
+        start = time.time()
+        status, body = get('{0}?locale={1}'.format(endpoint, locale))
+        latency = time.time() - start
+        ok = status == 200 and body == expected[endpoint, locale]
+        results.append((endpoint, latency, ok))
+
+
+def percentile(values, fraction):
+    index = min(int(len(values) * fraction), len(values) - 1)
+    return values[index]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--threads', type=int, default=16)
+    parser.add_argument('--requests', type=int, default=200,
+                        help='requests per thread')
+    parser.add_argument('--server', action='store_true',
+                        help='use a local threaded WSGI server')
+    parser.add_argument('--memo-size', type=int, default=0,
+                        help='value of XUANZANG_REQUEST_MEMO_SIZE')
+    args = parser.parse_args()
+
+    app, xuanzang = create_app(args.memo_size)
+    expected = expected_responses(app, xuanzang)
+    # A fresh application, so that catalogs are first loaded under load
+    app, xuanzang = create_app(args.memo_size)
+    transport = (ServerTransport if args.server else TestClientTransport)(app)
+
+    results = []
+    threads = [threading.Thread(target=worker,
+                                args=(transport, expected, args.requests,
+                                      seed, results))
+               for seed in range(args.threads)]
+    start = time.time()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.time() - start
+    transport.close()
+
+    print('{0} threads x {1} requests via {2}, memo size {3}'.format(
+        args.threads, args.requests,
+        'WSGI server' if args.server else 'test client', args.memo_size))
+    print('{0:10} {1:>7} {2:>9} {3:>8} {4:>8} {5:>8} {6:>6}'.format(
+        'endpoint', 'count', 'req/s', 'p50 ms', 'p90 ms', 'p99 ms', 'wrong'))
+    wrong_total = 0
+    for endpoint in ENDPOINTS + ('all',):
+        rows = [r for r in results if endpoint in ('all', r[0])]
+        latencies = sorted(latency for _, latency, _ in rows)
+        wrong = sum(1 for _, _, ok in rows if not ok)
+        if endpoint != 'all':
+            wrong_total += wrong
+        print('{0:10} {1:7} {2:9.0f} {3:8.2f} {4:8.2f} {5:8.2f} {6:6}'.format(
+            endpoint, len(rows), len(rows) / elapsed,
+            percentile(latencies, .5) * 1000,
+            percentile(latencies, .9) * 1000,
+            percentile(latencies, .99) * 1000, wrong))
+    return 1 if wrong_total else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,66 @@
+"""Compares translating with ICU MessageFormat compiled once per catalog,
+with ``%`` interpolation and with compiling the message on every call.
+
+Usage: python benchmarks/bench_messageformat.py [calls]
+"""
+from __future__ import absolute_import
+from __future__ import print_function
+from __future__ import unicode_literals
+
+import sys
+import time
+
+from flask_xuanzang import MappingLoader
+from flask_xuanzang.extension import Attan
+from flask_xuanzang.messageformat import compile_message
+
+
+PERCENT = ('%(name)s has %(num)d message', '%(name)s has %(num)d messages')
+ICU = '{name} has {num, plural, one {# message} other {# messages}}'
+
+
+def build_loader():
+    loader = MappingLoader()
+    loader.set_messages('de', {
+        (PERCENT[0], 0): '%(name)s hat %(num)d Nachricht',
+        (PERCENT[0], 1): '%(name)s hat %(num)d Nachrichten',
+        ICU: '{name} hat {num, plural, one {# Nachricht} '
+             'other {# Nachrichten}}',
+    })
+    return loader
+
+
+def measure(label, func, calls):
+    start = time.time()
+    for n in range(calls):
+        # Typical counts, which need no digit grouping
+        func(n % 50)
+    elapsed = time.time() - start
+    print('{0:22} {1:8.2f} us/call'.format(label, elapsed / calls * 1e6))
+
+
+def main():
+    calls = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+    loader = build_loader()
+    percent = Attan(None, 'de', None, loader=loader).bind('de')
+    icu = Attan(None, 'de', None, loader=loader,
+                message_syntax='icu').bind('de')
+    translations = icu.get_translations()
+    catalog_message = translations.ugettext(ICU)
+
+    print('{0} calls'.format(calls))
+    measure('percent ungettext',
+            lambda n: percent.ungettext(PERCENT[0], PERCENT[1], n,
+                                        name='Ann'), calls)
+    measure('icu, compiled once',
+            lambda n: icu.ugettext(ICU, name='Ann', num=n), calls)
+    measure('icu, grouped numbers',
+            lambda n: icu.ugettext(ICU, name='Ann', num=n + 10000), calls)
+    measure('icu, compiled per call',
+            lambda n: compile_message(catalog_message, icu.locale,
+                                      icu.get_date_formatter())(
+                {'name': 'Ann', 'num': n}), calls // 10)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,100 @@
+"""Compares serving localized URLs with XUANZANG_URL_LOCALES against
+duplicating every route for every locale in the URL map.
+
+Usage: python benchmarks/bench_routing.py [locales] [routes] [requests]
+"""
+from __future__ import absolute_import
+from __future__ import print_function
+from __future__ import unicode_literals
+
+import random
+import sys
+import time
+
+from flask import Flask, request
+from werkzeug.test import EnvironBuilder
+
+from flask_xuanzang import MappingLoader, Xuanzang, ugettext
+
+
+def slug(locale, route):
+    return 'route{0}-{1}'.format(route, locale)
+
+
+def make_loader(locales, routes):
+    loader = MappingLoader()
+    for locale in locales:
+        loader.set_messages(locale, dict(
+            ('url\x04route{0}'.format(route), slug(locale, route))
+            for route in range(routes)))
+    return loader
+
+
+def view(id):
+    return ugettext('Hello')
+
+
+def indexed_app(locales, routes, loader):
+    app = Flask(__name__)
+    app.config['XUANZANG_URL_LOCALES'] = locales
+    Xuanzang(app, loader=loader)
+    for route in range(routes):
+        app.add_url_rule('/route{0}/<int:id>'.format(route),
+                         'route{0}'.format(route), view)
+    return app
+
+
+def duplicated_app(locales, routes, loader):
+    app = Flask(__name__)
+    Xuanzang(app, loader=loader,
+             locale_selector=lambda: request.path.split('/')[1])
+    for locale in locales:
+        for route in range(routes):
+            app.add_url_rule('/{0}/{1}/<int:id>'.format(locale,
+                                                        slug(locale, route)),
+                             'route{0}_{1}'.format(route, locale),
+                             view)
+    return app
+
+
+def timed(label, app, paths):
+    environs = [EnvironBuilder(path=path).get_environ() for path in paths]
+    statuses = []
+
+    def start_response(status, headers):
+        statuses.append(status)
+
+    for environ in environs[:100]:
+        app.wsgi_app(dict(environ), start_response)
+    start = time.time()
+    for environ in environs:
+        app.wsgi_app(dict(environ), start_response)
+    elapsed = time.time() - start
+    assert set(statuses) == set(['200 OK']), set(statuses)
+    print('{0:<12} {1:8.1f} us/request  {2} rules'.format(
+        label, elapsed / len(paths) * 1e6,
+        len(list(app.url_map.iter_rules()))))
+
+
+def main():
+    locales = int(sys.argv[1]) if len(sys.argv) > 1 else 20
+    routes = int(sys.argv[2]) if len(sys.argv) > 2 else 200
+    requests = int(sys.argv[3]) if len(sys.argv) > 3 else 5000
+    locales = ['de', 'fr', 'es', 'it', 'nl', 'pt', 'sv', 'da', 'fi', 'nb',
+               'pl', 'cs', 'hu', 'ro', 'el', 'tr', 'ru', 'uk', 'ja', 'ko',
+               'zh', 'ar', 'he', 'th', 'vi'][:locales]
+    loader = make_loader(locales, routes)
+    random.seed(0)
+    paths = []
+    for _ in range(requests):
+        locale = random.choice(locales)
+        route = random.randrange(routes)
+        paths.append('/{0}/{1}/{2}'.format(locale, slug(locale, route),
+                                           random.randrange(1000)))
+
+    timed('indexed', indexed_app(locales, routes, loader), paths)
+    timed('duplicated', duplicated_app(locales, routes, loader), paths)
+
+
+if __name__ == '__main__':
+    main()
@@ -1,26 +1,53 @@
 from __future__ import absolute_import
 
-from flask_xuanzang.extension import Xuanzang
+from flask_xuanzang.extension import Xuanzang, LocaleTranslator
 from flask_xuanzang.extension import NumberFormatError
-from flask_xuanzang.extension import gettext, ngettext
+from flask_xuanzang.extension import gettext, ngettext, ngettext_many
 from flask_xuanzang.extension import ugettext, ungettext
 from flask_xuanzang.extension import pgettext, npgettext
 from flask_xuanzang.extension import lazy_gettext, lazy_ngettext
 from flask_xuanzang.extension import lazy_ugettext, lazy_ungettext
 from flask_xuanzang.extension import lazy_pgettext, lazy_npgettext
+from flask_xuanzang.extension import message
+from flask_xuanzang.extension import url_for
+from flask_xuanzang.lazy import LazyString, resolve_lazy_strings
 from flask_xuanzang.extension import format_decimal, parse_decimal
+from flask_xuanzang.extension import format_datetime, format_datetime_many
+from flask_xuanzang.extension import format_date, format_time
+from flask_xuanzang.extension import format_timedelta
+from flask_xuanzang.extension import collation_key, sort_localized
+from flask_xuanzang.batch import BatchTranslator, LocaleGroupRenderer
+from flask_xuanzang.blueprint import make_catalog_blueprint
+from flask_xuanzang.diff import CatalogDiff
+from flask_xuanzang.loaders import CatalogLoader, DirectoryLoader
+from flask_xuanzang.loaders import MappingLoader, SQLiteLoader
+from flask_xuanzang.loaders import RefreshReport
+from flask_xuanzang.messageformat import MessageFormatError
+from flask_xuanzang.missing import MissingTranslationCollector
 
 
 __all__ = [
-    'Xuanzang',
-    'NumberFormatError',
-    'gettext', 'ngettext',
+    'Xuanzang', 'LocaleTranslator',
+    'NumberFormatError', 'MessageFormatError',
+    'gettext', 'ngettext', 'ngettext_many',
     'ugettext', 'ungettext',
     'pgettext', 'npgettext',
     'lazy_gettext', 'lazy_ngettext',
     'lazy_ugettext', 'lazy_ungettext',
     'lazy_pgettext', 'lazy_npgettext',
+    'message', 'LazyString', 'resolve_lazy_strings',
+    'url_for',
     'format_decimal', 'parse_decimal',
+    'format_datetime', 'format_datetime_many',
+    'format_date', 'format_time',
+    'format_timedelta',
+    'collation_key', 'sort_localized',
+    'BatchTranslator', 'LocaleGroupRenderer',
+    'make_catalog_blueprint',
+    'CatalogLoader', 'DirectoryLoader',
+    'MappingLoader', 'SQLiteLoader',
+    'RefreshReport', 'CatalogDiff',
+    'MissingTranslationCollector',
 ]
 
 __version__ = '0.0.0'
@@ -0,0 +1,261 @@
+from __future__ import absolute_import
+from __future__ import unicode_literals
+
+import collections
+import functools
+import itertools
+
+from flask_xuanzang.extension import Attan
+
+
+# The state of the current worker process, set up by its first task since
+# process pools only take an initializer from Python 3.7 on
+_worker_attan = None
+_worker_translators = {}
+
+
+def _get_settings(attan):
+    return {
+        'missing_collector': attan.missing_collector,
+        'markup': attan.markup,
+        'message_syntax': attan.message_syntax,
+    }
+
+
+def _flush_missing(translator):
+    # Worker processes exit without running atexit handlers
+    collector = translator.get_missing_collector()
+    if collector is not None:
+        collector.flush()
+
+
+def _get_worker_translator(setup, locale):
+    global _worker_attan
+    if _worker_attan is None:
+        loader, settings = setup
+        _worker_attan = Attan(None, None, None, loader=loader, **settings)
+    translator = _worker_translators.get(locale)
+    if translator is None:
+        translator = _worker_translators[locale] = _worker_attan.bind(locale)
+    return translator
+
+
+def _render_chunk(translator, func, items):
+    return [func(translator, item) for item in items]
+
+
+def _run_chunk(setup, locale, func, items):
+    translator = _get_worker_translator(setup, locale)
+    results = _render_chunk(translator, func, items)
+    _flush_missing(translator)
+    return results
+
+
+class BatchTranslator(object):
+    """Runs translation and formatting jobs for one locale on a pool of
+    processes, outside of any application context.
+
+    Every worker process loads the catalog of `locale` from `loader` once,
+    on its first task. `loader` and the settings are sent along with every
+    chunk of items, so the loader should be cheap to pickle, as a
+    :class:`DirectoryLoader` is.
+
+    :param loader: A picklable :class:`CatalogLoader`
+    :param locale: The locale to translate into
+    :param max_workers: Number of processes, defaults to the number of CPUs
+    :param chunksize: Number of items sent to a worker at a time
+    :param missing_collector: A picklable
+                              :class:`MissingTranslationCollector`, copied
+                              to every worker process
+    :param markup: Whether messages are escaped as with ``XUANZANG_MARKUP``
+    :param message_syntax: The ``XUANZANG_MESSAGE_SYNTAX`` of messages
+    """
+
+    def __init__(self, loader, locale, max_workers=None, chunksize=256,
+                 missing_collector=None, markup=False,
+                 message_syntax='percent'):
+        self.loader = loader
+        self.locale = locale
+        self.chunksize = chunksize
+        import multiprocessing
+        from concurrent.futures import ProcessPoolExecutor
+
+        self.max_workers = max_workers or multiprocessing.cpu_count()
+        self._setup = (loader, {
+            'missing_collector': missing_collector,
+            'markup': markup,
+            'message_syntax': message_syntax,
+        })
+        self.executor = ProcessPoolExecutor(self.max_workers)
+
+    @classmethod
+    def for_app(cls, app, locale, **kwargs):
+        """Creates a batch translator using the catalog loader and settings
+        of `app`.
+        """
+        attan = app.extensions['xuanzang']
+        settings = _get_settings(attan)
+        settings.update(kwargs)
+        return cls(attan.loader, locale, **settings)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.shutdown()
+
+    def map(self, func, iterable):
+        """Calls ``func(translator, item)`` for every item of `iterable` in
+        the worker processes, where `translator` is a
+        :class:`LocaleTranslator`. `func` must be picklable, e.g. defined at
+        module level.
+
+        Items are read and sent in chunks, with a bounded number of chunks
+        in flight, so `iterable` can be larger than memory.
+
+        :returns: an iterator of the results in the order of `iterable`
+        """
+        run = functools.partial(_run_chunk, self._setup, str(self.locale),
+                                func)
+        items = iter(iterable)
+        pending = collections.deque()
+        while True:
+            while len(pending) < self.max_workers * 2:
+                chunk = list(itertools.islice(items, self.chunksize))
+                if not chunk:
+                    break
+                pending.append(self.executor.submit(run, chunk))
+            if not pending:
+                return
+            for result in pending.popleft().result():
+                yield result
+
+    def shutdown(self, wait=True):
+        self.executor.shutdown(wait)
+
+
+class LocaleGroupRenderer(object):
+    """Runs translation and formatting jobs each in its own locale, such as
+    rendering notifications for recipients of many languages.
+
+    Jobs are read into a buffer of at most `buffer_size` jobs and grouped by
+    locale. Every group is then rendered with a :class:`LocaleTranslator`
+    bound once per locale, rather than by switching the locale of an
+    application context for every job. Groups are rendered in the calling
+    thread, or on a pool of `max_workers` threads or processes.
+
+    :param loader: A :class:`CatalogLoader`, picklable with `processes`, in
+                   which case it is sent along with every chunk of jobs
+    :param max_workers: Number of threads or processes, or ``0`` to render
+                        in the calling thread
+    :param processes: Whether to use processes rather than threads
+    :param buffer_size: Maximum number of jobs read ahead
+    :param chunksize: Maximum number of jobs sent to a worker at a time
+    :param missing_collector: A :class:`MissingTranslationCollector`,
+                              copied to every worker with `processes`
+    :param markup: Whether messages are escaped as with ``XUANZANG_MARKUP``
+    :param message_syntax: The ``XUANZANG_MESSAGE_SYNTAX`` of messages
+    """
+
+    def __init__(self, loader, max_workers=0, processes=False,
+                 buffer_size=10000, chunksize=1024, missing_collector=None,
+                 markup=False, message_syntax='percent'):
+        self.loader = loader
+        self.max_workers = max_workers
+        self.buffer_size = buffer_size
+        self.chunksize = chunksize
+        self.attan = Attan(None, None, None, missing_collector,
+                           loader=loader, markup=markup,
+                           message_syntax=message_syntax)
+        self.translators = {}
+        self.executor = None
+        self.processes = processes
+        if max_workers and processes:
+            from concurrent.futures import ProcessPoolExecutor
+            self._setup = (loader, _get_settings(self.attan))
+            self.executor = ProcessPoolExecutor(max_workers)
+        elif max_workers:
+            from concurrent.futures import ThreadPoolExecutor
+            self.executor = ThreadPoolExecutor(max_workers)
+
+    @classmethod
+    def for_app(cls, app, **kwargs):
+        """Creates a renderer with the settings of `app`, sharing its
+        catalogs when rendering in this process.
+        """
+        attan = app.extensions['xuanzang']
+        settings = _get_settings(attan)
+        settings.update(kwargs)
+        renderer = cls(attan.loader, **settings)
+        renderer.attan = attan
+        return renderer
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.shutdown()
+
+    def get_translator(self, locale):
+        """Returns the :class:`LocaleTranslator` of `locale`, binding it the
+        first time.
+        """
+        translator = self.translators.get(locale)
+        if translator is None:
+            translator = self.translators[locale] = self.attan.bind(locale)
+        return translator
+
+    def _render_buffer(self, func, jobs):
+        groups = collections.OrderedDict()
+        for position, (locale, payload) in enumerate(jobs):
+            locale = str(locale)
+            group = groups.get(locale)
+            if group is None:
+                group = groups[locale] = ([], [])
+            group[0].append(position)
+            group[1].append(payload)
+
+        results = [None] * len(jobs)
+        if self.executor is None:
+            for locale, (positions, payloads) in groups.items():
+                translator = self.get_translator(locale)
+                for position, payload in zip(positions, payloads):
+                    results[position] = func(translator, payload)
+            return results
+
+        # Worker processes bind their own translators
+        pending = []
+        for locale, (positions, payloads) in groups.items():
+            if self.processes:
+                run = functools.partial(_run_chunk, self._setup, locale)
+            else:
+                run = functools.partial(_render_chunk,
+                                        self.get_translator(locale))
+            for start in range(0, len(payloads), self.chunksize):
+                end = start + self.chunksize
+                future = self.executor.submit(run, func, payloads[start:end])
+                pending.append((positions[start:end], future))
+        for positions, future in pending:
+            for position, result in zip(positions, future.result()):
+                results[position] = result
+        return results
+
+    def map(self, func, jobs):
+        """Calls ``func(translator, payload)`` for every ``(locale,
+        payload)`` job of `jobs`, where `translator` is a
+        :class:`LocaleTranslator` for `locale`. With `processes`, `func`
+        must be picklable, e.g. defined at module level.
+
+        :returns: an iterator of the results in the order of `jobs`
+        """
+        jobs = iter(jobs)
+        while True:
+            buffered = list(itertools.islice(jobs, self.buffer_size))
+            if not buffered:
+                return
+            for result in self._render_buffer(func, buffered):
+                yield result
+
+    def shutdown(self, wait=True):
+        if self.executor is not None:
+            self.executor.shutdown(wait)
@@ -0,0 +1,172 @@
+from __future__ import absolute_import
+from __future__ import unicode_literals
+
+import gzip
+import hashlib
+import io
+import json
+
+from flask import Blueprint, abort, current_app, request
+
+from flask_xuanzang.cache import LRUCache
+from flask_xuanzang.extension import Xuanzang, _parse_locale
+
+
+# Preferred content codings, best first
+ENCODINGS = ('br', 'gzip')
+
+
+def _gzip(data):
+    buf = io.BytesIO()
+    # A fixed mtime keeps the output, and thus its ETag, reproducible
+    with gzip.GzipFile(fileobj=buf, mode='wb', compresslevel=9,
+                       mtime=0) as f:
+        f.write(data)
+    return buf.getvalue()
+
+
+def _brotli(data):
+    try:
+        import brotli
+    except ImportError:
+        return None
+    return brotli.compress(data)
+
+
+class CatalogPayload(object):
+    """JSON serialization of a catalog, along with its precompressed
+    variants and strong ETag.
+    """
+
+    __slots__ = ('body', 'etag', 'encoded')
+
+    def __init__(self, body):
+        self.body = body
+        self.etag = hashlib.sha1(body).hexdigest()
+        self.encoded = {'gzip': _gzip(body)}
+        compressed = _brotli(body)
+        if compressed is not None:
+            self.encoded['br'] = compressed
+
+
+def catalog_to_json(locale, translations, prefix=None, context=None):
+    """Returns the messages of `translations` as a dict ready to be
+    serialized to JSON.
+
+    Messages with a context are keyed by ``'context\\x04msgid'``, and plural
+    messages have a list of forms. Only messages whose msgid starts with
+    `prefix`, or that are in `context`, are included when given.
+    """
+    catalog = getattr(translations, '_catalog', None) or {}
+    info = getattr(translations, '_info', None) or {}
+    messages = {}
+    for key, value in catalog.items():
+        if isinstance(key, tuple):
+            key, index = key
+        else:
+            index = None
+        if not key:
+            continue
+        message_context, _, msgid = key.rpartition('\x04')
+        if context is not None and message_context != context:
+            continue
+        if prefix and not msgid.startswith(prefix):
+            continue
+        if index is None:
+            messages[key] = value
+        else:
+            forms = messages.setdefault(key, [])
+            forms.extend([None] * (index + 1 - len(forms)))
+            forms[index] = value
+    return {
+        'locale': str(locale),
+        'plural_forms': info.get('plural-forms'),
+        'messages': messages,
+    }
+
+
+def get_payload(locale, translations, prefix=None, context=None,
+                cache_size=64):
+    """Returns the :class:`CatalogPayload` of `translations`, serializing it
+    only the first time a filter is used.
+
+    Payloads are stored on the catalog, so they are dropped along with it
+    when translations are refreshed.
+    """
+    cache = getattr(translations, '_xuanzang_payloads', None)
+    if cache is None:
+        cache = translations._xuanzang_payloads = LRUCache(cache_size)
+    key = (prefix, context)
+    payload = cache.get(key)
+    if payload is None:
+        data = catalog_to_json(locale, translations, prefix, context)
+        body = json.dumps(data, ensure_ascii=False, sort_keys=True,
+                          separators=(',', ':')).encode('utf-8')
+        payload = CatalogPayload(body)
+        cache.set(key, payload)
+    return payload
+
+
+def _negotiate(payload):
+    accept = request.accept_encodings
+    for encoding in ENCODINGS:
+        if encoding in payload.encoded and accept.quality(encoding) > 0:
+            return encoding
+    return None
+
+
+def make_catalog_blueprint(name='xuanzang_catalogs', import_name=__name__,
+                           locales=None, cache_size=64, **options):
+    """Returns a blueprint serving the catalogs loaded by the extension as
+    JSON, e.g. for client-side translations.
+
+    ``GET /<locale>.json`` returns the catalog of `locale`, restricted to the
+    msgids starting with the ``prefix`` argument, or to the messages in the
+    ``context`` argument, when given. Responses are gzip or, if the
+    :mod:`brotli` module is installed, brotli-compressed when the client
+    accepts it, and carry a strong ETag answered with ``304 Not Modified``.
+
+    :param locales: Locales that can be requested, or ``None`` to allow any
+    :param cache_size: Maximum number of filtered payloads kept per catalog
+    :param options: Passed to :class:`flask.Blueprint`, e.g. `url_prefix`
+    """
+    blueprint = Blueprint(name, import_name, **options)
+    allowed = None
+    if locales is not None:
+        allowed = set(str(_parse_locale(locale)) for locale in locales)
+
+    @blueprint.route('/<locale>.json')
+    def catalog(locale):
+        from babel.core import UnknownLocaleError
+        try:
+            locale = _parse_locale(locale)
+        except (ValueError, UnknownLocaleError):
+            abort(404)
+        if allowed is not None and str(locale) not in allowed:
+            abort(404)
+
+        translations = Xuanzang.get_attan().load_translations(locale)
+        payload = get_payload(locale, translations,
+                              request.args.get('prefix') or None,
+                              request.args.get('context'), cache_size)
+        encoding = _negotiate(payload)
+        etag = payload.etag
+        if encoding is not None:
+            etag = '{0}-{1}'.format(etag, encoding)
+
+        if request.if_none_match.contains(etag):
+            response = current_app.response_class(status=304)
+        else:
+            body = payload.body
+            if encoding is not None:
+                body = payload.encoded[encoding]
+            response = current_app.response_class(
+                body, mimetype='application/json')
+            if encoding is not None:
+                response.headers['Content-Encoding'] = encoding
+        response.set_etag(etag)
+        response.headers['Vary'] = 'Accept-Encoding'
+        response.headers['Cache-Control'] = 'no-cache'
+        return response
+
+    return blueprint
@@ -0,0 +1,111 @@
+from __future__ import absolute_import
+from __future__ import unicode_literals
+
+import collections
+import threading
+import time
+
+
+class LRUCache(object):
+    """A thread-safe mapping that evicts the least recently used entry once
+    more than `maxsize` entries are stored.
+    """
+
+    def __init__(self, maxsize):
+        self.maxsize = maxsize
+        self._data = collections.OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._data)
+
+    def __contains__(self, key):
+        return key in self._data
+
+    def get(self, key, default=None):
+        with self._lock:
+            try:
+                value = self._data.pop(key)
+            except KeyError:
+                return default
+            self._data[key] = value
+            return value
+
+    def set(self, key, value):
+        with self._lock:
+            self._data.pop(key, None)
+            self._data[key] = value
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def pop(self, key, default=None):
+        with self._lock:
+            return self._data.pop(key, default)
+
+    def discard_if(self, predicate):
+        """Removes every entry whose key satisfies `predicate`."""
+        with self._lock:
+            for key in [k for k in self._data if predicate(k)]:
+                del self._data[key]
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+
+class TTLCache(LRUCache):
+    """An :class:`LRUCache` whose entries also expire `ttl` seconds after
+    they were set.
+    """
+
+    def __init__(self, maxsize, ttl, timer=time.time):
+        super(TTLCache, self).__init__(maxsize)
+        self.ttl = ttl
+        self.timer = timer
+
+    def get(self, key, default=None):
+        entry = super(TTLCache, self).get(key)
+        if entry is None:
+            return default
+        expires, value = entry
+        if expires <= self.timer():
+            self.pop(key)
+            return default
+        return value
+
+    def set(self, key, value):
+        entry = (self.timer() + self.ttl, value)
+        super(TTLCache, self).set(key, entry)
+
+    def invalidate(self, key):
+        """Removes the entry of `key`, if any."""
+        self.pop(key)
+
+
+class RequestMemo(object):
+    """A mapping of at most `maxsize` entries that counts its hits and
+    misses. Once full, new entries are not stored.
+
+    It is not thread-safe, as it is meant to be used by a single request.
+    """
+
+    def __init__(self, maxsize):
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._data = {}
+
+    def __len__(self):
+        return len(self._data)
+
+    def get(self, key):
+        value = self._data.get(key)
+        if value is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return value
+
+    def set(self, key, value):
+        if len(self._data) < self.maxsize:
+            self._data[key] = value
@@ -0,0 +1,80 @@
+from __future__ import absolute_import
+from __future__ import unicode_literals
+
+import unicodedata
+
+
+KEY_CACHE_SIZE = 100000
+
+text_type = type('')
+
+
+def _text(s):
+    # On Python 2 gettext returns UTF-8 encoded byte strings
+    if isinstance(s, bytes):
+        return s.decode('utf-8')
+    return text_type(s)
+
+
+def _fallback_key(s):
+    # Approximates the multi-level comparison of the Unicode Collation
+    # Algorithm: base letters first, then accents, then case, with lower
+    # case first.
+    decomposed = unicodedata.normalize('NFKD', s)
+    base = ''.join(c for c in decomposed if not unicodedata.combining(c))
+    return (base.lower(), decomposed.lower(), s.swapcase())
+
+
+def _icu_sort_key(locale):
+    try:
+        import icu
+    except ImportError:
+        return None
+    collator = icu.Collator.createInstance(icu.Locale(str(locale)))
+    return collator.getSortKey
+
+
+class Collator(object):
+    """Compares strings in the order of `locale`.
+
+    Sort keys come from ICU if PyICU is installed, e.g. with the ``icu``
+    extra, and from a locale-independent approximation otherwise. Keys of up to
+    `cache_size` strings are kept, so sorting strings that were sorted
+    before, such as translated labels, only looks their keys up.
+    """
+
+    def __init__(self, locale, cache_size=KEY_CACHE_SIZE):
+        self.locale = locale
+        self.cache_size = cache_size
+        self.sort_key = _icu_sort_key(locale) or _fallback_key
+        self._keys = {}
+
+    def __len__(self):
+        return len(self._keys)
+
+    def key(self, s):
+        """Returns the sort key of `s`, which may be a lazy string."""
+        if not isinstance(s, text_type):
+            s = _text(s)
+        k = self._keys.get(s)
+        if k is None:
+            k = self.sort_key(s)
+            if len(self._keys) < self.cache_size:
+                self._keys[s] = k
+        return k
+
+    def sort(self, items, key=None, reverse=False):
+        """Returns a list of `items` sorted by their strings, or by the
+        strings returned by `key` when given.
+        """
+        keys = self._keys
+        collation_key = self.key
+
+        def item_key(item):
+            s = item if key is None else key(item)
+            if not isinstance(s, text_type):
+                s = _text(s)
+            k = keys.get(s)
+            return collation_key(s) if k is None else k
+
+        return sorted(items, key=item_key, reverse=reverse)
@@ -0,0 +1,106 @@
+from __future__ import absolute_import
+from __future__ import unicode_literals
+
+import gettext
+import threading
+
+
+class MessageIndex(object):
+    """Assigns an integer id to every catalog key, shared by the catalogs of
+    all locales.
+
+    Keys are stored once no matter how many catalogs contain them, and the
+    msgids inside plural keys are interned as well.
+    """
+
+    def __init__(self):
+        self.ids = {}
+        self._strings = {}
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self.ids)
+
+    def _intern(self, key):
+        if isinstance(key, tuple):
+            msgid, index = key
+            return (self._strings.setdefault(msgid, msgid), index)
+        return self._strings.setdefault(key, key)
+
+    def get(self, key):
+        """Returns the id of `key`, or ``None`` if it has none."""
+        return self.ids.get(key)
+
+    def add(self, key):
+        """Returns the id of `key`, assigning a new one if needed."""
+        id = self.ids.get(key)
+        if id is None:
+            with self._lock:
+                id = self.ids.get(key)
+                if id is None:
+                    id = self.ids[self._intern(key)] = len(self.ids)
+        return id
+
+
+class CompactCatalog(object):
+    """Read-only mapping of catalog keys to messages, storing only the
+    messages of one locale in a list indexed by the ids of a
+    :class:`MessageIndex`.
+    """
+
+    __slots__ = ('index', 'values')
+
+    def __init__(self, index, values):
+        self.index = index
+        self.values = values
+
+    def __getitem__(self, key):
+        id = self.index.ids[key]
+        values = self.values
+        if id < len(values):
+            value = values[id]
+            if value is not None:
+                return value
+        raise KeyError(key)
+
+    def get(self, key, default=None):
+        try:
+            return self[key]
+        except KeyError:
+            return default
+
+    def __contains__(self, key):
+        return self.get(key) is not None
+
+    def __iter__(self):
+        values = self.values
+        for key, id in list(self.index.ids.items()):
+            if id < len(values) and values[id] is not None:
+                yield key
+
+    def __len__(self):
+        return len(self.values) - self.values.count(None)
+
+    def keys(self):
+        return list(self)
+
+    def items(self):
+        return [(key, self[key]) for key in self]
+
+
+def compact_translations(translations, index):
+    """Replaces the catalog of `translations` with a
+    :class:`CompactCatalog` storing its keys in the shared `index`.
+
+    Catalogs that do not come from a ``.mo`` file are left untouched.
+    """
+    if not isinstance(translations, gettext.GNUTranslations):
+        return translations
+    ids = [(index.add(key), value)
+           for key, value in translations._catalog.items()]
+    values = [None] * len(index)
+    for id, value in ids:
+        values[id] = value
+
+    translations._catalog = CompactCatalog(index, values)
+    return translations
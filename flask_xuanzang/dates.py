@@ -0,0 +1,87 @@
+from __future__ import absolute_import
+from __future__ import unicode_literals
+
+import datetime as _datetime
+
+from babel import dates
+
+
+NAMED_FORMATS = ('full', 'long', 'medium', 'short')
+
+_timezones = {}
+
+
+def get_timezone(zone):
+    """Like :func:`babel.dates.get_timezone`, but looks each zone name up
+    only once. ``None`` and ``tzinfo`` objects are returned unchanged.
+    """
+    if zone is None or isinstance(zone, _datetime.tzinfo):
+        return zone
+    tzinfo = _timezones.get(zone)
+    if tzinfo is None:
+        tzinfo = _timezones[zone] = dates.get_timezone(zone)
+    return tzinfo
+
+
+class DateFormatter(object):
+    """Formats dates and times for `locale`.
+
+    Patterns are resolved from the CLDR data and parsed into
+    ``DateTimePattern`` objects the first time each format is used.
+    """
+
+    def __init__(self, locale):
+        self.locale = locale
+        self._patterns = {}
+
+    def get_pattern(self, kind, format):
+        """Returns the parsed pattern of `format` for a ``'date'``,
+        ``'time'`` or ``'datetime'``.
+        """
+        key = (kind, format)
+        pattern = self._patterns.get(key)
+        if pattern is None:
+            pattern = self._patterns[key] = self._parse_pattern(kind, format)
+        return pattern
+
+    def _parse_pattern(self, kind, format):
+        if format not in NAMED_FORMATS:
+            return dates.parse_pattern(format)
+        if kind == 'date':
+            return dates.get_date_format(format, locale=self.locale)
+        if kind == 'time':
+            return dates.get_time_format(format, locale=self.locale)
+        # Combine the date and the time patterns into a single pattern, so
+        # that formatting a datetime is a single pass.
+        date = self.get_pattern('date', format).pattern
+        time = self.get_pattern('time', format).pattern
+        pattern = dates.get_datetime_format(format, locale=self.locale)
+        return dates.parse_pattern(
+            pattern.replace('{0}', time).replace('{1}', date))
+
+    def format_datetime(self, datetime=None, format='medium', tzinfo=None):
+        pattern = self.get_pattern('datetime', format)
+        return dates.format_datetime(datetime, pattern,
+                                     get_timezone(tzinfo), self.locale)
+
+    def format_datetime_many(self, datetimes, format='medium', tzinfo=None):
+        pattern = self.get_pattern('datetime', format)
+        tzinfo = get_timezone(tzinfo)
+        locale = self.locale
+        format_datetime = dates.format_datetime
+        return [format_datetime(datetime, pattern, tzinfo, locale)
+                for datetime in datetimes]
+
+    def format_date(self, date=None, format='medium'):
+        pattern = self.get_pattern('date', format)
+        return dates.format_date(date, pattern, self.locale)
+
+    def format_time(self, time=None, format='medium', tzinfo=None):
+        pattern = self.get_pattern('time', format)
+        return dates.format_time(time, pattern, get_timezone(tzinfo),
+                                 self.locale)
+
+    def format_timedelta(self, delta, granularity='second', threshold=.85,
+                         add_direction=False, format='long'):
+        return dates.format_timedelta(delta, granularity, threshold,
+                                      add_direction, format, self.locale)
@@ -0,0 +1,81 @@
+from __future__ import absolute_import
+from __future__ import unicode_literals
+
+import gettext
+
+
+def _msgid(key):
+    return key[0] if isinstance(key, tuple) else key
+
+
+def _contains(catalog, msgid):
+    return msgid in catalog or (msgid, 0) in catalog
+
+
+class CatalogDiff(object):
+    """Messages that differ between two versions of a catalog.
+
+    Messages are identified by their catalog key without the plural index,
+    i.e. the msgid, or ``'context\\x04msgid'`` for messages with a context.
+
+    :ivar added: Messages only in the new catalog
+    :ivar removed: Messages only in the old catalog
+    :ivar changed: Messages translated differently
+    :ivar header_changed: Whether the metadata of the catalog changed
+    """
+
+    def __init__(self):
+        self.added = set()
+        self.removed = set()
+        self.changed = set()
+        self.header_changed = False
+
+    def __bool__(self):
+        return bool(self.added or self.removed or self.changed or
+                    self.header_changed)
+
+    __nonzero__ = __bool__
+
+    def __repr__(self):
+        return '<CatalogDiff: {0} added, {1} removed, {2} changed>'.format(
+            len(self.added), len(self.removed), len(self.changed))
+
+
+def merge_catalog(old, new):
+    """Compares the catalog of `new` with the one of `old`, and makes `new`
+    share the strings of `old` for messages that did not change, so that
+    the strings of the new catalog that are equal to the old ones can be
+    freed.
+
+    :returns: a :class:`CatalogDiff`, or ``None`` if either is not a
+              catalog loaded from a ``.mo`` file
+    """
+    if not (isinstance(old, gettext.GNUTranslations) and
+            isinstance(new, gettext.GNUTranslations)):
+        return None
+    old_catalog = old._catalog
+    new_catalog = new._catalog
+    diff = CatalogDiff()
+    differing = set()
+    for key, value in new_catalog.items():
+        old_value = old_catalog.get(key)
+        if old_value == value:
+            new_catalog[key] = old_value
+        elif key:
+            differing.add(_msgid(key))
+        else:
+            diff.header_changed = True
+    for key in old_catalog:
+        if key and key not in new_catalog:
+            differing.add(_msgid(key))
+
+    for msgid in differing:
+        in_old = _contains(old_catalog, msgid)
+        in_new = _contains(new_catalog, msgid)
+        if in_old and in_new:
+            diff.changed.add(msgid)
+        elif in_new:
+            diff.added.add(msgid)
+        else:
+            diff.removed.add(msgid)
+    return diff
@@ -1,14 +1,129 @@
 from __future__ import absolute_import
 from __future__ import unicode_literals
 
+import collections
 import functools
+import logging
 import os
+import sys
+import threading
+import time
+import weakref
 
-from babel import numbers
-from babel.support import LazyProxy, Locale, Translations
 from flask import current_app
 from flask import _app_ctx_stack
 
+from flask_xuanzang.cache import LRUCache, RequestMemo, TTLCache
+from flask_xuanzang import shared
+from flask_xuanzang.compact import compact_translations
+from flask_xuanzang.diff import merge_catalog
+from flask_xuanzang.handles import get_table, in_definition, registry
+from flask_xuanzang.lazy import LazyString
+from flask_xuanzang.loaders import CONTEXT_ENCODING, DirectoryLoader
+from flask_xuanzang.loaders import RefreshReport, RefreshThread
+
+# Babel and its CLDR data are imported when first needed rather than here,
+# so that importing this module stays cheap for processes that never
+# translate anything. See benchmarks/bench_import.py.
+
+
+logger = logging.getLogger(__name__)
+
+PY2 = (sys.version_info[0] == 2)
+
+# Weak references whose callbacks stand in for weakref.finalize, which
+# Python 2 lacks; a reference must outlive its object for it to be called.
+_finalizers = set()
+
+
+def _finalize(obj, func):
+    if hasattr(weakref, 'finalize'):
+        weakref.finalize(obj, func)
+        return
+
+    def callback(ref):
+        _finalizers.discard(ref)
+        func()
+
+    _finalizers.add(weakref.ref(obj, callback))
+
+
+def _markup(translations, s, cached=True):
+    """Returns `s` escaped as :class:`markupsafe.Markup`, escaping each
+    string of the catalog only once. Other strings, such as untranslated
+    messages built at runtime, are escaped every time with `cached` false.
+    """
+    try:
+        cache = translations._xuanzang_markup
+    except AttributeError:
+        cache = translations._xuanzang_markup = {}
+    markup = cache.get(s)
+    if markup is None:
+        from markupsafe import escape
+        # gettext and ngettext return UTF-8 on Python 2
+        markup = escape(s.decode('utf-8') if isinstance(s, bytes) else s)
+        if cached:
+            cache[s] = markup
+    return markup
+
+
+def _compiled(translations, s, translator, markup):
+    """Returns `s` compiled as ICU MessageFormat, compiling each string
+    only once per catalog.
+    """
+    try:
+        cache = translations._xuanzang_compiled
+    except AttributeError:
+        cache = translations._xuanzang_compiled = {}
+    key = (s, markup)
+    func = cache.get(key)
+    if func is None:
+        from flask_xuanzang.messageformat import compile_message
+        escape = None
+        if markup:
+            from markupsafe import escape
+        func = cache[key] = compile_message(
+            s, translator.get_locale(), translator.get_date_formatter(),
+            escape)
+    return func
+
+
+def _parse_locale(identifier):
+    from babel.core import Locale
+    return Locale.parse(identifier)
+
+
+# Types of the values memoized calls may take. Other values may compare
+# equal yet format differently, such as 1 and 1.0 or Decimal('2.5') and
+# Decimal('2.50'), or not be hashable.
+_MEMO_TYPES = frozenset([type(''), type(b''), int, type(None)])
+
+
+def _memoized(func):
+    """Makes a translation method return the string it already returned for
+    the same arguments, if the translator has a memo and the arguments are
+    all strings, integers or ``None``.
+    """
+    name = func.__name__
+
+    @functools.wraps(func)
+    def wrapper(self, *args, **variables):
+        memo = self.get_memo()
+        if memo is None:
+            return func(self, *args, **variables)
+        types = _MEMO_TYPES
+        for value in args + tuple(variables.values()):
+            if value.__class__ not in types:
+                return func(self, *args, **variables)
+        key = (name, args, tuple(sorted(variables.items())))
+        s = memo.get(key)
+        if s is None:
+            s = func(self, *args, **variables)
+            memo.set(key, s)
+        return s
+
+    return wrapper
+
 
 class NumberFormatError(ValueError):
     """Exception raised when a string cannot be parsed into a number."""
@@ -22,70 +137,183 @@ class ShoshinMixin(object):
     def get_translations(self):
         raise NotImplementedError()
 
+    def get_date_formatter(self):
+        raise NotImplementedError()
+
+    def get_collator(self):
+        raise NotImplementedError()
+
+    def get_missing_collector(self):
+        return None
+
+    def get_memo(self):
+        return None
+
+    def use_markup(self):
+        return False
+
+    def get_message_syntax(self):
+        return 'percent'
+
+    def freeze(self):
+        return self
+
+    # Whether messages are neither escaped nor ICU, set by translators to
+    # skip the hooks above for every message
+    plain_messages = False
+
+    def _finish(self, translations, s, variables, missing=False):
+        if self.plain_messages:
+            return s if not variables else s % variables
+        if self.get_message_syntax() == 'icu':
+            func = _compiled(translations, s, self, self.use_markup())
+            return func(variables or {})
+        if self.use_markup():
+            s = _markup(translations, s, not missing)
+        return s if not variables else s % variables
+
+    def _report_missing(self, context, message):
+        collector = self.get_missing_collector()
+        if collector is not None:
+            collector.record(self.get_locale(), context, message)
+
+    @_memoized
     def gettext(self, message, **variables):
         t = self.get_translations()
         s = t.gettext(message)
-        return s if not variables else s % variables
+        missing = s is message
+        if missing:
+            self._report_missing(None, message)
+        return self._finish(t, s, variables, missing)
 
+    @_memoized
     def ngettext(self, singular, plural, num, **variables):
         variables.setdefault('num', num)
         t = self.get_translations()
         s = t.ngettext(singular, plural, num)
-        return s if not variables else s % variables
+        missing = s is singular or s is plural
+        if missing:
+            self._report_missing(None, singular)
+        return self._finish(t, s, variables, missing)
 
+    def ngettext_many(self, singular, plural, nums, **variables):
+        t = self.get_translations()
+        forms = {}
+        result = []
+        for num in nums:
+            key = (t.plural(num), num == 1)
+            s = forms.get(key)
+            if s is None:
+                s = forms[key] = t.ngettext(singular, plural, num)
+                if s is singular or s is plural:
+                    self._report_missing(None, singular)
+            result.append(self._finish(t, s, dict({'num': num}, **variables),
+                                       s is singular or s is plural))
+        return result
+
+    @_memoized
     def pgettext(self, context, message, **variables):
         t = self.get_translations()
         s = t.upgettext(context, message)
-        return s if not variables else s % variables
+        missing = s is message
+        if missing:
+            self._report_missing(context, message)
+        return self._finish(t, s, variables, missing)
 
+    @_memoized
     def npgettext(self, context, singular, plural, num, **variables):
         t = self.get_translations()
         s = t.unpgettext(context, singular, plural, num)
-        return s if not variables else s % variables
+        missing = s is singular or s is plural
+        if missing:
+            self._report_missing(context, singular)
+        return self._finish(t, s, variables, missing)
 
+    @_memoized
     def ugettext(self, message, **variables):
         t = self.get_translations()
         s = t.ugettext(message)
-        return s if not variables else s % variables
+        missing = s is message
+        if missing:
+            self._report_missing(None, message)
+        return self._finish(t, s, variables, missing)
 
+    @_memoized
     def ungettext(self, singular, plural, num, **variables):
         variables.setdefault('num', num)
         t = self.get_translations()
         s = t.ungettext(singular, plural, num)
-        return s if not variables else s % variables
+        missing = s is singular or s is plural
+        if missing:
+            self._report_missing(None, singular)
+        return self._finish(t, s, variables, missing)
+
+    def resolve_message(self, handle):
+        t = self.get_translations()
+        base = getattr(t, '_xuanzang_base', None)
+        if base is not None:
+            # Overlays hold a few overrides, tables are kept on the base
+            key = handle.message
+            if handle.context is not None:
+                key = CONTEXT_ENCODING % (handle.context, handle.message)
+            s = t._catalog.get(key)
+            if s is not None:
+                return self._finish(t, s, None)
+            t = base
+        table = get_table(t)
+        try:
+            s = table[handle.id]
+        except IndexError:
+            table.extend([None] * (handle.id + 1 - len(table)))
+            s = None
+        if s is None:
+            if handle.context is None:
+                s = t.ugettext(handle.message)
+            else:
+                s = t.upgettext(handle.context, handle.message)
+            if s is handle.message:
+                self._report_missing(handle.context, handle.message)
+            table[handle.id] = s
+        return self._finish(t, s, None)
+
+    def message(self, message, context=None):
+        handle = registry.get(message, context)
+        return LazyString(self, 'resolve_message', (handle,))
 
     def lazy_gettext(self, message, **variables):
-        func = functools.partial(self.gettext, message, **variables)
-        return LazyProxy(func, enable_cache=False)
+        if not variables and not PY2 and in_definition():
+            return self.message(message)
+        return LazyString(self, 'gettext', (message,), variables)
 
     def lazy_ngettext(self, singular, plural, num, **variables):
-        func = functools.partial(self.ngettext,
-                                 singular, plural, num, **variables)
-        return LazyProxy(func, enable_cache=False)
+        return LazyString(self, 'ngettext', (singular, plural, num),
+                          variables)
 
     def lazy_pgettext(self, context, message, **variables):
-        func = functools.partial(self.pgettext, context, message, **variables)
-        return LazyProxy(func, enable_cache=False)
+        if not variables and in_definition():
+            return self.message(message, context)
+        return LazyString(self, 'pgettext', (context, message), variables)
 
     def lazy_npgettext(self, context, singular, plural, num, **variables):
-        func = functools.partial(self.npgettext,
-                                 context, singular, plural, num, **variables)
-        return LazyProxy(func, enable_cache=False)
+        return LazyString(self, 'npgettext', (context, singular, plural, num),
+                          variables)
 
     def lazy_ugettext(self, message, **variables):
-        func = functools.partial(self.ugettext, message, **variables)
-        return LazyProxy(func, enable_cache=False)
+        if not variables and in_definition():
+            return self.message(message)
+        return LazyString(self, 'ugettext', (message,), variables)
 
     def lazy_ungettext(self, singular, plural, num, **variables):
-        func = functools.partial(self.ungettext,
-                                 singular, plural, num, **variables)
-        return LazyProxy(func, enable_cache=False)
+        return LazyString(self, 'ungettext', (singular, plural, num),
+                          variables)
 
     def format_decimal(self, number):
+        from babel import numbers
         locale = self.get_locale()
         return numbers.format_decimal(number, locale=locale)
 
     def parse_decimal(self, string):
+        from babel import numbers
         locale = self.get_locale()
         try:
             return numbers.parse_decimal(string, locale=locale)
@@ -93,16 +321,174 @@ class ShoshinMixin(object):
             message = '{0!r} is not a valid number'.format(string)
             raise NumberFormatError(message)
 
+    def format_datetime(self, datetime=None, format='medium', tzinfo=None):
+        formatter = self.get_date_formatter()
+        return formatter.format_datetime(datetime, format, tzinfo)
+
+    def format_datetime_many(self, datetimes, format='medium', tzinfo=None):
+        formatter = self.get_date_formatter()
+        return formatter.format_datetime_many(datetimes, format, tzinfo)
+
+    def format_date(self, date=None, format='medium'):
+        formatter = self.get_date_formatter()
+        return formatter.format_date(date, format)
+
+    def format_time(self, time=None, format='medium', tzinfo=None):
+        formatter = self.get_date_formatter()
+        return formatter.format_time(time, format, tzinfo)
+
+    def format_timedelta(self, delta, granularity='second', threshold=.85,
+                         add_direction=False, format='long'):
+        formatter = self.get_date_formatter()
+        return formatter.format_timedelta(delta, granularity, threshold,
+                                          add_direction, format)
+
+    def collation_key(self, s):
+        return self.get_collator().key(s)
+
+    def sort_localized(self, items, key=None, reverse=False):
+        return self.get_collator().sort(items, key, reverse)
+
+
+class LocaleTranslator(ShoshinMixin):
+    """Translates and formats for a fixed locale, without the need of an
+    application context.
+    """
+
+    def __init__(self, locale, translations, date_formatter,
+                 missing_collector=None, markup=False, collator=None,
+                 message_syntax='percent'):
+        self.locale = locale
+        self.translations = translations
+        self.date_formatter = date_formatter
+        self.missing_collector = missing_collector
+        self.markup = markup
+        self.collator = collator
+        self.message_syntax = message_syntax
+        self.plain_messages = not markup and message_syntax == 'percent'
+
+    def get_locale(self):
+        return self.locale
+
+    def get_translations(self):
+        return self.translations
+
+    def get_date_formatter(self):
+        return self.date_formatter
+
+    def get_collator(self):
+        if self.collator is None:
+            from flask_xuanzang.collation import Collator
+            self.collator = Collator(self.locale)
+        return self.collator
+
+    def get_missing_collector(self):
+        return self.missing_collector
+
+    def use_markup(self):
+        return self.markup
+
+    def get_message_syntax(self):
+        return self.message_syntax
+
 
 class Attan(ShoshinMixin):
     LOCALE_CACHE_KEY = 'xuanzang_locale'
+    TENANT_CACHE_KEY = 'xuanzang_tenant'
+    MEMO_CACHE_KEY = 'xuanzang_memo'
 
     def __init__(self, translation_directory,
-                 default_locale, locale_selector):
+                 default_locale, locale_selector, missing_collector=None,
+                 tenant_selector=None, overlay_loader=None,
+                 overlay_cache_size=1024, loader=None,
+                 refresh_interval=None, refresh_workers=4,
+                 compact_catalogs=False, identity_selector=None,
+                 locale_cache_ttl=300, locale_cache_size=10000,
+                 request_memo_size=0, markup=False, share_catalogs=False,
+                 message_syntax='percent', url_locales=None,
+                 url_context='url'):
         self.translation_directory = translation_directory
-        self.default_locale = Locale.parse(default_locale)
+        self.loader = loader or DirectoryLoader(translation_directory)
+        self.default_locale_name = default_locale
+        self._default_locale = None
         self.locale_selector = locale_selector
-        self.translation_cache = {}
+        self.missing_collector = missing_collector
+        self.tenant_selector = tenant_selector
+        self.overlay_loader = overlay_loader
+        self.identity_selector = identity_selector
+        self.locale_cache = TTLCache(locale_cache_size, locale_cache_ttl)
+        self.date_formatters = {}
+        self.collators = {}
+        self.overlay_cache = LRUCache(overlay_cache_size)
+        self.refresh_workers = refresh_workers
+        self.pending_loads = {}
+        self._load_lock = threading.Lock()
+        self._load_executor = None
+        self.last_refresh_report = None
+        self.catalog_diffs = {}
+        self.request_memo_size = request_memo_size
+        self.markup = markup
+        self.message_syntax = message_syntax
+        self.plain_messages = not markup and message_syntax == 'percent'
+        self.stats = collections.Counter(memo_hits=0, memo_misses=0)
+        self._stats_lock = threading.Lock()
+        self.routing = None
+        if url_locales:
+            from flask_xuanzang.routing import LocalizedRouting
+            self.routing = LocalizedRouting(self, url_locales, url_context)
+
+        shared_key = self.loader.shared_key() if share_catalogs else None
+        if shared_key is None:
+            self.catalogs = shared.CatalogSet(compact_catalogs)
+            self._release_catalogs = None
+        else:
+            self.catalogs, self._release_catalogs = shared.registry.acquire(
+                shared_key, compact_catalogs)
+            _finalize(self, self._release_catalogs)
+
+        self.refresh_thread = None
+        if refresh_interval:
+            self.refresh_thread = RefreshThread(self, refresh_interval)
+            self.refresh_thread.start()
+
+    # With shared catalogs, the set is shared by every application loading
+    # them from the same source, so reloading them reloads them for all.
+
+    @property
+    def translation_cache(self):
+        return self.catalogs.translations
+
+    @translation_cache.setter
+    def translation_cache(self, value):
+        self.catalogs.translations = value
+
+    @property
+    def translation_versions(self):
+        return self.catalogs.versions
+
+    @translation_versions.setter
+    def translation_versions(self, value):
+        self.catalogs.versions = value
+
+    @property
+    def message_index(self):
+        return self.catalogs.message_index
+
+    def close(self):
+        """Stops the background refresh, and releases the shared catalogs
+        without waiting for this object to be garbage collected.
+        """
+        if self.refresh_thread is not None:
+            self.refresh_thread.stop()
+            self.refresh_thread = None
+        if self._release_catalogs is not None:
+            self._release_catalogs()
+
+    @property
+    def default_locale(self):
+        if self._default_locale is None:
+            self._default_locale = _parse_locale(self.default_locale_name)
+        return self._default_locale
 
     def _get_cache_object(self):
         context = _app_ctx_stack.top
@@ -110,25 +496,180 @@ class Attan(ShoshinMixin):
             raise RuntimeError('No application context')
         return context
 
-    def _get_locale(self):
-        if not self.locale_selector:
-            return self.default_locale
+    def _select_locale(self):
         raw_locale = self.locale_selector()
         if raw_locale is None:
             return self.default_locale
-        return Locale.parse(raw_locale)
+        return _parse_locale(raw_locale)
+
+    def _get_locale(self):
+        if self.routing is not None:
+            locale = self.routing.request_locale()
+            if locale is not None:
+                return locale
+        if not self.locale_selector:
+            return self.default_locale
+        if not self.identity_selector:
+            return self._select_locale()
+        identity = self.identity_selector()
+        if identity is None:
+            return self._select_locale()
+        locale = self.locale_cache.get(identity)
+        if locale is None:
+            locale = self._select_locale()
+            self.locale_cache.set(identity, locale)
+        return locale
 
-    def _load_translations(self, locale):
-        directory = self.translation_directory
-        translations = Translations.load(directory, [locale])
+    def _load_translations(self, locale, previous=None):
+        translations = self.loader.load(locale)
         translations.set_output_charset('utf-8')
-        return translations
+        diff = None
+        if previous is not None:
+            diff = merge_catalog(previous, translations)
+        if self.message_index is not None:
+            translations = compact_translations(translations,
+                                                self.message_index)
+        return translations, diff
+
+    def _record_diff(self, locale, diff):
+        if diff is None:
+            return
+        self.catalog_diffs[locale] = diff
+        logger.info('Reloaded translations for %s: %d added, %d removed, '
+                    '%d changed', locale, len(diff.added), len(diff.removed),
+                    len(diff.changed))
 
     def load_translations(self, locale):
         translations = self.translation_cache.get(locale)
         if not translations:
-            translations = self._load_translations(locale)
+            version = self.loader.version(locale)
+            translations, _ = self._load_translations(locale)
             self.translation_cache[locale] = translations
+            self.translation_versions[locale] = version
+        return translations
+
+    def _load_pending(self, key, locale):
+        try:
+            return self.load_translations(locale)
+        finally:
+            with self._load_lock:
+                self.pending_loads.pop(key, None)
+
+    def load_translations_future(self, locale):
+        """Returns a :class:`concurrent.futures.Future` of the catalog of
+        `locale`, which is loaded on a thread pool unless it is cached.
+        Callers asking for a locale that is already being loaded share the
+        same future.
+        """
+        from concurrent.futures import Future, ThreadPoolExecutor
+        # The cache is keyed by Locale, and 'zh_CN' is 'zh_Hans_CN'
+        locale = _parse_locale(locale)
+        translations = self.translation_cache.get(locale)
+        if translations:
+            future = Future()
+            future.set_result(translations)
+            return future
+        key = str(locale)
+        with self._load_lock:
+            future = self.pending_loads.get(key)
+            if future is None:
+                if self._load_executor is None:
+                    self._load_executor = ThreadPoolExecutor(
+                        max_workers=self.refresh_workers)
+                future = self._load_executor.submit(self._load_pending,
+                                                    key, locale)
+                self.pending_loads[key] = future
+        return future
+
+    def reload_translations(self, locale, version=None):
+        previous = self.translation_cache.get(locale)
+        translations, diff = self._load_translations(locale, previous)
+        self._record_diff(locale, diff)
+        self.translation_versions[locale] = version
+        if diff is not None and not diff:
+            # Keep the cached catalog along with its overlays
+            return previous
+        self.translation_cache[locale] = translations
+        self.overlay_cache.discard_if(lambda key: key[1] == locale)
+        return translations
+
+    def _timed_load(self, locale):
+        start = time.time()
+        previous = self.translation_cache.get(locale)
+        try:
+            version = self.loader.version(locale)
+            translations, diff = self._load_translations(locale, previous)
+        except Exception as e:
+            return None, None, None, time.time() - start, e
+        return translations, version, diff, time.time() - start, None
+
+    def _swap_translations(self, reloaded):
+        cache = dict(self.translation_cache)
+        versions = dict(self.translation_versions)
+        changed = set()
+        for locale, (translations, version, diff) in reloaded.items():
+            versions[locale] = version
+            if diff is None or diff:
+                cache[locale] = translations
+                changed.add(locale)
+        self.translation_cache = cache
+        self.translation_versions = versions
+        self.overlay_cache.discard_if(lambda key: key[1] in changed)
+
+    def _refresh_in_background(self, future):
+        try:
+            report = self._refresh_all()
+        except Exception as e:
+            logger.exception('Failed to refresh translations')
+            future.set_exception(e)
+        else:
+            future.set_result(report)
+
+    def _refresh_all(self):
+        locales = list(self.translation_cache)
+        report = RefreshReport()
+        reloaded = {}
+        from concurrent.futures import ThreadPoolExecutor
+        executor = ThreadPoolExecutor(max_workers=self.refresh_workers)
+        try:
+            results = executor.map(self._timed_load, locales)
+            for locale, result in zip(locales, results):
+                translations, version, diff, duration, error = result
+                report.durations[locale] = duration
+                if error is None:
+                    reloaded[locale] = (translations, version, diff)
+                    if diff is not None:
+                        report.diffs[locale] = diff
+                        self._record_diff(locale, diff)
+                else:
+                    report.errors[locale] = error
+                    logger.error('Failed to reload translations for %s: %r',
+                                 locale, error)
+        finally:
+            executor.shutdown()
+        self._swap_translations(reloaded)
+        self.last_refresh_report = report
+        return report
+
+    def check_versions(self):
+        for locale in list(self.translation_cache):
+            version = self.loader.version(locale)
+            if version != self.translation_versions.get(locale):
+                self.reload_translations(locale, version)
+
+    def load_overlay(self, tenant, locale):
+        key = (tenant, locale)
+        base = self.load_translations(locale)
+        entry = self.overlay_cache.get(key)
+        # The base catalog may have been reloaded by another application
+        if entry is not None and entry[0] is base:
+            return entry[1]
+        translations = base
+        overrides = self.overlay_loader(tenant, locale)
+        if overrides:
+            from flask_xuanzang.overlay import make_overlay
+            translations = make_overlay(base, overrides)
+        self.overlay_cache.set(key, (base, translations))
         return translations
 
     def get_locale(self):
@@ -139,17 +680,138 @@ class Attan(ShoshinMixin):
             setattr(obj, self.LOCALE_CACHE_KEY, locale)
         return locale
 
+    def get_tenant(self):
+        if not self.tenant_selector:
+            return None
+        obj = self._get_cache_object()
+        if not hasattr(obj, self.TENANT_CACHE_KEY):
+            setattr(obj, self.TENANT_CACHE_KEY, self.tenant_selector())
+        return getattr(obj, self.TENANT_CACHE_KEY)
+
     def get_translations(self):
         locale = self.get_locale()
-        return self.load_translations(locale)
+        tenant = self.get_tenant()
+        if tenant is None or not self.overlay_loader:
+            return self.load_translations(locale)
+        return self.load_overlay(tenant, locale)
+
+    def load_date_formatter(self, locale):
+        formatter = self.date_formatters.get(locale)
+        if formatter is None:
+            from flask_xuanzang.dates import DateFormatter
+            formatter = self.date_formatters[locale] = DateFormatter(locale)
+        return formatter
+
+    def get_date_formatter(self):
+        return self.load_date_formatter(self.get_locale())
+
+    def load_collator(self, locale):
+        collator = self.collators.get(locale)
+        if collator is None:
+            from flask_xuanzang.collation import Collator
+            collator = self.collators[locale] = Collator(locale)
+        return collator
+
+    def get_collator(self):
+        return self.load_collator(self.get_locale())
+
+    def bind(self, locale):
+        locale = _parse_locale(locale)
+        return LocaleTranslator(locale,
+                                self.load_translations(locale),
+                                self.load_date_formatter(locale),
+                                self.missing_collector, self.markup,
+                                self.load_collator(locale),
+                                self.message_syntax)
+
+    def freeze(self):
+        locale = self.get_locale()
+        return LocaleTranslator(locale,
+                                self.get_translations(),
+                                self.load_date_formatter(locale),
+                                self.missing_collector, self.markup,
+                                self.collators.get(locale),
+                                self.message_syntax)
+
+    def url_for(self, endpoint, _locale=None, **values):
+        from flask import url_for
+        url = url_for(endpoint, **values)
+        if self.routing is None:
+            return url
+        if _locale is None:
+            locale = self.get_locale()
+        else:
+            locale = _parse_locale(_locale)
+        return self.routing.localize_url(url, endpoint, locale)
+
+    def get_missing_collector(self):
+        return self.missing_collector
+
+    def use_markup(self):
+        return self.markup
+
+    def get_message_syntax(self):
+        return self.message_syntax
+
+    def get_memo(self):
+        if not self.request_memo_size:
+            return None
+        obj = self._get_cache_object()
+        memo = getattr(obj, self.MEMO_CACHE_KEY, None)
+        if memo is None:
+            memo = RequestMemo(self.request_memo_size)
+            setattr(obj, self.MEMO_CACHE_KEY, memo)
+        return memo
+
+    def teardown(self, exception=None):
+        memo = getattr(_app_ctx_stack.top, self.MEMO_CACHE_KEY, None)
+        if memo is not None:
+            self.add_stats(memo_hits=memo.hits, memo_misses=memo.misses)
+
+    def add_stats(self, **counts):
+        with self._stats_lock:
+            self.stats.update(counts)
+
+    def get_stats(self):
+        with self._stats_lock:
+            return dict(self.stats)
 
     def refresh(self):
         obj = self._get_cache_object()
         if hasattr(obj, self.LOCALE_CACHE_KEY):
             delattr(obj, self.LOCALE_CACHE_KEY)
-
-    def refresh_translations(self):
-        self.translation_cache = {}
+        if hasattr(obj, self.TENANT_CACHE_KEY):
+            delattr(obj, self.TENANT_CACHE_KEY)
+        memo = getattr(obj, self.MEMO_CACHE_KEY, None)
+        if memo is not None:
+            # Keep the counts, but not strings of the previous locale
+            setattr(obj, self.MEMO_CACHE_KEY,
+                    RequestMemo(self.request_memo_size))
+            self.add_stats(memo_hits=memo.hits, memo_misses=memo.misses)
+
+    def refresh_translations(self, background=False):
+        if not background:
+            self.translation_cache = {}
+            self.translation_versions = {}
+            self.overlay_cache.clear()
+            return None
+
+        from concurrent.futures import Future
+        future = Future()
+        thread = threading.Thread(target=self._refresh_in_background,
+                                  args=(future,), name='xuanzang-reload')
+        thread.daemon = True
+        thread.start()
+        return future
+
+    def invalidate_locale(self, identity):
+        self.locale_cache.invalidate(identity)
+
+    def refresh_overlays(self, tenant=None):
+        if tenant is None:
+            self.overlay_cache.clear()
+        else:
+            self.overlay_cache.discard_if(lambda key: key[0] == tenant)
 
 
 class Xuanzang(ShoshinMixin):
@@ -158,25 +820,68 @@ class Xuanzang(ShoshinMixin):
 
     :param app: Flask instance
     :param locale_selector: A callback function for locale selection
+    :param missing_collector: A :class:`MissingTranslationCollector` that
+                              untranslated messages are reported to
+    :param tenant_selector: A callback function returning the tenant of the
+                            current request, or ``None``
+    :param overlay_loader: A callback function called with a tenant and a
+                           locale, returning a dict of messages overriding
+                           the shared catalog for that tenant
+    :param loader: A :class:`CatalogLoader` catalogs are loaded from instead
+                   of the translation directory
+    :param identity_selector: A callback function returning an identity of
+                              the current user, such as a user id, that the
+                              result of `locale_selector` is cached under
     """
 
     EXTENSION_KEY = 'xuanzang'
 
-    def __init__(self, app=None, locale_selector=None):
+    def __init__(self, app=None, locale_selector=None,
+                 missing_collector=None, tenant_selector=None,
+                 overlay_loader=None, loader=None, identity_selector=None):
         self.locale_selector = locale_selector
+        self.missing_collector = missing_collector
+        self.tenant_selector = tenant_selector
+        self.overlay_loader = overlay_loader
+        self.loader = loader
+        self.identity_selector = identity_selector
 
         if app:
-            self.init_app(app, locale_selector=locale_selector)
-
-    def init_app(self, app, locale_selector=None):
+            self.init_app(app, locale_selector=locale_selector,
+                          missing_collector=missing_collector,
+                          tenant_selector=tenant_selector,
+                          overlay_loader=overlay_loader,
+                          loader=loader,
+                          identity_selector=identity_selector)
+
+    def init_app(self, app, locale_selector=None, missing_collector=None,
+                 tenant_selector=None, overlay_loader=None, loader=None,
+                 identity_selector=None):
         """Initialzes an application for the use with this setup."""
         locale_selector = locale_selector or self.locale_selector
-        attan = self.init_attan(app, locale_selector)
+        # Collectors define __len__, so an empty one is falsy
+        if missing_collector is None:
+            missing_collector = self.missing_collector
+        tenant_selector = tenant_selector or self.tenant_selector
+        overlay_loader = overlay_loader or self.overlay_loader
+        loader = loader or self.loader
+        identity_selector = identity_selector or self.identity_selector
+        attan = self.init_attan(app, locale_selector, missing_collector,
+                                tenant_selector, overlay_loader, loader,
+                                identity_selector)
 
         app.extensions = getattr(app, 'extensions', {})
         app.extensions[self.EXTENSION_KEY] = attan
-
-    def init_attan(self, app, locale_selector):
+        app.teardown_appcontext(attan.teardown)
+        if attan.routing is not None:
+            app.wsgi_app = attan.routing.wrap(app.wsgi_app, app.url_map)
+        if getattr(app, 'cli', None) is not None:
+            from flask_xuanzang.extract import cli
+            app.cli.add_command(cli)
+
+    def init_attan(self, app, locale_selector, missing_collector=None,
+                   tenant_selector=None, overlay_loader=None, loader=None,
+                   identity_selector=None):
         directory = app.config.get('XUANZANG_TRANSLATION_DIRECTORY',
                                    'translations')
         if not os.path.isabs(directory):
@@ -186,6 +891,25 @@ class Xuanzang(ShoshinMixin):
             directory,
             app.config.get('XUANZANG_DEFAULT_LOCALE', 'en'),
             locale_selector,
+            missing_collector,
+            tenant_selector,
+            overlay_loader,
+            app.config.get('XUANZANG_OVERLAY_CACHE_SIZE', 1024),
+            loader,
+            app.config.get('XUANZANG_REFRESH_INTERVAL'),
+            app.config.get('XUANZANG_REFRESH_WORKERS', 4),
+            app.config.get('XUANZANG_COMPACT_CATALOGS', False),
+            identity_selector=identity_selector,
+            locale_cache_ttl=app.config.get('XUANZANG_LOCALE_CACHE_TTL', 300),
+            locale_cache_size=app.config.get('XUANZANG_LOCALE_CACHE_SIZE',
+                                             10000),
+            request_memo_size=app.config.get('XUANZANG_REQUEST_MEMO_SIZE', 0),
+            markup=app.config.get('XUANZANG_MARKUP', False),
+            share_catalogs=app.config.get('XUANZANG_SHARE_CATALOGS', False),
+            message_syntax=app.config.get('XUANZANG_MESSAGE_SYNTAX',
+                                          'percent'),
+            url_locales=app.config.get('XUANZANG_URL_LOCALES'),
+            url_context=app.config.get('XUANZANG_URL_CONTEXT', 'url'),
         )
 
     @classmethod
@@ -198,13 +922,128 @@ class Xuanzang(ShoshinMixin):
     def get_translations(self):
         return self.get_attan().get_translations()
 
+    def get_date_formatter(self):
+        return self.get_attan().get_date_formatter()
+
+    def get_collator(self):
+        return self.get_attan().get_collator()
+
+    def get_missing_collector(self):
+        return self.get_attan().get_missing_collector()
+
+    def get_memo(self):
+        return self.get_attan().get_memo()
+
+    def use_markup(self):
+        return self.get_attan().use_markup()
+
+    def get_message_syntax(self):
+        return self.get_attan().get_message_syntax()
+
+    # The translation methods run on the state of the application, so that
+    # its hooks are not looked up through the application context one by one
+
+    def gettext(self, message, **variables):
+        return self.get_attan().gettext(message, **variables)
+
+    def ngettext(self, singular, plural, num, **variables):
+        return self.get_attan().ngettext(singular, plural, num, **variables)
+
+    def ngettext_many(self, singular, plural, nums, **variables):
+        return self.get_attan().ngettext_many(singular, plural, nums,
+                                              **variables)
+
+    def pgettext(self, context, message, **variables):
+        return self.get_attan().pgettext(context, message, **variables)
+
+    def npgettext(self, context, singular, plural, num, **variables):
+        return self.get_attan().npgettext(context, singular, plural, num,
+                                          **variables)
+
+    def ugettext(self, message, **variables):
+        return self.get_attan().ugettext(message, **variables)
+
+    def ungettext(self, singular, plural, num, **variables):
+        return self.get_attan().ungettext(singular, plural, num, **variables)
+
+    def resolve_message(self, handle):
+        return self.get_attan().resolve_message(handle)
+
+    def bind(self, locale):
+        """Returns a :class:`LocaleTranslator` for `locale`, which has the
+        same translation and formatting methods as this class but can be
+        used outside of application contexts.
+        """
+        return self.get_attan().bind(locale)
+
+    def freeze(self):
+        """Returns a :class:`LocaleTranslator` for the locale and catalog of
+        the current context, e.g. to translate many strings without looking
+        them up for each.
+        """
+        return self.get_attan().freeze()
+
     def refresh(self):
         """Refreshes the cached locale information."""
         return self.get_attan().refresh()
 
-    def refresh_translations(self):
-        """Refreshes the cached translations."""
-        return self.get_attan().refresh_translations()
+    def get_stats(self):
+        """Returns a dict of counters about the current application.
+
+        ``'memo_hits'`` and ``'memo_misses'`` count lookups in the request
+        memo enabled by ``XUANZANG_REQUEST_MEMO_SIZE``, and are added up when
+        each application context ends.
+        """
+        return self.get_attan().get_stats()
+
+    def aload_translations(self, locale):
+        """Loads the catalog of `locale` without blocking the event loop.
+
+        The catalog is loaded on a thread pool of ``XUANZANG_REFRESH_WORKERS``
+        threads. Concurrent calls for the same locale, under any of its
+        names, wait for a single load, even from different event loops.
+
+        :returns: an awaitable of the catalog
+        """
+        import asyncio
+        future = self.get_attan().load_translations_future(locale)
+        return asyncio.wrap_future(future)
+
+    def awarm_up(self, locales):
+        """Loads the catalogs of `locales` like :meth:`aload_translations`,
+        returning an awaitable of the list of catalogs.
+        """
+        import asyncio
+        return asyncio.gather(*[self.aload_translations(locale)
+                                for locale in locales])
+
+    def refresh_translations(self, background=False):
+        """Refreshes the cached translations.
+
+        By default the cache is emptied and catalogs are loaded again when
+        they are next used. With `background`, the cached catalogs are
+        reloaded on a thread pool while the old ones keep being served, and
+        are swapped in together once loaded. A catalog that fails to load is
+        kept as is.
+
+        :returns: ``None``, or with `background` a
+                  :class:`concurrent.futures.Future` of a
+                  :class:`RefreshReport`
+        """
+        return self.get_attan().refresh_translations(background)
+
+    def invalidate_locale(self, identity):
+        """Forgets the locale cached for `identity`, e.g. after the user
+        changed their language preference. Other worker processes keep their
+        cached locale until it expires.
+        """
+        return self.get_attan().invalidate_locale(identity)
+
+    def refresh_overlays(self, tenant=None):
+        """Refreshes the cached overlays of `tenant`, or of every tenant if
+        `tenant` is ``None``.
+        """
+        return self.get_attan().refresh_overlays(tenant)
 
 
 def _translate(function_name, *args, **kwargs):
@@ -213,8 +1052,26 @@ def _translate(function_name, *args, **kwargs):
 
 
 def _lazy_translate(function_name, *args, **kwargs):
-    func = functools.partial(_translate, function_name, *args, **kwargs)
-    return LazyProxy(func, enable_cache=False)
+    return LazyString(None, function_name, args, kwargs)
+
+
+def _lazy_message(message, context=None):
+    handle = registry.get(message, context)
+    return _lazy_translate('resolve_message', handle)
+
+
+def message(message, context=None):
+    """Registers `message` and returns it as a lazy string like
+    :func:`lazy_pgettext`, or :func:`lazy_ugettext` without `context`.
+
+    The message is given an integer handle when registered, and is looked up
+    in each catalog by that handle, so the cost of a lookup does not depend
+    on the length of the message. Handles are never released, so create
+    messages once, e.g. at module level, rather than on every use. Lazy
+    gettext functions called without variables in a module or class body
+    return such messages.
+    """
+    return _lazy_message(message, context)
 
 
 def gettext(message, **variables):
@@ -234,6 +1091,15 @@ def ngettext(singular, plural, num, **variables):
     return _translate('ngettext', singular, plural, num, **variables)
 
 
+def ngettext_many(singular, plural, nums, **variables):
+    """Like :func:`ngettext` but translates the message for every count in
+    `nums` at once. Counts sharing a plural form are looked up only once.
+
+    :returns: a list of strings in the order of `nums`
+    """
+    return _translate('ngettext_many', singular, plural, nums, **variables)
+
+
 def pgettext(context, message, **variables):
     """Translates `message` given the `context`"""
     return _translate('pgettext', context, message, **variables)
@@ -262,6 +1128,8 @@ def lazy_gettext(message, **variables):
     """Like :func:`gettext` but the string returned is lazy. The translation
     happens when it is used as an actual string.
     """
+    if not variables and not PY2 and in_definition():
+        return _lazy_message(message)
     return _lazy_translate('gettext', message, **variables)
 
 
@@ -276,6 +1144,8 @@ def lazy_pgettext(context, message, **variables):
     """Like :func:`pgettext` but the string returned is lazy. The translation
     happens when it is used as an actual string.
     """
+    if not variables and in_definition():
+        return _lazy_message(message, context)
     return _lazy_translate('pgettext', context, message, **variables)
 
 
@@ -291,6 +1161,8 @@ def lazy_ugettext(message, **variables):
     """Like :func:`ugettext` but the string returned is lazy. The translation
     happens when it is used as an actual string.
     """
+    if not variables and in_definition():
+        return _lazy_message(message)
     return _lazy_translate('ugettext', message, **variables)
 
 
@@ -301,6 +1173,14 @@ def lazy_ungettext(singular, plural, num, **variables):
     return _lazy_translate('ungettext', singular, plural, num, **variables)
 
 
+def url_for(endpoint, _locale=None, **values):
+    """Builds the URL of `endpoint` like :func:`flask.url_for`, under the
+    path prefix of the current locale, or of `_locale` if given, and with
+    its static segments translated, if ``XUANZANG_URL_LOCALES`` is set.
+    """
+    return _translate('url_for', endpoint, _locale, **values)
+
+
 def format_decimal(number):
     """Formats `number` for current locale."""
     attan = Xuanzang.get_attan()
@@ -315,3 +1195,81 @@ def parse_decimal(string):
     """
     attan = Xuanzang.get_attan()
     return attan.parse_decimal(string)
+
+
+def format_datetime(datetime=None, format='medium', tzinfo=None):
+    """Formats `datetime` for current locale.
+
+    :param datetime: a ``datetime`` object, or ``None`` for the current time
+    :param format: one of ``'full'``, ``'long'``, ``'medium'`` or
+                   ``'short'``, or a custom date/time pattern
+    :param tzinfo: the timezone, or the name of the timezone, to display
+                   the time in
+    """
+    attan = Xuanzang.get_attan()
+    return attan.format_datetime(datetime, format, tzinfo)
+
+
+def format_datetime_many(datetimes, format='medium', tzinfo=None):
+    """Like :func:`format_datetime` but formats every item of `datetimes`.
+
+    :returns: a list of strings in the order of `datetimes`
+    """
+    attan = Xuanzang.get_attan()
+    return attan.format_datetime_many(datetimes, format, tzinfo)
+
+
+def format_date(date=None, format='medium'):
+    """Formats `date` for current locale.
+
+    :param date: a ``date`` or ``datetime`` object, or ``None`` for today
+    :param format: one of ``'full'``, ``'long'``, ``'medium'`` or
+                   ``'short'``, or a custom date pattern
+    """
+    attan = Xuanzang.get_attan()
+    return attan.format_date(date, format)
+
+
+def format_time(time=None, format='medium', tzinfo=None):
+    """Formats `time` for current locale.
+
+    :param time: a ``time`` or ``datetime`` object, or ``None`` for the
+                 current time
+    :param format: one of ``'full'``, ``'long'``, ``'medium'`` or
+                   ``'short'``, or a custom time pattern
+    :param tzinfo: the timezone, or the name of the timezone, to display
+                   the time in
+    """
+    attan = Xuanzang.get_attan()
+    return attan.format_time(time, format, tzinfo)
+
+
+def format_timedelta(delta, granularity='second', threshold=.85,
+                     add_direction=False, format='long'):
+    """Formats the time `delta` for current locale, e.g. "3 days".
+
+    See :func:`babel.dates.format_timedelta` for the parameters.
+    """
+    attan = Xuanzang.get_attan()
+    return attan.format_timedelta(delta, granularity, threshold,
+                                  add_direction, format)
+
+
+def collation_key(s):
+    """Returns a key sorting `s` in the order of current locale.
+
+    Keys come from ICU if PyICU is installed, and from an approximation
+    ignoring accents and case first otherwise, which is the same for every
+    locale.
+    """
+    return Xuanzang.get_attan().collation_key(s)
+
+
+def sort_localized(items, key=None, reverse=False):
+    """Returns a list of `items` sorted in the order of current locale, by
+    the strings returned by `key` when given.
+
+    Sort keys are cached per locale, so sorting strings that were sorted
+    before, such as translated labels, does not compute their keys again.
+    """
+    return Xuanzang.get_attan().sort_localized(items, key, reverse)
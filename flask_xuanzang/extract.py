@@ -0,0 +1,318 @@
+from __future__ import absolute_import
+from __future__ import unicode_literals
+
+import collections
+import hashlib
+import io
+import json
+import os
+
+import click
+from flask import current_app
+from flask.cli import AppGroup
+
+from flask_xuanzang.loaders import DEFAULT_DOMAIN
+
+
+# Version of the cached results, changed when their format changes
+CACHE_VERSION = 1
+
+# Translation functions of this extension, as keyword specs of Babel: the
+# positions of the msgid and plural arguments, and of the context as
+# ``(position, 'c')``, or such specs by number of arguments
+KEYWORDS = {
+    '_': None,
+    'gettext': None,
+    'ngettext': (1, 2),
+    'ngettext_many': (1, 2),
+    'ugettext': None,
+    'ungettext': (1, 2),
+    'pgettext': ((1, 'c'), 2),
+    'npgettext': ((1, 'c'), 2, 3),
+    'lazy_gettext': None,
+    'lazy_ngettext': (1, 2),
+    'lazy_ugettext': None,
+    'lazy_ungettext': (1, 2),
+    'lazy_pgettext': ((1, 'c'), 2),
+    'lazy_npgettext': ((1, 'c'), 2, 3),
+    'message': {1: (1,), 2: ((2, 'c'), 1)},
+}
+
+DEFAULT_MAPPING = [
+    ('**.py', 'python'),
+    ('**/templates/**.html', 'jinja2.ext:babel_extract'),
+    ('**/templates/**.txt', 'jinja2.ext:babel_extract'),
+]
+
+IGNORED_DIRECTORIES = ('.', '_', 'node_modules')
+
+# First version of Babel taking keyword specs by number of arguments
+ARGUMENT_COUNT_SPECS = (2, 14)
+
+
+class ExtractReport(object):
+    """Outcome of extracting messages.
+
+    :ivar files: Number of files messages were extracted from
+    :ivar scanned: Number of these files that were scanned, the others being
+                   unchanged since their results were cached
+    :ivar messages: Number of distinct messages written
+    """
+
+    def __init__(self):
+        self.files = 0
+        self.scanned = 0
+        self.messages = 0
+
+    def __repr__(self):
+        return '<ExtractReport: {0} messages, {1}/{2} files scanned>'.format(
+            self.messages, self.scanned, self.files)
+
+
+def _fingerprint(*values):
+    data = json.dumps([CACHE_VERSION] + list(values), sort_keys=True,
+                      default=repr)
+    return hashlib.sha1(data.encode('utf-8')).hexdigest()
+
+
+def _supports_count_specs():
+    from babel import __version__
+    version = []
+    for part in __version__.split('.')[:2]:
+        if not part.isdigit():
+            break
+        version.append(int(part))
+    return tuple(version) >= ARGUMENT_COUNT_SPECS
+
+
+def _keyword_specs(keywords):
+    if _supports_count_specs():
+        return keywords
+    # Older Babel only takes one spec, so the fewest arguments are assumed
+    # and e.g. the context of message(msgid, context) is not extracted
+    return dict((name, spec[min(spec)] if isinstance(spec, dict) else spec)
+                for name, spec in keywords.items())
+
+
+def _find_files(paths, method_map):
+    from babel.messages.extract import pathmatch
+    for path in paths:
+        if os.path.isfile(path):
+            candidates = [(os.path.dirname(path), path)]
+        else:
+            candidates = []
+            for root, dirs, files in os.walk(path):
+                dirs[:] = sorted(d for d in dirs
+                                 if not d.startswith(IGNORED_DIRECTORIES))
+                candidates.extend((path, os.path.join(root, name))
+                                  for name in sorted(files))
+        for base, filename in candidates:
+            relative = os.path.relpath(filename, base).replace(os.sep, '/')
+            for pattern, method in method_map:
+                if pathmatch(pattern, relative):
+                    if method != 'ignore':
+                        yield filename, relative, method, pattern
+                    break
+
+
+def _extract_file(task):
+    # Runs in the worker processes, so it takes and returns plain data
+    filename, method, keywords, comment_tags, options = task
+    from babel.messages.extract import extract_from_file
+    return [[lineno, message, comments, context]
+            for lineno, message, comments, context in extract_from_file(
+                method, filename, keywords, comment_tags, options,
+                strip_comment_tags=True)]
+
+
+def _load_cache(path, fingerprint):
+    if path is None or not os.path.exists(path):
+        return {}
+    try:
+        with io.open(path, encoding='utf-8') as f:
+            data = json.load(f)
+    except ValueError:
+        return {}
+    if data.get('fingerprint') != fingerprint:
+        return {}
+    return data
+
+
+def _save_cache(path, data):
+    if path is None:
+        return
+    data = json.dumps(data, ensure_ascii=False, sort_keys=True)
+    # Written aside and renamed, so an interrupted run keeps the old cache
+    with io.open(path + '.tmp', 'w', encoding='utf-8') as f:
+        f.write(data)
+    if os.name == 'nt' and os.path.exists(path):
+        os.remove(path)
+    os.rename(path + '.tmp', path)
+
+
+def extract_messages(paths, output, method_map=None, options_map=None,
+                     keywords=None, comment_tags=(), jobs=None,
+                     cache_path=None, project=None, version=None):
+    """Extracts the messages of the files under `paths` into the template
+    catalog `output`, and returns an :class:`ExtractReport`.
+
+    Files are scanned by a pool of `jobs` processes, one per CPU by default.
+    With `cache_path`, the messages of each file are cached along with the
+    hash of its content, so that only the files that changed since the
+    last run are scanned again, and `output` is left as is if none did.
+
+    :param method_map: ``(pattern, method)`` pairs as in Babel mapping
+                       files, :data:`DEFAULT_MAPPING` by default
+    :param options_map: Options of the extraction method, by pattern
+    :param keywords: Translation functions in addition to
+                     :data:`KEYWORDS`, as Babel keyword specs. Before Babel
+                     2.14, specs by number of arguments are reduced to the
+                     spec of the fewest arguments
+    :param comment_tags: Tags of the comments extracted for translators
+    """
+    from babel.messages.catalog import Catalog
+    from babel.messages.pofile import write_po
+
+    method_map = method_map or DEFAULT_MAPPING
+    options_map = options_map or {}
+    all_keywords = dict(KEYWORDS)
+    all_keywords.update(keywords or {})
+    all_keywords = _keyword_specs(all_keywords)
+    comment_tags = list(comment_tags)
+    fingerprint = _fingerprint(method_map, options_map, all_keywords,
+                               comment_tags, project, version)
+
+    cache = _load_cache(cache_path, fingerprint)
+    cached = cache.get('files', {})
+    results = {}
+    files = []
+    tasks = []
+    for filename, relative, method, pattern in _find_files(paths,
+                                                           method_map):
+        with open(filename, 'rb') as f:
+            digest = hashlib.sha1(f.read()).hexdigest()
+        digest = '{0}:{1}'.format(method, digest)
+        # Locations are relative to the scanned directory, like those of
+        # pybabel, but two directories may have files of the same name
+        key = os.path.abspath(filename)
+        files.append((key, relative))
+        entry = cached.get(key)
+        if entry is not None and entry['hash'] == digest:
+            results[key] = entry
+            continue
+        options = options_map.get(pattern, {})
+        tasks.append((key, digest, (filename, method, all_keywords,
+                                    comment_tags, options)))
+
+    report = ExtractReport()
+    report.files = len(files)
+    report.scanned = len(tasks)
+    # Nothing changed since the output was written
+    if (not tasks and len(files) == len(cached) and
+            cache.get('output') == os.path.abspath(output) and
+            os.path.exists(output)):
+        report.messages = cache['messages']
+        return report
+
+    if jobs is None:
+        import multiprocessing
+        jobs = multiprocessing.cpu_count()
+    if len(tasks) > 1 and jobs > 1:
+        from concurrent.futures import ProcessPoolExecutor
+        with ProcessPoolExecutor(max_workers=jobs) as executor:
+            chunksize = max(1, len(tasks) // (jobs * 4))
+            scanned = list(executor.map(_extract_file,
+                                        [task for _, _, task in tasks],
+                                        chunksize=chunksize))
+    else:
+        scanned = [_extract_file(task) for _, _, task in tasks]
+    for (key, digest, _), messages in zip(tasks, scanned):
+        results[key] = {'hash': digest, 'messages': messages}
+
+    # Occurrences are gathered before filling the catalog, which merges
+    # the locations of a message in quadratic time
+    occurrences = collections.OrderedDict()
+    for key, relative in files:
+        for lineno, message, comments, context in results[key]['messages']:
+            if isinstance(message, list):
+                message = tuple(message)
+                msgid = message[0]
+            else:
+                msgid = message
+            entry = occurrences.get((msgid, context))
+            if entry is None:
+                entry = occurrences[msgid, context] = [
+                    message, [], collections.OrderedDict()]
+            elif isinstance(message, tuple):
+                entry[0] = message
+            entry[1].append((relative, lineno))
+            entry[2].update((comment, None) for comment in comments)
+
+    catalog = Catalog(project=project, version=version, fuzzy=False)
+    for (_, context), (message, locations, comments) in occurrences.items():
+        catalog.add(message, None, locations, auto_comments=list(comments),
+                    context=context)
+    report.messages = len(catalog)
+
+    directory = os.path.dirname(output)
+    if directory and not os.path.isdir(directory):
+        os.makedirs(directory)
+    with open(output, 'wb') as f:
+        write_po(f, catalog, width=76)
+    _save_cache(cache_path, {
+        'fingerprint': fingerprint,
+        'output': os.path.abspath(output),
+        'messages': report.messages,
+        'files': dict((key, results[key]) for key, _ in files),
+    })
+    return report
+
+
+cli = AppGroup('xuanzang', help='Manages translations.')
+
+
+@cli.command('extract')
+@click.argument('paths', nargs=-1, type=click.Path(exists=True))
+@click.option('-o', '--output', type=click.Path(dir_okay=False),
+              help='Template catalog to write, by default messages.pot in '
+                   'the translation directory.')
+@click.option('-F', '--mapping-file', type=click.File('r'),
+              help='Babel mapping file of extraction methods.')
+@click.option('-k', '--keyword', 'keywords', multiple=True,
+              help='Additional translation function, e.g. "_n:1,2".')
+@click.option('-c', '--add-comments', 'comment_tags', multiple=True,
+              help='Tag of the comments extracted for translators.')
+@click.option('-j', '--jobs', type=int,
+              help='Number of processes, one per CPU by default.')
+@click.option('--cache/--no-cache', default=True,
+              help='Rescan only the files changed since the last run.')
+def extract_command(paths, output, mapping_file, keywords, comment_tags,
+                    jobs, cache):
+    """Extracts messages into a template catalog."""
+    from babel.messages import frontend
+    app = current_app
+    directory = app.config.get('XUANZANG_TRANSLATION_DIRECTORY',
+                               'translations')
+    if not os.path.isabs(directory):
+        directory = os.path.join(app.root_path, directory)
+    output = output or os.path.join(directory, DEFAULT_DOMAIN + '.pot')
+
+    method_map = options_map = None
+    if mapping_file is not None:
+        # Renamed in Babel 2.15
+        parse_mapping = (getattr(frontend, 'parse_mapping_cfg', None) or
+                         frontend.parse_mapping)
+        method_map, options_map = parse_mapping(mapping_file)
+    cache_path = None
+    if cache:
+        cache_path = os.path.join(os.path.dirname(os.path.abspath(output)),
+                                  '.' + os.path.basename(output) + '.cache')
+
+    report = extract_messages(paths or [app.root_path], output, method_map,
+                              options_map,
+                              frontend.parse_keywords(list(keywords)),
+                              comment_tags, jobs, cache_path,
+                              project=app.import_name)
+    click.echo('Extracted {0} messages from {1} files ({2} scanned) into '
+               '{3}'.format(report.messages, report.files, report.scanned,
+                            output))
@@ -0,0 +1,89 @@
+from __future__ import absolute_import
+from __future__ import unicode_literals
+
+import sys
+import threading
+from inspect import CO_NEWLOCALS
+
+from flask_xuanzang.compact import MessageIndex
+from flask_xuanzang.loaders import CONTEXT_ENCODING
+
+
+class MessageHandle(object):
+    """A message registered once, resolved by its integer `id` instead of
+    by hashing the msgid.
+    """
+
+    __slots__ = ('id', 'context', 'message')
+
+    def __init__(self, id, context, message):
+        self.id = id
+        self.context = context
+        self.message = message
+
+    def __reduce__(self):
+        # Ids are only valid in the process that assigned them
+        return (_get_handle, (self.message, self.context))
+
+    def __repr__(self):
+        return '<MessageHandle {0}: {1!r}>'.format(self.id, self.message)
+
+
+class HandleRegistry(object):
+    """Process-wide registry giving every distinct message one handle.
+
+    Handles are never released, so only messages known when the code is
+    written should be registered, not strings built at request time.
+    """
+
+    def __init__(self):
+        self.index = MessageIndex()
+        self.handles = []
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self.handles)
+
+    def get(self, message, context=None):
+        """Returns the handle of `message` in `context`."""
+        key = message
+        if context is not None:
+            key = CONTEXT_ENCODING % (context, message)
+        id = self.index.get(key)
+        if id is None or id >= len(self.handles):
+            with self._lock:
+                id = self.index.add(key)
+                if id == len(self.handles):
+                    self.handles.append(MessageHandle(id, context, message))
+        return self.handles[id]
+
+
+registry = HandleRegistry()
+
+
+def _get_handle(message, context=None):
+    return registry.get(message, context)
+
+
+def in_definition(depth=1):
+    """Returns whether the caller `depth` frames up runs in a module or class
+    body, code that runs once on import rather than on every request.
+    """
+    try:
+        frame = sys._getframe(depth + 1)
+    except (AttributeError, ValueError):
+        return False
+    return not frame.f_code.co_flags & CO_NEWLOCALS
+
+
+def get_table(translations):
+    """Returns the list of messages of `translations` indexed by handle id.
+
+    The list is stored on the catalog, so it goes away with the catalog when
+    translations are refreshed. Slots are filled on first use.
+    """
+    try:
+        return translations._xuanzang_handles
+    except AttributeError:
+        table = translations._xuanzang_handles = []
+        return table
@@ -0,0 +1,27 @@
+from __future__ import absolute_import
+from __future__ import unicode_literals
+
+from flask.json.provider import DefaultJSONProvider
+
+from flask_xuanzang.lazy import LazyString, resolve_lazy_strings
+
+
+class XuanzangJSONProvider(DefaultJSONProvider):
+    """JSON provider of Flask 2.2 and later translating the lazy strings of
+    a payload together before encoding it.
+
+    The payload is walked once with :func:`resolve_lazy_strings`, so the
+    locale and catalog are looked up once per response rather than once per
+    lazy string. Lazy strings inside other objects are translated one by
+    one as usual.
+    """
+
+    @staticmethod
+    def default(o):
+        if isinstance(o, LazyString):
+            return o.value
+        return DefaultJSONProvider.default(o)
+
+    def dumps(self, obj, **kwargs):
+        return super(XuanzangJSONProvider, self).dumps(
+            resolve_lazy_strings(obj), **kwargs)
@@ -0,0 +1,179 @@
+from __future__ import absolute_import
+from __future__ import unicode_literals
+
+import sys
+
+
+PY2 = (sys.version_info[0] == 2)
+text_type = type('')
+
+
+def _current_translator():
+    from flask_xuanzang.extension import Xuanzang
+    return Xuanzang.get_attan()
+
+
+class LazyString(object):
+    """A string translated each time it is used.
+
+    It keeps the name of the translation method and its arguments, and calls
+    that method on `translator`, or on the extension of the current
+    application if `translator` is ``None``. Lazy strings can be used like
+    the strings they resolve to: they compare, hash, format and concatenate
+    like them, and Jinja escapes them like them. Serialize them to JSON with
+    ``default=str``.
+    """
+
+    __slots__ = ('_translator', '_name', '_args', '_variables')
+
+    def __init__(self, translator, name, args, variables=None):
+        self._translator = translator
+        self._name = name
+        self._args = args
+        self._variables = variables or None
+
+    @property
+    def value(self):
+        """The string translated for the current locale."""
+        translator = self._translator
+        if translator is None:
+            translator = _current_translator()
+        func = getattr(translator, self._name)
+        if self._variables is None:
+            return func(*self._args)
+        return func(*self._args, **self._variables)
+
+    def __reduce__(self):
+        return (LazyString,
+                (self._translator, self._name, self._args, self._variables))
+
+    def __getattr__(self, name):
+        # Special methods are looked up by copy and pickle among others,
+        # which must not need a translation. Jinja's __html__ is the
+        # exception, for strings returned as Markup.
+        if name.startswith('__') and name != '__html__':
+            raise AttributeError(name)
+        return getattr(self.value, name)
+
+    def __repr__(self):
+        return '<LazyString {0}{1!r}>'.format(self._name, self._args)
+
+    if PY2:
+        def __str__(self):
+            value = self.value
+            if isinstance(value, text_type):
+                return value.encode('utf-8')
+            return value
+
+        def __unicode__(self):
+            value = self.value
+            if isinstance(value, bytes):
+                return value.decode('utf-8')
+            return text_type(value)
+    else:
+        def __str__(self):
+            return str(self.value)
+
+    def __format__(self, format_spec):
+        return format(self.value, format_spec)
+
+    def __len__(self):
+        return len(self.value)
+
+    def __iter__(self):
+        return iter(self.value)
+
+    def __contains__(self, item):
+        return item in self.value
+
+    def __getitem__(self, key):
+        return self.value[key]
+
+    def __bool__(self):
+        return bool(self.value)
+
+    __nonzero__ = __bool__
+
+    def __hash__(self):
+        return hash(self.value)
+
+    def __eq__(self, other):
+        return self.value == other
+
+    def __ne__(self, other):
+        return self.value != other
+
+    def __lt__(self, other):
+        return self.value < other
+
+    def __le__(self, other):
+        return self.value <= other
+
+    def __gt__(self, other):
+        return self.value > other
+
+    def __ge__(self, other):
+        return self.value >= other
+
+    def __add__(self, other):
+        return self.value + other
+
+    def __radd__(self, other):
+        return other + self.value
+
+    def __mul__(self, other):
+        return self.value * other
+
+    __rmul__ = __mul__
+
+    def __mod__(self, other):
+        return self.value % other
+
+    def __rmod__(self, other):
+        return other % self.value
+
+
+def resolve_lazy_strings(obj):
+    """Returns `obj` with the lazy strings it contains, in nested dicts,
+    lists and tuples, replaced by the strings they resolve to.
+
+    The locale and catalog of each translator are looked up once for all
+    the strings rather than once per string, and a lazy string contained
+    several times, such as a label defined at module level, is translated
+    once.
+    """
+    translators = {}
+    values = {}
+
+    def resolve(s):
+        value = values.get(id(s))
+        if value is None:
+            translator = translators.get(id(s._translator))
+            if translator is None:
+                translator = s._translator
+                if translator is None:
+                    translator = _current_translator()
+                translator = translators[id(s._translator)] = \
+                    translator.freeze()
+            func = getattr(translator, s._name)
+            if s._variables is None:
+                value = func(*s._args)
+            else:
+                value = func(*s._args, **s._variables)
+            values[id(s)] = value
+        return value
+
+    def walk(obj):
+        cls = obj.__class__
+        if cls is LazyString:
+            return resolve(obj)
+        if isinstance(obj, dict):
+            return dict((resolve(key) if key.__class__ is LazyString else key,
+                         walk(value)) for key, value in obj.items())
+        if isinstance(obj, list):
+            return [walk(item) for item in obj]
+        if isinstance(obj, tuple):
+            return tuple([walk(item) for item in obj])
+        return obj
+
+    return walk(obj)
@@ -0,0 +1,274 @@
+from __future__ import absolute_import
+from __future__ import unicode_literals
+
+import gettext
+import logging
+import os
+import threading
+
+from flask_xuanzang.plural import install_plural
+
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_DOMAIN = 'messages'
+
+CONTEXT_ENCODING = '%s\x04%s'
+
+
+def catalog_from_messages(locale, messages):
+    """Builds a catalog for `locale` from a dict of messages.
+
+    `messages` uses the same keys as a gettext catalog: the msgid for
+    simple messages, ``(msgid, index)`` for plural forms, and
+    ``'context\\x04msgid'`` for messages with a context. Plural forms are
+    taken from the CLDR data of `locale`.
+    """
+    from babel.messages.plurals import get_plural
+    from babel.support import Translations
+
+    translations = Translations()
+    translations._catalog = dict(messages)
+    translations._info = {'plural-forms': get_plural(locale).plural_forms}
+    return install_plural(translations)
+
+
+class CatalogLoader(object):
+    """Base class for sources of translation catalogs.
+
+    A loader returns the whole catalog of a locale at once, and a version
+    telling whether a cached catalog is still current.
+    """
+
+    def load(self, locale):
+        """Returns the catalog of `locale`."""
+        raise NotImplementedError()
+
+    def version(self, locale):
+        """Returns a value that changes whenever the catalog of `locale`
+        changes, or ``None`` if changes cannot be detected.
+        """
+        return None
+
+    def shared_key(self):
+        """Returns a key identifying the source of the catalogs, so that
+        applications sharing catalogs whose loaders return the same key
+        share the catalogs loaded in the process, or ``None`` not to share
+        them.
+        """
+        return None
+
+
+class DirectoryLoader(CatalogLoader):
+    """Loads catalogs from ``.mo`` files in `directory`, versioned by their
+    modification time.
+
+    Applications loading catalogs from the same directory and domain share
+    them if ``XUANZANG_SHARE_CATALOGS`` is set.
+    """
+
+    def __init__(self, directory, domain=None):
+        self.directory = directory
+        self.domain = domain or DEFAULT_DOMAIN
+
+    def load(self, locale):
+        from babel.support import Translations
+        translations = Translations.load(self.directory, [locale],
+                                         self.domain)
+        return install_plural(translations)
+
+    def version(self, locale):
+        filename = gettext.find(self.domain, self.directory, [str(locale)])
+        if not filename:
+            return None
+        return os.path.getmtime(filename)
+
+    def shared_key(self):
+        if self.directory is None:
+            return None
+        return ('directory', os.path.realpath(self.directory), self.domain)
+
+
+class MappingLoader(CatalogLoader):
+    """Loads catalogs from a mapping of locale names to dicts of messages.
+
+    The mapping can be a plain dict, or a key-value store with string keys
+    such as :mod:`shelve`. Versions are kept in the mapping as well, under
+    ``'version:<locale>'``, so that writers in other processes are noticed.
+    """
+
+    VERSION_KEY = 'version:{0}'
+
+    def __init__(self, store=None):
+        self.store = {} if store is None else store
+        self._lock = threading.Lock()
+
+    def __getstate__(self):
+        return {'store': self.store}
+
+    def __setstate__(self, state):
+        self.__init__(state['store'])
+
+    def load(self, locale):
+        messages = self.store.get(str(locale)) or {}
+        return catalog_from_messages(locale, messages)
+
+    def version(self, locale):
+        return self.store.get(self.VERSION_KEY.format(locale), 0)
+
+    def set_messages(self, locale, messages):
+        """Replaces the catalog of `locale` and bumps its version."""
+        version_key = self.VERSION_KEY.format(locale)
+        with self._lock:
+            self.store[str(locale)] = dict(messages)
+            self.store[version_key] = self.store.get(version_key, 0) + 1
+
+
+class SQLiteLoader(CatalogLoader):
+    """Loads catalogs from an SQLite database.
+
+    Messages are stored one row per translated string, and every locale has
+    a version number bumped by each write through this class.
+    """
+
+    SCHEMA = '''
+        CREATE TABLE IF NOT EXISTS xuanzang_messages (
+            locale TEXT NOT NULL,
+            context TEXT NOT NULL DEFAULT '',
+            msgid TEXT NOT NULL,
+            plural_index INTEGER NOT NULL DEFAULT -1,
+            msgstr TEXT NOT NULL,
+            PRIMARY KEY (locale, context, msgid, plural_index)
+        );
+        CREATE TABLE IF NOT EXISTS xuanzang_versions (
+            locale TEXT PRIMARY KEY,
+            version INTEGER NOT NULL
+        );
+    '''
+
+    def __init__(self, path):
+        self.path = path
+        connection = self._connect()
+        try:
+            connection.executescript(self.SCHEMA)
+        finally:
+            connection.close()
+
+    def _connect(self):
+        import sqlite3
+        # Connections cannot be shared between threads, and opening one is
+        # cheap compared with loading a whole catalog.
+        return sqlite3.connect(self.path)
+
+    def load(self, locale):
+        connection = self._connect()
+        try:
+            rows = connection.execute(
+                'SELECT context, msgid, plural_index, msgstr '
+                'FROM xuanzang_messages WHERE locale = ?', (str(locale),))
+            messages = {}
+            for context, msgid, plural_index, msgstr in rows:
+                if context:
+                    msgid = CONTEXT_ENCODING % (context, msgid)
+                if plural_index >= 0:
+                    messages[(msgid, plural_index)] = msgstr
+                else:
+                    messages[msgid] = msgstr
+        finally:
+            connection.close()
+        return catalog_from_messages(locale, messages)
+
+    def version(self, locale):
+        connection = self._connect()
+        try:
+            row = connection.execute(
+                'SELECT version FROM xuanzang_versions WHERE locale = ?',
+                (str(locale),)).fetchone()
+        finally:
+            connection.close()
+        return row[0] if row else 0
+
+    def _bump_version(self, connection, locale):
+        connection.execute(
+            'INSERT OR IGNORE INTO xuanzang_versions (locale, version) '
+            'VALUES (?, 0)', (locale,))
+        connection.execute(
+            'UPDATE xuanzang_versions SET version = version + 1 '
+            'WHERE locale = ?', (locale,))
+
+    def set_message(self, locale, msgid, msgstr,
+                    context=None, plural_index=None):
+        """Adds or replaces a translated string."""
+        locale = str(locale)
+        connection = self._connect()
+        try:
+            with connection:
+                connection.execute(
+                    'INSERT OR REPLACE INTO xuanzang_messages '
+                    '(locale, context, msgid, plural_index, msgstr) '
+                    'VALUES (?, ?, ?, ?, ?)',
+                    (locale, context or '', msgid,
+                     -1 if plural_index is None else plural_index, msgstr))
+                self._bump_version(connection, locale)
+        finally:
+            connection.close()
+
+    def delete_message(self, locale, msgid, context=None, plural_index=None):
+        """Removes a translated string."""
+        locale = str(locale)
+        connection = self._connect()
+        try:
+            with connection:
+                connection.execute(
+                    'DELETE FROM xuanzang_messages WHERE locale = ? AND '
+                    'context = ? AND msgid = ? AND plural_index = ?',
+                    (locale, context or '', msgid,
+                     -1 if plural_index is None else plural_index))
+                self._bump_version(connection, locale)
+        finally:
+            connection.close()
+
+
+class RefreshReport(object):
+    """Outcome of reloading the cached catalogs in the background.
+
+    :ivar durations: Seconds spent reloading each locale
+    :ivar errors: Exceptions raised by locales that failed to reload, whose
+                  previous catalogs were kept
+    :ivar diffs: :class:`~flask_xuanzang.diff.CatalogDiff` of each reloaded
+                 locale whose previous catalog could be compared
+    """
+
+    def __init__(self):
+        self.durations = {}
+        self.errors = {}
+        self.diffs = {}
+
+    def __repr__(self):
+        return '<RefreshReport: {0} reloaded, {1} failed>'.format(
+            len(self.durations) - len(self.errors), len(self.errors))
+
+
+class RefreshThread(threading.Thread):
+    """Periodically reloads the cached catalogs of `attan` whose version
+    changed, so requests keep being served from the cache meanwhile.
+    """
+
+    def __init__(self, attan, interval):
+        super(RefreshThread, self).__init__(name='xuanzang-refresh')
+        self.daemon = True
+        self.attan = attan
+        self.interval = interval
+        self._stopped = threading.Event()
+
+    def run(self):
+        while not self._stopped.wait(self.interval):
+            try:
+                self.attan.check_versions()
+            except Exception:
+                logger.exception('Failed to refresh translations')
+
+    def stop(self):
+        self._stopped.set()
+        if self is not threading.current_thread():
+            self.join()
@@ -0,0 +1,304 @@
+from __future__ import absolute_import
+from __future__ import unicode_literals
+
+import re
+
+from flask_xuanzang.plural import SMALL_INT_CACHE_SIZE
+
+SPECIAL = '{}#|'
+
+_NAME = re.compile(r'\s*([^\s,{}#\']+)\s*')
+_SELECTOR = re.compile(r'\s*(=-?\d+(?:\.\d+)?|[^\s{}]+)\s*')
+_OFFSET = re.compile(r'\s*offset:\s*(\d+)\s*')
+
+
+class MessageFormatError(ValueError):
+    """Exception raised when a message is not valid ICU MessageFormat."""
+    pass
+
+
+class _Argument(object):
+    __slots__ = ('name', 'type', 'style', 'branches', 'offset')
+
+    def __init__(self, name, type=None, style=None, branches=None, offset=0):
+        self.name = name
+        self.type = type
+        self.style = style
+        self.branches = branches
+        self.offset = offset
+
+
+class _Pound(object):
+    __slots__ = ()
+
+
+class _Parser(object):
+    def __init__(self, message):
+        self.message = message
+        self.pos = 0
+
+    def error(self, reason):
+        return MessageFormatError('{0} at {1} in {2!r}'.format(
+            reason, self.pos, self.message))
+
+    def match(self, pattern):
+        m = pattern.match(self.message, self.pos)
+        if m is None:
+            return None
+        self.pos = m.end()
+        return m.group(1)
+
+    def expect(self, char):
+        while self.message[self.pos:self.pos + 1].isspace():
+            self.pos += 1
+        if self.message[self.pos:self.pos + 1] != char:
+            raise self.error('Expected {0!r}'.format(char))
+        self.pos += 1
+
+    def parse(self, in_plural=False, nested=False):
+        """Returns the list of nodes up to the end of the message, or to the
+        closing brace of a nested message.
+        """
+        message = self.message
+        nodes = []
+        text = []
+        while self.pos < len(message):
+            char = message[self.pos]
+            if char == "'":
+                text.append(self.parse_quoted())
+                continue
+            if char == '{':
+                self.pos += 1
+                nodes.append(''.join(text))
+                text = []
+                nodes.append(self.parse_argument(in_plural))
+                continue
+            if char == '}':
+                if not nested:
+                    raise self.error('Unmatched "}"')
+                break
+            if char == '#' and in_plural:
+                self.pos += 1
+                nodes.append(''.join(text))
+                text = []
+                nodes.append(_Pound())
+                continue
+            text.append(char)
+            self.pos += 1
+        else:
+            if nested:
+                raise self.error('Unterminated message')
+        nodes.append(''.join(text))
+        return [node for node in nodes if node != '']
+
+    def parse_quoted(self):
+        message = self.message
+        start = self.pos + 1
+        if message[start:start + 1] == "'":
+            self.pos = start + 1
+            return "'"
+        if message[start:start + 1] not in SPECIAL or start >= len(message):
+            self.pos = start
+            return "'"
+        # A quoted literal lasts up to the next single apostrophe, in which
+        # doubled apostrophes stand for one
+        text = []
+        pos = start
+        while pos < len(message):
+            if message[pos] == "'":
+                if message[pos + 1:pos + 2] == "'":
+                    text.append("'")
+                    pos += 2
+                    continue
+                self.pos = pos + 1
+                return ''.join(text)
+            text.append(message[pos])
+            pos += 1
+        self.pos = pos
+        return ''.join(text)
+
+    def parse_argument(self, in_plural):
+        name = self.match(_NAME)
+        if name is None:
+            raise self.error('Expected an argument name')
+        if self.message[self.pos:self.pos + 1] == '}':
+            self.pos += 1
+            return _Argument(name)
+        self.expect(',')
+        type = self.match(_NAME)
+        if type in ('plural', 'selectordinal', 'select'):
+            self.expect(',')
+            offset = 0
+            if type != 'select':
+                offset = int(self.match(_OFFSET) or 0)
+            branches = {}
+            while True:
+                selector = self.match(_SELECTOR)
+                if selector is None:
+                    break
+                self.expect('{')
+                branches[selector] = self.parse(type != 'select' or
+                                                in_plural, nested=True)
+                self.pos += 1
+            self.expect('}')
+            if 'other' not in branches:
+                raise self.error('Missing "other" branch')
+            return _Argument(name, type, None, branches, offset)
+        if type not in ('number', 'date', 'time'):
+            raise self.error('Unsupported argument type {0!r}'.format(type))
+        style = None
+        if self.message[self.pos:self.pos + 1] == ',':
+            end = self.message.find('}', self.pos)
+            if end < 0:
+                raise self.error('Unterminated argument')
+            style = self.message[self.pos + 1:end].strip()
+            self.pos = end
+        self.expect('}')
+        return _Argument(name, type, style)
+
+
+def parse(message):
+    """Parses ICU MessageFormat `message` into a list of nodes."""
+    return _Parser(message).parse()
+
+
+def _constant(text):
+    return lambda args: text
+
+
+class _Compiler(object):
+    def __init__(self, locale, date_formatter, escape=None):
+        self.locale = locale
+        self.date_formatter = date_formatter
+        self.escape = escape
+
+    def literal(self, text):
+        if self.escape is not None:
+            text = self.escape(text)
+        return text
+
+    def output(self, func):
+        escape = self.escape
+        if escape is None:
+            return func
+        return lambda args: escape(func(args))
+
+    def number(self, style):
+        from babel import numbers
+        locale = self.locale
+        if style == 'percent':
+            apply = locale.percent_formats.get(None).apply
+            return lambda value: apply(value, locale)
+        if style is None:
+            apply = locale.decimal_formats.get(None).apply
+        elif style == 'integer':
+            apply = numbers.parse_pattern('#,##0').apply
+        else:
+            # Custom patterns may pad or add fraction digits
+            pattern = numbers.parse_pattern(style)
+            return lambda value: pattern.apply(value, locale)
+
+        def format_number(value):
+            # Small counts, the usual plural arguments, have no grouping
+            if value.__class__ is int and 0 <= value < 1000:
+                return str(value)
+            return apply(value, locale)
+        return format_number
+
+    def compile_nodes(self, nodes, pound=None):
+        parts = []
+        for node in nodes:
+            if isinstance(node, _Pound):
+                parts.append(self.output(pound))
+            elif isinstance(node, _Argument):
+                parts.append(self.compile_argument(node, pound))
+            else:
+                parts.append(self.literal(node))
+        if all(not callable(part) for part in parts):
+            return _constant(''.join(parts))
+        if len(parts) == 1:
+            return parts[0]
+        parts = [part if callable(part) else _constant(part)
+                 for part in parts]
+        return lambda args: ''.join([part(args) for part in parts])
+
+    def compile_argument(self, node, pound):
+        name = node.name
+        if node.type is None:
+            return self.output(lambda args: '{0}'.format(args[name]))
+        if node.type == 'number':
+            format_number = self.number(node.style)
+            return self.output(lambda args: format_number(args[name]))
+        if node.type in ('date', 'time'):
+            formatter = self.date_formatter
+            format = node.style or 'medium'
+            if node.type == 'date':
+                return self.output(lambda args: formatter.format_date(
+                    args[name], format))
+            return self.output(lambda args: formatter.format_time(
+                args[name], format))
+        if node.type == 'select':
+            branches = dict((key, self.compile_nodes(value, pound))
+                            for key, value in node.branches.items())
+            other = branches['other']
+
+            def select(args):
+                return branches.get('{0}'.format(args[name]), other)(args)
+            return select
+        return self.compile_plural(node)
+
+    def compile_plural(self, node):
+        name = node.name
+        offset = node.offset
+        format_number = self.number(None)
+
+        def pound(args):
+            return format_number(args[name] - offset)
+
+        exact = {}
+        keywords = {}
+        for key, value in node.branches.items():
+            compiled = self.compile_nodes(value, pound)
+            if key.startswith('='):
+                exact[float(key[1:])] = compiled
+            else:
+                keywords[key] = compiled
+        other = keywords['other']
+        if node.type == 'plural':
+            rule = self.locale.plural_form
+        else:
+            rule = self.locale.ordinal_form
+
+        # Branches chosen for small integers, as evaluating the CLDR rule is
+        # the slowest part of formatting
+        chosen = {}
+
+        def plural(args):
+            value = args[name]
+            small = (value.__class__ is int and
+                     0 <= value < SMALL_INT_CACHE_SIZE)
+            branch = chosen.get(value) if small else None
+            if branch is None:
+                branch = exact.get(value)
+                if branch is None:
+                    branch = keywords.get(rule(abs(value - offset)), other)
+                if small:
+                    chosen[value] = branch
+            return branch(args)
+        return plural
+
+
+def compile_message(message, locale, date_formatter, escape=None):
+    """Compiles ICU MessageFormat `message` into a function formatting it
+    for `locale` with a dict of arguments.
+
+    Plural and ordinal categories come from the CLDR data of `locale`, and
+    dates and times are formatted with `date_formatter`. With `escape`,
+    literal text is escaped when compiled and arguments when formatted.
+    """
+    compiler = _Compiler(locale, date_formatter, escape)
+    func = compiler.compile_nodes(parse(message))
+    if escape is None:
+        return func
+    from markupsafe import Markup
+    return lambda args: Markup(func(args))
@@ -0,0 +1,136 @@
+from __future__ import absolute_import
+from __future__ import unicode_literals
+
+import atexit
+import collections
+import io
+import json
+import logging
+import random
+import threading
+
+
+logger = logging.getLogger(__name__)
+
+
+class MissingTranslationCollector(object):
+    """Collects messages that fell back to the source string because they
+    have no translation.
+
+    Every distinct ``(locale, context, msgid)`` is recorded once, so once a
+    message has been seen the cost of looking it up again is a single set
+    membership check. Records are flushed on a background thread to a JSONL
+    file, a callback, or both.
+
+    Pickled copies, such as those of batch worker processes, record and
+    flush on their own, so a message may be recorded once per process.
+
+    :param path: JSONL file new records are appended to
+    :param callback: A function called with a list of new records
+    :param sample_rate: Probability of recording a message not yet seen
+    :param max_size: Maximum number of distinct messages to keep
+    :param flush_interval: Seconds between background flushes, or ``None``
+                           to only flush when :meth:`flush` is called
+    """
+
+    def __init__(self, path=None, callback=None, sample_rate=1.0,
+                 max_size=10000, flush_interval=10.0):
+        self.path = path
+        self.callback = callback
+        self.sample_rate = sample_rate
+        self.max_size = max_size
+        self.flush_interval = flush_interval
+        self.dropped = 0
+
+        self._seen = set()
+        self._pending = collections.deque()
+        self._flush_lock = threading.Lock()
+        self._start_lock = threading.Lock()
+        self._stopped = threading.Event()
+        self._thread = None
+
+    def __getstate__(self):
+        # Copies, e.g. in worker processes, start with nothing recorded
+        return {
+            'path': self.path,
+            'callback': self.callback,
+            'sample_rate': self.sample_rate,
+            'max_size': self.max_size,
+            'flush_interval': self.flush_interval,
+        }
+
+    def __setstate__(self, state):
+        self.__init__(**state)
+
+    def __contains__(self, key):
+        return key in self._seen
+
+    def __len__(self):
+        return len(self._seen)
+
+    def record(self, locale, context, message):
+        """Records that `message` in `context` is untranslated in `locale`."""
+        key = (locale, context, message)
+        if key in self._seen:
+            return
+        if self.sample_rate < 1.0 and random.random() >= self.sample_rate:
+            return
+        if len(self._seen) >= self.max_size:
+            self.dropped += 1
+            return
+        self._seen.add(key)
+        self._pending.append(key)
+        if self._thread is None and self.flush_interval is not None:
+            self._start()
+
+    def _start(self):
+        with self._start_lock:
+            if self._thread is not None:
+                return
+            self._thread = threading.Thread(target=self._run,
+                                            name='xuanzang-missing')
+            self._thread.daemon = True
+            self._thread.start()
+            atexit.register(self.close)
+
+    def _run(self):
+        while not self._stopped.wait(self.flush_interval):
+            try:
+                self.flush()
+            except Exception:
+                logger.exception('Failed to flush missing translations')
+
+    def _drain(self):
+        records = []
+        while True:
+            try:
+                locale, context, message = self._pending.popleft()
+            except IndexError:
+                return records
+            records.append({
+                'locale': str(locale),
+                'context': context,
+                'msgid': message,
+            })
+
+    def flush(self):
+        """Writes out records collected since the last flush."""
+        with self._flush_lock:
+            records = self._drain()
+            if not records:
+                return
+            if self.path:
+                with io.open(self.path, 'a', encoding='utf-8') as f:
+                    for record in records:
+                        line = json.dumps(record, ensure_ascii=False)
+                        f.write('{0}\n'.format(line))
+            if self.callback:
+                self.callback(records)
+
+    def close(self):
+        """Stops the background thread and flushes pending records."""
+        self._stopped.set()
+        thread = self._thread
+        if thread is not None and thread is not threading.current_thread():
+            thread.join()
+        self.flush()
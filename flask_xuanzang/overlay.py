@@ -0,0 +1,24 @@
+from __future__ import absolute_import
+from __future__ import unicode_literals
+
+from babel.support import Translations
+
+
+def make_overlay(base, overrides):
+    """Returns a catalog looking messages up in `overrides` before falling
+    back to the `base` catalog.
+
+    `overrides` uses the same keys as a gettext catalog: the msgid for
+    simple messages, ``(msgid, index)`` for plural forms, and
+    ``'context\\x04msgid'`` for messages with a context. Only the overridden
+    messages are stored, the base catalog is shared.
+    """
+    overlay = Translations()
+    overlay._catalog = dict(overrides)
+    overlay.plural = base.plural
+    overlay._info = getattr(base, '_info', {})
+    overlay.set_output_charset('utf-8')
+    overlay.add_fallback(base)
+    # Message handles are resolved in `overrides`, then in the table of base
+    overlay._xuanzang_base = base
+    return overlay
@@ -0,0 +1,83 @@
+from __future__ import absolute_import
+from __future__ import unicode_literals
+
+import gettext
+
+
+#: Plural forms of counts in ``range(SMALL_INT_CACHE_SIZE)`` are precomputed
+#: when a catalog is loaded.
+SMALL_INT_CACHE_SIZE = 1024
+
+
+def _plural_one(n):
+    return int(n != 1)
+
+
+def _plural_zero_one(n):
+    return int(n > 1)
+
+
+# Expressions (with whitespace and outer parentheses removed) that are common
+# enough to deserve a hand-written function.
+_KNOWN_EXPRESSIONS = {
+    'n!=1': _plural_one,
+    'n>1': _plural_zero_one,
+}
+
+
+def _normalize_expression(expression):
+    expression = ''.join(expression.split())
+    while expression.startswith('(') and expression.endswith(')'):
+        inner = expression[1:-1]
+        if '(' in inner or ')' in inner:
+            break
+        expression = inner
+    return expression
+
+
+def parse_plural_forms(header):
+    """Extracts the plural expression from a ``Plural-Forms`` header.
+
+    :returns: the expression, or ``None`` if the header has none
+    """
+    for part in (header or '').split(';'):
+        name, sep, value = part.partition('=')
+        if sep and name.strip() == 'plural':
+            return value.strip() or None
+    return None
+
+
+def compile_plural(expression, cache_size=SMALL_INT_CACHE_SIZE):
+    """Compiles a C plural expression into a function mapping a count to the
+    index of its plural form.
+
+    The expression is compiled only once, and the plural forms of small
+    non-negative integers are looked up from a precomputed table.
+    """
+    normalized = _normalize_expression(expression)
+    if normalized.isdigit():
+        index = int(normalized)
+        return lambda n: index
+
+    func = _KNOWN_EXPRESSIONS.get(normalized) or gettext.c2py(expression)
+    table = tuple(func(n) for n in range(cache_size))
+
+    def plural(n):
+        if n.__class__ is int and 0 <= n < cache_size:
+            return table[n]
+        return func(n)
+    return plural
+
+
+def install_plural(translations):
+    """Replaces the plural function of a loaded catalog with a compiled one.
+
+    Catalogs that do not come from a ``.mo`` file are left untouched.
+    """
+    if not isinstance(translations, gettext.GNUTranslations):
+        return translations
+    info = getattr(translations, '_info', {})
+    expression = parse_plural_forms(info.get('plural-forms'))
+    if expression:
+        translations.plural = compile_plural(expression)
+    return translations
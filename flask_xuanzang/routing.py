@@ -0,0 +1,265 @@
+from __future__ import absolute_import
+from __future__ import unicode_literals
+
+import sys
+
+from flask import current_app, has_request_context, request
+
+PY2 = (sys.version_info[0] == 2)
+
+if PY2:
+    from urllib import quote
+else:
+    from urllib.parse import quote
+
+
+# Key of the WSGI environ the locale of the path prefix is stored under
+ENVIRON_KEY = 'xuanzang.locale'
+
+# Characters left as is in the path segments of built URLs, a native
+# string as quote() takes on Python 2
+SAFE = str("!$&'()*+,:;=@-._~")
+
+# Separator of the segments of paths in the WSGI environ, a native string
+SLASH = str('/')
+
+
+def _quote(s):
+    return quote(s.encode('utf-8'), safe=SAFE)
+
+
+def _wsgi(s):
+    # Strings of the WSGI environ are bytes, decoded as latin-1 on Python 3
+    if PY2:
+        return s.encode('utf-8')
+    return s.encode('utf-8').decode('latin-1')
+
+
+class RouteIndex(object):
+    """Localized slugs of the URL segments translated in one catalog, in
+    both directions.
+
+    :ivar localized: Localized slug of each translated segment, quoted as in
+                     built URLs
+    :ivar canonical: Segment of each localized slug, encoded as in the WSGI
+                     environ
+    """
+
+    __slots__ = ('localized', 'canonical')
+
+    def __init__(self, translations, context):
+        self.localized = {}
+        self.canonical = {}
+        catalog = getattr(translations, '_catalog', None) or {}
+        prefix = context + '\x04'
+        for key in catalog:
+            if not isinstance(key, type(prefix)) or \
+                    not key.startswith(prefix):
+                continue
+            slug = catalog.get(key)
+            segment = key[len(prefix):]
+            if not slug or slug == segment:
+                continue
+            self.localized[_quote(segment)] = _quote(slug)
+            self.canonical[_wsgi(slug)] = _wsgi(segment)
+
+
+def get_route_index(translations, context):
+    """Returns the :class:`RouteIndex` of `translations`, building it only
+    once per catalog.
+    """
+    try:
+        indexes = translations._xuanzang_routes
+    except AttributeError:
+        indexes = translations._xuanzang_routes = {}
+    index = indexes.get(context)
+    if index is None:
+        index = indexes[context] = RouteIndex(translations, context)
+    return index
+
+
+def _rule_template(rule, encode=_quote):
+    # Returns the number of segments of URLs built for `rule`, or None if it
+    # varies, and the positions of its static segments, counted from the end
+    # after a path converter, encoded with `encode`
+    segments = rule.rule.lstrip('/').split('/')
+    length = len(segments)
+    static = []
+    for position, segment in enumerate(segments):
+        if '<' not in segment:
+            if length is None:
+                position -= len(segments)
+            static.append((position, encode(segment)))
+        elif segment.startswith('<path:'):
+            length = None
+    return length, tuple(static)
+
+
+def _matches(template, segments, canonical):
+    # Returns whether the static segments of `template` match `segments`,
+    # localized or not
+    length, static = template
+    count = len(segments)
+    if length is not None and length != count:
+        return False
+    for position, segment in static:
+        if not -count <= position < count:
+            return False
+        found = segments[position]
+        if found != segment and canonical.get(found) != segment:
+            return False
+    return True
+
+
+class LocalizedRouting(object):
+    """Serves the URLs of an application under a prefix per locale, with
+    their static segments translated in the message context `context`.
+
+    A request for ``/de/produkte/42`` is dispatched as ``/products/42`` with
+    the locale ``de``, if the German catalog translates ``products`` to
+    ``produkte`` in that context. The URL map is left as is, and the slugs
+    of each locale are indexed once per loaded catalog.
+
+    Only the static segments of the rule a path matches are translated, so
+    variable parts equal to a localized slug are left as is.
+
+    :param attan: The state of the extension for the application
+    :param locales: Locale identifiers, used as the path prefixes
+    """
+
+    def __init__(self, attan, locales, context='url'):
+        self.attan = attan
+        self.context = context
+        self.prefixes = dict((prefix, None) for prefix in locales)
+        self._by_locale = None
+        self._templates = {}
+        self._path_templates = None
+
+    def _parse_prefixes(self):
+        from flask_xuanzang.extension import _parse_locale
+        by_locale = {}
+        for prefix in self.prefixes:
+            locale = _parse_locale(prefix)
+            self.prefixes[prefix] = locale
+            by_locale[locale] = prefix
+        self._by_locale = by_locale
+
+    def get_index(self, locale):
+        translations = self.attan.load_translations(locale)
+        return get_route_index(translations, self.context)
+
+    def wrap(self, wsgi_app, url_map):
+        """Returns a WSGI application resolving the locale prefix and the
+        localized slugs of the path before calling `wsgi_app`, which serves
+        the rules of `url_map`.
+        """
+        def localized_app(environ, start_response):
+            self.resolve(environ, url_map)
+            return wsgi_app(environ, start_response)
+        return localized_app
+
+    def _get_path_templates(self, url_map):
+        # Templates of every rule, by their first static segment and its
+        # position, as segments of WSGI paths are looked up
+        templates = self._path_templates
+        if templates is None:
+            templates = {}
+            for rule in url_map.iter_rules():
+                template = _rule_template(rule, _wsgi)
+                if template[1]:
+                    templates.setdefault(template[1][0], []).append(template)
+            self._path_templates = templates
+        return templates
+
+    def resolve(self, environ, url_map):
+        """Strips the locale prefix from the path of `environ`, replaces the
+        localized slugs of the static segments of the rule it matches with
+        the segments they translate, and stores the locale under
+        :data:`ENVIRON_KEY`.
+        """
+        path = environ.get('PATH_INFO', SLASH)
+        prefix, _, rest = path[1:].partition(SLASH)
+        if prefix not in self.prefixes:
+            return
+        if self._by_locale is None:
+            self._parse_prefixes()
+        locale = self.prefixes[prefix]
+        canonical = self.get_index(locale).canonical
+        if canonical:
+            segments = rest.split(SLASH)
+            templates = self._get_path_templates(url_map)
+            count = len(segments)
+            best = None
+            for position, found in enumerate(segments):
+                segment = canonical.get(found, found)
+                for key in ((position, segment), (position - count, segment)):
+                    for template in templates.get(key, ()):
+                        # Rules with more static segments win, as in Werkzeug
+                        if best is not None and \
+                                len(template[1]) <= len(best[1]):
+                            continue
+                        if _matches(template, segments, canonical):
+                            best = template
+            if best is not None:
+                for position, segment in best[1]:
+                    segments[position] = segment
+                rest = SLASH.join(segments)
+        environ['PATH_INFO'] = SLASH + rest
+        environ[ENVIRON_KEY] = locale
+
+    def request_locale(self):
+        """Returns the locale of the path prefix of the current request, or
+        ``None``.
+        """
+        if not has_request_context():
+            return None
+        return request.environ.get(ENVIRON_KEY)
+
+    def _get_templates(self, endpoint):
+        templates = self._templates.get(endpoint)
+        if templates is None:
+            templates = self._templates[endpoint] = [
+                _rule_template(rule)
+                for rule in current_app.url_map.iter_rules(endpoint)]
+        return templates
+
+    def localize_url(self, url, endpoint, locale):
+        """Returns `url`, built by :func:`flask.url_for` for `endpoint`, with
+        the prefix of `locale` and its localized slugs.
+        """
+        if self._by_locale is None:
+            self._parse_prefixes()
+        prefix = self._by_locale.get(locale)
+        if prefix is None:
+            return url
+
+        # Split off the scheme and host of external URLs, and the query
+        start = url.find('/', url.find('//') + 2) if '//' in url else 0
+        end = len(url)
+        for separator in '?#':
+            position = url.find(separator, start)
+            if position >= 0:
+                end = min(end, position)
+        if has_request_context():
+            root = request.script_root
+        else:
+            root = (current_app.config.get('APPLICATION_ROOT') or '')
+            root = root.rstrip('/')
+        root = _quote(root).replace('%2F', '/')
+        path = url[start:end]
+        if not path.startswith(root + '/'):
+            root = ''
+
+        segments = path[len(root) + 1:].split('/')
+        localized = self.get_index(locale).localized
+        for length, static in self._get_templates(endpoint):
+            if length is not None and length != len(segments):
+                continue
+            if all(-len(segments) <= position < len(segments) and
+                   segments[position] == segment
+                   for position, segment in static):
+                for position, segment in static:
+                    segments[position] = localized.get(segment, segment)
+                break
+        return ''.join([url[:start], root, '/', _quote(prefix), '/',
+                        '/'.join(segments), url[end:]])
@@ -0,0 +1,63 @@
+from __future__ import absolute_import
+from __future__ import unicode_literals
+
+import threading
+
+from flask_xuanzang.compact import MessageIndex
+
+
+class CatalogSet(object):
+    """Catalogs loaded from one source, by locale, with the version each
+    was loaded at.
+
+    Applications loading catalogs from the same source share a set, so
+    that each catalog is parsed and kept in memory once per process.
+    """
+
+    def __init__(self, compact=False):
+        self.translations = {}
+        self.versions = {}
+        self.message_index = MessageIndex() if compact else None
+        self.refcount = 0
+
+
+class CatalogRegistry(object):
+    """Process-wide registry of the :class:`CatalogSet` of every shared
+    source, freeing a set once no application uses it anymore.
+    """
+
+    def __init__(self):
+        self._sets = {}
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._sets)
+
+    def __contains__(self, key):
+        return key in self._sets
+
+    def acquire(self, key, compact=False):
+        """Returns the set of `key` and a function releasing it, which may
+        be called more than once.
+        """
+        key = (key, compact)
+        with self._lock:
+            catalogs = self._sets.get(key)
+            if catalogs is None:
+                catalogs = self._sets[key] = CatalogSet(compact)
+            catalogs.refcount += 1
+        released = []
+
+        def release():
+            with self._lock:
+                if released:
+                    return
+                released.append(True)
+                catalogs.refcount -= 1
+                if not catalogs.refcount:
+                    del self._sets[key]
+
+        return catalogs, release
+
+
+registry = CatalogRegistry()
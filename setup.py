@@ -19,7 +19,11 @@ setup(
     install_requires=[
         'Flask>=0.9',
         'Babel>=2.3',
+        'futures; python_version < "3"',
     ],
+    extras_require={
+        'icu': ['PyICU'],
+    },
     test_suite='nose.collector',
     tests_require=[
         'nose',
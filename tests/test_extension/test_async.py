@@ -0,0 +1,121 @@
+# -*- coding: utf-8 -*-
+from __future__ import absolute_import
+from __future__ import unicode_literals
+
+import sys
+import threading
+import unittest
+
+from mock import Mock
+
+from flask_xuanzang import Xuanzang, DirectoryLoader
+from flask_xuanzang import ugettext
+
+from tests import XuanzangTestCase
+
+
+@unittest.skipIf(sys.version_info < (3, 5), 'asyncio is required')
+class AsyncLoadTestCase(XuanzangTestCase):
+    def setUp(self):
+        import asyncio
+        self.app = self.create_app('de')
+        self.loader = Mock(wraps=DirectoryLoader(self.mo_directory))
+        self.xuanzang = Xuanzang(self.app, loader=self.loader)
+        self.loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(self.loop)
+
+    def tearDown(self):
+        import asyncio
+        asyncio.set_event_loop(None)
+        self.loop.close()
+
+    def test_load(self):
+        with self.app.app_context():
+            t = self.loop.run_until_complete(
+                self.xuanzang.aload_translations('zh_CN'))
+            self.assertEqual(t.ugettext('Large'), '大型')
+            self.assertTrue(self.xuanzang.bind('zh_CN')
+                                .get_translations() is t)
+
+    def test_loaded_off_loop_thread(self):
+        threads = []
+
+        def load(locale):
+            threads.append(threading.current_thread())
+            return DirectoryLoader(self.mo_directory).load(locale)
+
+        self.loader.load.side_effect = load
+        with self.app.app_context():
+            self.loop.run_until_complete(
+                self.xuanzang.aload_translations('zh_CN'))
+        self.assertEqual(len(threads), 1)
+        self.assertFalse(threads[0] is threading.current_thread())
+
+    def test_concurrent_awaiters(self):
+        release = threading.Event()
+
+        def load(locale):
+            release.wait()
+            return DirectoryLoader(self.mo_directory).load(locale)
+
+        self.loader.load.side_effect = load
+        with self.app.app_context():
+            awaitables = [self.xuanzang.aload_translations('zh_CN')
+                          for _ in range(5)]
+            release.set()
+            import asyncio
+            results = self.loop.run_until_complete(
+                asyncio.gather(*awaitables))
+        self.assertEqual(self.loader.load.call_count, 1)
+        self.assertEqual(len(set(map(id, results))), 1)
+
+    def test_cached(self):
+        with self.app.test_request_context():
+            ugettext('Large')
+            self.loop.run_until_complete(
+                self.xuanzang.aload_translations(self.xuanzang.get_locale()))
+        self.assertEqual(self.loader.load.call_count, 1)
+
+    def test_cached_by_name(self):
+        with self.app.test_request_context():
+            ugettext('Large')
+            future = self.xuanzang.get_attan().load_translations_future('de')
+            # Resolved from the cache rather than on the thread pool
+            self.assertTrue(future.done())
+            self.assertTrue(future.result() is
+                            self.xuanzang.get_translations())
+
+    def test_aliases_share_load(self):
+        release = threading.Event()
+
+        def load(locale):
+            release.wait()
+            return DirectoryLoader(self.mo_directory).load(locale)
+
+        self.loader.load.side_effect = load
+        with self.app.app_context():
+            attan = self.xuanzang.get_attan()
+            try:
+                future = attan.load_translations_future('zh_CN')
+                self.assertTrue(
+                    attan.load_translations_future('zh_Hans_CN') is future)
+            finally:
+                release.set()
+            future.result()
+        self.assertEqual(self.loader.load.call_count, 1)
+
+    def test_warm_up(self):
+        with self.app.app_context():
+            results = self.loop.run_until_complete(
+                self.xuanzang.awarm_up(['de', 'zh_CN']))
+        self.assertEqual(len(results), 2)
+        self.assertEqual(results[0].ugettext('Large'), 'Groß')
+        self.assertEqual(self.loader.load.call_count, 2)
+
+    def test_error(self):
+        self.loader.load.side_effect = IOError('unavailable')
+        with self.app.app_context():
+            with self.assertRaises(IOError):
+                self.loop.run_until_complete(
+                    self.xuanzang.aload_translations('zh_CN'))
+            self.assertEqual(self.xuanzang.get_attan().pending_loads, {})
@@ -0,0 +1,167 @@
+# -*- coding: utf-8 -*-
+from __future__ import absolute_import
+from __future__ import unicode_literals
+
+import io
+import json
+import os
+import tempfile
+from decimal import Decimal
+
+from mock import patch
+
+from flask_xuanzang import Xuanzang, BatchTranslator, DirectoryLoader
+from flask_xuanzang import LocaleGroupRenderer, MissingTranslationCollector
+from flask_xuanzang.extension import Attan
+
+from tests import XuanzangTestCase
+
+
+def translate_row(translator, num):
+    return (translator.ungettext('%(num)s apple', '%(num)s apples', num),
+            translator.format_decimal(Decimal(num) / 4))
+
+
+def get_pid(translator, item):
+    return os.getpid()
+
+
+def greet(translator, name):
+    return translator.ugettext('Hello {name}', name=name)
+
+
+class BindTestCase(XuanzangTestCase):
+    def test_bind(self):
+        app = self.create_app('en')
+        xuanzang = Xuanzang(app)
+        with app.app_context():
+            translator = xuanzang.bind('de')
+        # The translator is usable without an application context
+        self.assertEqual(translator.ugettext('Large'), 'Groß')
+        self.assertEqual(translator.format_decimal(1234.5), '1.234,5')
+        self.assertEqual(str(translator.get_locale()), 'de')
+
+
+class BatchTranslatorTestCase(XuanzangTestCase):
+    def test_map(self):
+        loader = DirectoryLoader(self.mo_directory)
+        with BatchTranslator(loader, 'de', max_workers=2,
+                             chunksize=3) as batch:
+            results = list(batch.map(translate_row, range(20)))
+        self.assertEqual(results[:3], [('0 Äpfel', '0'),
+                                       ('1 Apfel', '0,25'),
+                                       ('2 Äpfel', '0,5')])
+        self.assertEqual(results[19], ('19 Äpfel', '4,75'))
+        self.assertEqual(len(results), 20)
+
+    def test_for_app(self):
+        app = self.create_app('en')
+        Xuanzang(app)
+        with BatchTranslator.for_app(app, 'zh_CN', max_workers=1) as batch:
+            results = list(batch.map(translate_row, [1, 2]))
+            pids = set(batch.map(get_pid, range(10)))
+        self.assertEqual(results, [('1 个苹果', '0.25'), ('2 个苹果', '0.5')])
+        self.assertEqual(len(pids), 1)
+        self.assertTrue(os.getpid() not in pids)
+
+    def test_empty(self):
+        loader = DirectoryLoader(self.mo_directory)
+        with BatchTranslator(loader, 'de', max_workers=1) as batch:
+            self.assertEqual(list(batch.map(translate_row, [])), [])
+
+
+JOBS = [('de', 1), ('zh_CN', 2), ('de', 3), ('en', 1), ('zh_CN', 5)]
+RENDERED = [('1 Apfel', '0,25'), ('2 个苹果', '0.5'), ('3 Äpfel', '0,75'),
+            ('1 apple', '0.25'), ('5 个苹果', '1.25')]
+
+
+class LocaleGroupRendererTestCase(XuanzangTestCase):
+    def setUp(self):
+        self.loader = DirectoryLoader(self.mo_directory)
+
+    def test_map(self):
+        with LocaleGroupRenderer(self.loader, buffer_size=3) as renderer:
+            with patch.object(Attan, 'bind', autospec=True,
+                              side_effect=Attan.bind) as bind:
+                results = list(renderer.map(translate_row, JOBS * 2))
+        self.assertEqual(results, RENDERED * 2)
+        # Each locale is bound once, whatever the number of buffers
+        self.assertEqual(bind.call_count, 3)
+
+    def test_bounded_buffer(self):
+        consumed = []
+
+        def jobs():
+            for job in JOBS * 10:
+                consumed.append(job)
+                yield job
+
+        renderer = LocaleGroupRenderer(self.loader, buffer_size=4)
+        results = renderer.map(translate_row, jobs())
+        self.assertEqual(next(results), RENDERED[0])
+        self.assertEqual(len(consumed), 4)
+        self.assertEqual(len(list(results)), 49)
+
+    def test_threads(self):
+        with LocaleGroupRenderer(self.loader, max_workers=2,
+                                 chunksize=1) as renderer:
+            self.assertEqual(list(renderer.map(translate_row, JOBS)),
+                             RENDERED)
+
+    def test_processes(self):
+        with LocaleGroupRenderer(self.loader, max_workers=1,
+                                 processes=True) as renderer:
+            self.assertEqual(list(renderer.map(translate_row, JOBS)),
+                             RENDERED)
+            pids = set(renderer.map(get_pid, JOBS))
+        self.assertEqual(len(pids), 1)
+        self.assertTrue(os.getpid() not in pids)
+
+    def test_for_app(self):
+        app = self.create_app('en')
+        Xuanzang(app)
+        attan = app.extensions['xuanzang']
+        renderer = LocaleGroupRenderer.for_app(app)
+        self.assertEqual(list(renderer.map(translate_row, JOBS)), RENDERED)
+        self.assertTrue(renderer.get_translator('de').get_translations() is
+                        attan.translation_cache[renderer.get_translator(
+                            'de').get_locale()])
+
+
+class WorkerSettingsTestCase(XuanzangTestCase):
+    def setUp(self):
+        fd, self.path = tempfile.mkstemp(suffix='.jsonl')
+        os.close(fd)
+        self.app = self.create_app('en')
+        self.app.config['XUANZANG_MESSAGE_SYNTAX'] = 'icu'
+        self.app.config['XUANZANG_MARKUP'] = True
+        collector = MissingTranslationCollector(path=self.path,
+                                                flush_interval=None)
+        Xuanzang(self.app, missing_collector=collector)
+
+    def tearDown(self):
+        os.remove(self.path)
+
+    def read_missing(self):
+        with io.open(self.path, encoding='utf-8') as f:
+            return [json.loads(line) for line in f]
+
+    def test_modes_agree(self):
+        jobs = [('de', '<b>'), ('zh_CN', 'x')]
+        expected = ['Hello &lt;b&gt;', 'Hello x']
+        for kwargs in ({}, {'max_workers': 1},
+                       {'max_workers': 1, 'processes': True}):
+            with LocaleGroupRenderer.for_app(self.app, **kwargs) as renderer:
+                self.assertEqual(list(renderer.map(greet, jobs)), expected,
+                                 kwargs)
+        self.assertEqual(set(record['locale']
+                             for record in self.read_missing()),
+                         set(['de', 'zh_Hans_CN']))
+
+    def test_batch_translator(self):
+        with BatchTranslator.for_app(self.app, 'de', max_workers=1) as batch:
+            self.assertEqual(list(batch.map(greet, ['<b>'])),
+                             ['Hello &lt;b&gt;'])
+        self.assertEqual(self.read_missing(), [
+            {'locale': 'de', 'context': None, 'msgid': 'Hello {name}'},
+        ])
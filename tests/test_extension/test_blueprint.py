@@ -0,0 +1,90 @@
+# -*- coding: utf-8 -*-
+from __future__ import absolute_import
+from __future__ import unicode_literals
+
+import gzip
+import io
+import json
+
+from mock import patch
+
+from flask_xuanzang import Xuanzang, make_catalog_blueprint
+from flask_xuanzang import blueprint
+
+from tests import XuanzangTestCase
+
+
+class CatalogBlueprintTestCase(XuanzangTestCase):
+    def setUp(self):
+        self.app = self.create_app('de')
+        self.xuanzang = Xuanzang(self.app)
+        self.app.register_blueprint(make_catalog_blueprint(),
+                                    url_prefix='/i18n')
+        self.client = self.app.test_client()
+
+    def get_json(self, url, **kwargs):
+        response = self.client.get(url, **kwargs)
+        self.assertEqual(response.status_code, 200)
+        return json.loads(response.get_data(as_text=True))
+
+    def test_catalog(self):
+        data = self.get_json('/i18n/zh_Hans_CN.json')
+        self.assertEqual(data['locale'], 'zh_Hans_CN')
+        self.assertTrue('nplurals' in data['plural_forms'])
+        messages = data['messages']
+        self.assertEqual(messages['Large'], '大型')
+        self.assertTrue(isinstance(messages['%(num)s apple'], list))
+        self.assertTrue('month name\x04May' in messages)
+        self.assertFalse('' in messages)
+
+    def test_filters(self):
+        messages = self.get_json('/i18n/de.json?prefix=Lar')['messages']
+        self.assertEqual(list(messages), ['Large'])
+        messages = self.get_json('/i18n/de.json?context=month+name')
+        self.assertEqual(list(messages['messages']), ['month name\x04May'])
+
+    def test_etag(self):
+        response = self.client.get('/i18n/de.json')
+        etag = response.headers['ETag']
+        self.assertFalse(etag.startswith('W/'))
+        response = self.client.get('/i18n/de.json',
+                                   headers={'If-None-Match': etag})
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response.get_data(), b'')
+        response = self.client.get('/i18n/de.json?prefix=L',
+                                   headers={'If-None-Match': etag})
+        self.assertEqual(response.status_code, 200)
+
+    def test_gzip(self):
+        plain = self.client.get('/i18n/de.json')
+        response = self.client.get('/i18n/de.json',
+                                   headers={'Accept-Encoding': 'gzip'})
+        self.assertEqual(response.headers['Content-Encoding'], 'gzip')
+        self.assertEqual(response.headers['Vary'], 'Accept-Encoding')
+        self.assertNotEqual(response.headers['ETag'], plain.headers['ETag'])
+        with gzip.GzipFile(fileobj=io.BytesIO(response.get_data())) as f:
+            self.assertEqual(f.read(), plain.get_data())
+
+    def test_serialized_once(self):
+        with patch.object(blueprint, 'catalog_to_json',
+                          wraps=blueprint.catalog_to_json) as m:
+            for _ in range(3):
+                self.client.get('/i18n/de.json')
+            self.assertEqual(m.call_count, 1)
+            with self.app.app_context():
+                self.xuanzang.refresh_translations()
+            self.client.get('/i18n/de.json')
+            self.assertEqual(m.call_count, 2)
+
+    def test_unknown_locale(self):
+        self.assertEqual(self.client.get('/i18n/xx.json').status_code, 404)
+        self.assertEqual(self.client.get('/i18n/-.json').status_code, 404)
+
+    def test_allowed_locales(self):
+        self.app.register_blueprint(
+            make_catalog_blueprint('restricted', locales=['de']),
+            url_prefix='/restricted')
+        self.assertEqual(self.client.get('/restricted/de.json').status_code,
+                         200)
+        self.assertEqual(self.client.get('/restricted/fr.json').status_code,
+                         404)
@@ -0,0 +1,76 @@
+# -*- coding: utf-8 -*-
+from __future__ import absolute_import
+from __future__ import unicode_literals
+
+from mock import Mock
+
+from flask_xuanzang import Xuanzang
+from flask_xuanzang import collation_key, lazy_gettext, sort_localized
+from flask_xuanzang.collation import Collator
+
+from tests import XuanzangTestCase
+
+
+text_type = type('')
+
+
+WORDS = ['zebra', 'éclair', 'Apple', 'eclair', 'apple', 'Äpfel']
+SORTED = ['Äpfel', 'apple', 'Apple', 'eclair', 'éclair', 'zebra']
+
+LABELS = [lazy_gettext('Small'), lazy_gettext('Large'),
+          lazy_gettext('apple')]
+
+
+class CollationTestCase(XuanzangTestCase):
+    def setUp(self):
+        self.app = self.create_app('de')
+        self.xuanzang = Xuanzang(self.app)
+
+    def test_sort(self):
+        with self.app.test_request_context():
+            self.assertEqual(sort_localized(WORDS), SORTED)
+            self.assertEqual(sort_localized(WORDS, reverse=True),
+                             SORTED[::-1])
+
+    def test_sort_by_key(self):
+        items = [{'name': word} for word in WORDS]
+        with self.app.test_request_context():
+            result = sort_localized(items, key=lambda item: item['name'])
+        self.assertEqual([item['name'] for item in result], SORTED)
+
+    def test_lazy_strings(self):
+        with self.app.test_request_context():
+            labels = sort_localized(LABELS)
+            self.assertEqual([text_type(label) for label in labels],
+                             ['apple', 'Groß', 'Small'])
+            self.assertTrue(labels[1] is LABELS[1])
+            items = sort_localized([{'label': label} for label in LABELS],
+                                   key=lambda item: item['label'])
+            self.assertEqual([text_type(item['label']) for item in items],
+                             ['apple', 'Groß', 'Small'])
+            self.assertEqual(collation_key(LABELS[1]), collation_key('Groß'))
+
+    def test_collation_key(self):
+        with self.app.test_request_context():
+            self.assertEqual(sorted(WORDS, key=collation_key), SORTED)
+
+    def test_keys_cached_per_locale(self):
+        with self.app.test_request_context():
+            sort_localized(WORDS)
+            collator = self.xuanzang.get_collator()
+        self.assertEqual(len(collator), len(WORDS))
+        collator.sort_key = Mock(side_effect=collator.sort_key)
+        with self.app.test_request_context():
+            self.assertEqual(sort_localized(WORDS), SORTED)
+            self.assertTrue(self.xuanzang.get_collator() is collator)
+        self.assertEqual(collator.sort_key.call_count, 0)
+
+    def test_cache_size(self):
+        collator = Collator('de', cache_size=2)
+        self.assertEqual(collator.sort(WORDS), SORTED)
+        self.assertEqual(len(collator), 2)
+
+    def test_bind(self):
+        with self.app.app_context():
+            translator = self.xuanzang.bind('de')
+        self.assertEqual(translator.sort_localized(WORDS), SORTED)
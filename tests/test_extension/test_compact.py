@@ -0,0 +1,67 @@
+# -*- coding: utf-8 -*-
+from __future__ import absolute_import
+from __future__ import unicode_literals
+
+from mock import Mock
+
+from flask_xuanzang import Xuanzang
+from flask_xuanzang import ugettext, ungettext, pgettext, npgettext
+from flask_xuanzang.compact import CompactCatalog, MessageIndex
+
+from tests import XuanzangTestCase
+
+
+class CompactCatalogTestCase(XuanzangTestCase):
+    def setUp(self):
+        self.app = self.create_app('de')
+        self.app.config['XUANZANG_COMPACT_CATALOGS'] = True
+        self.locale_selector = Mock(name='locale_selector', return_value=None)
+        self.xuanzang = Xuanzang(self.app,
+                                 locale_selector=self.locale_selector)
+        self.attan = self.app.extensions['xuanzang']
+
+    def test_gettext(self):
+        for locale, large, apples, may, apple in (
+                ('de', 'Groß', '2 Äpfel', 'Mai', 'Apfel'),
+                ('zh_CN', '大型', '2 个苹果', '五月', '苹果')):
+            self.locale_selector.return_value = locale
+            with self.app.test_request_context():
+                self.assertEqual(ugettext('Large'), large)
+                self.assertEqual(
+                    ungettext('%(num)s apple', '%(num)s apples', 2), apples)
+                self.assertEqual(pgettext('month name', 'May'), may)
+                self.assertEqual(
+                    npgettext('fruits', 'apple', 'apples', 1), apple)
+                self.assertEqual(ugettext('Small'), 'Small')
+                self.assertTrue(isinstance(
+                    self.xuanzang.get_translations()._catalog,
+                    CompactCatalog))
+
+    def test_shared_index(self):
+        for locale in ('de', 'zh_CN'):
+            self.locale_selector.return_value = locale
+            with self.app.test_request_context():
+                ugettext('Large')
+
+        index = self.attan.message_index
+        # The header and 6 keys of German, Chinese has only one plural form
+        self.assertEqual(len(index), 7)
+        catalogs = [t._catalog for t in self.attan.translation_cache.values()]
+        self.assertEqual(sorted(len(c) for c in catalogs), [5, 7])
+
+
+class CompactCatalogMappingTestCase(XuanzangTestCase):
+    def test_mapping(self):
+        index = MessageIndex()
+        index.add('a')
+        catalog = CompactCatalog(index, [None])
+        index.add('b')
+        catalog_b = CompactCatalog(index, [None, 'B'])
+
+        self.assertEqual(catalog.get('a'), None)
+        self.assertEqual(catalog.get('b', 'default'), 'default')
+        self.assertRaises(KeyError, catalog.__getitem__, 'c')
+        self.assertEqual(len(catalog), 0)
+        self.assertEqual(catalog_b['b'], 'B')
+        self.assertTrue('b' in catalog_b)
+        self.assertEqual(catalog_b.items(), [('b', 'B')])
@@ -0,0 +1,90 @@
+# -*- coding: utf-8 -*-
+from __future__ import absolute_import
+from __future__ import unicode_literals
+
+from datetime import date, datetime, time, timedelta
+
+from babel import dates
+from mock import Mock
+
+from flask_xuanzang import Xuanzang
+from flask_xuanzang import format_datetime, format_datetime_many
+from flask_xuanzang import format_date, format_time, format_timedelta
+
+from tests import XuanzangTestCase
+
+
+MOMENT = datetime(2016, 11, 8, 15, 7, 53)
+
+
+class DatesTestCase(XuanzangTestCase):
+    def setUp(self):
+        self.app = self.create_app('de')
+        self.locale_selector = Mock(name='locale_selector', return_value=None)
+        self.xuanzang = Xuanzang(self.app,
+                                 locale_selector=self.locale_selector)
+
+    def test_need_app_context(self):
+        self.assertRaises(RuntimeError, format_datetime, MOMENT)
+
+    def test_format_datetime(self):
+        with self.app.test_request_context():
+            for format in ('full', 'long', 'medium', 'short', 'yyyy-MM-dd'):
+                self.assertEqual(
+                    format_datetime(MOMENT, format, 'Europe/Berlin'),
+                    dates.format_datetime(MOMENT, format,
+                                          dates.get_timezone('Europe/Berlin'),
+                                          locale='de'))
+
+    def test_format_date(self):
+        with self.app.test_request_context():
+            for format in ('full', 'long', 'medium', 'short', 'EEEE'):
+                self.assertEqual(
+                    format_date(MOMENT.date(), format),
+                    dates.format_date(MOMENT.date(), format, locale='de'))
+            # Datetimes are formatted as their dates
+            self.assertEqual(format_date(MOMENT, 'short'),
+                             format_date(date(2016, 11, 8), 'short'))
+
+    def test_format_time(self):
+        with self.app.test_request_context():
+            for format in ('full', 'long', 'medium', 'short', "H 'Uhr'"):
+                self.assertEqual(
+                    format_time(MOMENT, format, 'Asia/Shanghai'),
+                    dates.format_time(MOMENT, format,
+                                      dates.get_timezone('Asia/Shanghai'),
+                                      locale='de'))
+            self.assertEqual(format_time(time(15, 7), 'short'), '15:07')
+
+    def test_format_timedelta(self):
+        with self.app.test_request_context():
+            self.assertEqual(format_timedelta(timedelta(days=3)), '3 Tage')
+            self.assertEqual(
+                format_timedelta(timedelta(hours=-2), add_direction=True),
+                dates.format_timedelta(timedelta(hours=-2),
+                                       add_direction=True, locale='de'))
+
+    def test_format_datetime_many(self):
+        moments = [MOMENT + timedelta(days=n) for n in range(3)]
+        with self.app.test_request_context():
+            self.assertEqual(format_datetime_many(moments, 'short', 'UTC'),
+                             [format_datetime(m, 'short', 'UTC')
+                              for m in moments])
+
+    def test_locale_selector(self):
+        self.locale_selector.return_value = 'zh_CN'
+        with self.app.test_request_context():
+            self.assertEqual(
+                self.xuanzang.format_datetime(MOMENT, 'long'),
+                dates.format_datetime(MOMENT, 'long', locale='zh_CN'))
+
+    def test_pattern_cache(self):
+        with self.app.test_request_context():
+            formatter = self.xuanzang.get_date_formatter()
+            format_datetime(MOMENT)
+            pattern = formatter.get_pattern('datetime', 'medium')
+            format_datetime(MOMENT)
+            self.assertTrue(formatter.get_pattern('datetime', 'medium')
+                            is pattern)
+        with self.app.test_request_context():
+            self.assertTrue(self.xuanzang.get_date_formatter() is formatter)
@@ -0,0 +1,92 @@
+# -*- coding: utf-8 -*-
+from __future__ import absolute_import
+from __future__ import unicode_literals
+
+from flask_xuanzang import Xuanzang, MappingLoader
+from flask_xuanzang import ugettext, ungettext
+from flask_xuanzang.diff import merge_catalog
+from flask_xuanzang.loaders import catalog_from_messages
+
+from tests import XuanzangTestCase
+
+
+class MergeCatalogTestCase(XuanzangTestCase):
+    def test_diff(self):
+        old = catalog_from_messages('de', {
+            'Large': 'Groß',
+            'Small': 'Klein',
+            'Red': 'Rot',
+            ('apple', 0): 'Apfel',
+            ('apple', 1): 'Äpfel',
+            'color\x04Blue': 'Blau',
+        })
+        new = catalog_from_messages('de', {
+            'Large': 'Riesig',
+            'Small': 'Klein',
+            'Green': 'Grün',
+            ('apple', 0): 'Apfel',
+            ('apple', 1): 'Äpfelchen',
+            'color\x04Blue': 'Blau',
+        })
+        diff = merge_catalog(old, new)
+        self.assertEqual(diff.added, set(['Green']))
+        self.assertEqual(diff.removed, set(['Red']))
+        self.assertEqual(diff.changed, set(['Large', 'apple']))
+        self.assertTrue(diff)
+
+    def test_reuse_strings(self):
+        old = catalog_from_messages('de', {'Small': 'Klein'})
+        new = catalog_from_messages('de', {'Small': ''.join(['Kl', 'ein'])})
+        self.assertFalse(new._catalog['Small'] is old._catalog['Small'])
+        diff = merge_catalog(old, new)
+        self.assertFalse(diff)
+        self.assertTrue(new._catalog['Small'] is old._catalog['Small'])
+
+    def test_not_a_catalog(self):
+        new = catalog_from_messages('de', {})
+        self.assertTrue(merge_catalog(object(), new) is None)
+
+
+class IncrementalReloadTestCase(XuanzangTestCase):
+    def setUp(self):
+        self.loader = MappingLoader()
+        self.loader.set_messages('de', {'Large': 'Groß', 'Small': 'Klein'})
+        self.app = self.create_app('de')
+        self.xuanzang = Xuanzang(self.app, loader=self.loader)
+        self.attan = self.app.extensions['xuanzang']
+        with self.app.test_request_context():
+            ugettext('Large')
+
+    def test_check_versions(self):
+        before = self.attan.translation_cache[self.attan.default_locale]
+        self.loader.set_messages('de', {'Large': 'Riesig', 'Small': 'Klein'})
+        self.attan.check_versions()
+
+        diff = self.attan.catalog_diffs[self.attan.default_locale]
+        self.assertEqual(diff.changed, set(['Large']))
+        after = self.attan.translation_cache[self.attan.default_locale]
+        self.assertTrue(after._catalog['Small'] is before._catalog['Small'])
+        with self.app.test_request_context():
+            self.assertEqual(ugettext('Large'), 'Riesig')
+
+    def test_unchanged_catalog_kept(self):
+        before = self.attan.translation_cache[self.attan.default_locale]
+        self.loader.set_messages('de', {'Large': 'Groß', 'Small': 'Klein'})
+        self.attan.check_versions()
+        after = self.attan.translation_cache[self.attan.default_locale]
+        self.assertTrue(after is before)
+        self.assertEqual(
+            self.attan.translation_versions[self.attan.default_locale], 2)
+
+    def test_background_report(self):
+        self.loader.set_messages('de', {'Large': 'Groß', ('Small', 0): 'K',
+                                        ('Small', 1): 'Kleine'})
+        with self.app.test_request_context():
+            future = self.xuanzang.refresh_translations(background=True)
+        report = future.result(timeout=5)
+        diff, = report.diffs.values()
+        # Turning a message into a plural one changes it
+        self.assertEqual(diff.changed, set(['Small']))
+        self.assertEqual(diff.added | diff.removed, set())
+        with self.app.test_request_context():
+            self.assertEqual(ungettext('Small', 'Small', 2), 'Kleine')
@@ -0,0 +1,141 @@
+from __future__ import absolute_import
+from __future__ import unicode_literals
+
+import io
+import os
+import shutil
+import tempfile
+
+from babel.messages.pofile import read_po
+from click.testing import CliRunner
+from flask.cli import ScriptInfo
+from mock import patch
+
+from flask_xuanzang import Xuanzang
+from flask_xuanzang.extract import KEYWORDS, extract_messages
+from flask_xuanzang.extract import _supports_count_specs
+
+from tests import XuanzangTestCase
+
+
+VIEWS = '''
+from flask_xuanzang import gettext, lazy_npgettext, message, pgettext
+
+TITLE = lazy_npgettext('menu', '%(num)s item', '%(num)s items', 2)
+
+
+def index():
+    # NOTE: Shown on the home page
+    return gettext('Welcome') + pgettext('button', 'Open')
+
+
+LABEL = message('Save', 'button')
+'''
+
+TEMPLATE = '''
+<h1>{{ _('Welcome') }}</h1>
+<p>{{ ngettext('%(num)s apple', '%(num)s apples', count) }}</p>
+'''
+
+
+class ExtractTestCase(XuanzangTestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.write('views.py', VIEWS)
+        self.write('templates/index.html', TEMPLATE)
+        self.write('.venv/ignored.py', "gettext('Ignored')")
+        self.output = os.path.join(self.directory, 'messages.pot')
+        self.cache = os.path.join(self.directory, 'cache.json')
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def write(self, name, content):
+        path = os.path.join(self.directory, name)
+        if not os.path.isdir(os.path.dirname(path)):
+            os.makedirs(os.path.dirname(path))
+        with io.open(path, 'w', encoding='utf-8') as f:
+            f.write(content)
+
+    def extract(self, **kwargs):
+        report = extract_messages([self.directory], self.output,
+                                  comment_tags=['NOTE:'], **kwargs)
+        with open(self.output, 'rb') as f:
+            return report, read_po(f)
+
+    def test_keywords(self):
+        report, catalog = self.extract(jobs=1)
+        self.assertEqual(report.files, 2)
+        self.assertEqual(report.messages, 5)
+
+        welcome = catalog.get('Welcome')
+        self.assertEqual(sorted(welcome.locations),
+                         [('templates/index.html', 2), ('views.py', 9)])
+        self.assertEqual(welcome.auto_comments, ['Shown on the home page'])
+        self.assertTrue(catalog.get('Open', context='button'))
+        if _supports_count_specs():
+            self.assertTrue(catalog.get('Save', context='button'))
+        else:
+            self.assertTrue(catalog.get('Save'))
+        self.assertEqual(catalog.get('%(num)s item', context='menu').id,
+                         ('%(num)s item', '%(num)s items'))
+        self.assertTrue(catalog.get('%(num)s apple').pluralizable)
+        self.assertFalse(catalog.get('Ignored'))
+
+    def test_older_babel(self):
+        with patch('babel.__version__', '2.9.1'):
+            report, catalog = self.extract(jobs=1)
+        # Specs by number of arguments fall back to the fewest arguments
+        self.assertEqual(report.messages, 5)
+        self.assertTrue(catalog.get('Save'))
+        self.assertTrue(catalog.get('Open', context='button'))
+        self.assertTrue(isinstance(KEYWORDS['message'], dict))
+
+    def test_process_pool(self):
+        _, expected = self.extract(jobs=1)
+        _, catalog = self.extract(jobs=2)
+        self.assertEqual([(m.id, m.context, m.locations) for m in catalog],
+                         [(m.id, m.context, m.locations) for m in expected])
+
+    def test_cache(self):
+        report, _ = self.extract(jobs=1, cache_path=self.cache)
+        self.assertEqual(report.scanned, 2)
+        report, _ = self.extract(jobs=1, cache_path=self.cache)
+        self.assertEqual(report.scanned, 0)
+        self.assertEqual(report.messages, 5)
+
+        self.write('views.py', "from flask_xuanzang import gettext\n"
+                               "gettext('Goodbye')\n")
+        report, catalog = self.extract(jobs=1, cache_path=self.cache)
+        self.assertEqual(report.scanned, 1)
+        self.assertTrue(catalog.get('Goodbye'))
+        self.assertFalse(catalog.get('Open', context='button'))
+        self.assertTrue(catalog.get('%(num)s apple'))
+
+    def test_cache_removed_file(self):
+        self.extract(jobs=1, cache_path=self.cache)
+        os.remove(os.path.join(self.directory, 'templates', 'index.html'))
+        report, catalog = self.extract(jobs=1, cache_path=self.cache)
+        self.assertEqual(report.scanned, 0)
+        self.assertFalse(catalog.get('%(num)s apple'))
+
+    def test_cache_keywords(self):
+        self.extract(jobs=1, cache_path=self.cache)
+        report, _ = self.extract(jobs=1, cache_path=self.cache,
+                                 keywords={'tr': None})
+        self.assertEqual(report.scanned, 2)
+
+    def test_command(self):
+        app = self.create_app('en')
+        Xuanzang(app)
+        # Flask.test_cli_runner is only available from Flask 1.0
+        info = ScriptInfo(create_app=lambda *args: app)
+        args = ['xuanzang', 'extract', self.directory,
+                '-o', self.output, '-j', '1']
+        result = CliRunner().invoke(app.cli, args, obj=info)
+        self.assertEqual(result.exit_code, 0, result.output)
+        self.assertTrue('5 messages from 2 files (2 scanned)' in result.output)
+        result = CliRunner().invoke(app.cli, args, obj=info)
+        self.assertTrue('(0 scanned)' in result.output)
+        self.assertTrue(os.path.exists(
+            os.path.join(self.directory, '.messages.pot.cache')))
@@ -0,0 +1,104 @@
+# -*- coding: utf-8 -*-
+from __future__ import absolute_import
+from __future__ import unicode_literals
+
+from mock import Mock
+
+from flask_xuanzang import Xuanzang, MissingTranslationCollector
+from flask_xuanzang import message, lazy_ugettext, lazy_pgettext
+from flask_xuanzang.handles import get_table, registry
+
+from tests import XuanzangTestCase
+
+
+LARGE = message('Large')
+MAY = message('May', context='month name')
+LAZY_LARGE = lazy_ugettext('Large, lazily')
+
+
+class Labels(object):
+    may = lazy_pgettext('month name', 'May')
+
+
+class MessageHandleTestCase(XuanzangTestCase):
+    def setUp(self):
+        self.app = self.create_app('de')
+        self.locale_selector = Mock(name='locale_selector', return_value=None)
+        self.collector = MissingTranslationCollector(flush_interval=None)
+        self.xuanzang = Xuanzang(self.app,
+                                 locale_selector=self.locale_selector,
+                                 missing_collector=self.collector)
+
+    def test_registry(self):
+        handle = registry.get('Large')
+        self.assertTrue(registry.get('Large') is handle)
+        self.assertTrue(registry.get('Large', 'size') is not handle)
+        self.assertEqual(registry.get('May', 'month name').context,
+                         'month name')
+
+    def test_message(self):
+        with self.app.test_request_context():
+            self.assertEqual(LARGE, 'Groß')
+            self.assertEqual(MAY, 'Mai')
+            self.assertEqual(message('Small'), 'Small')
+
+        self.locale_selector.return_value = 'zh_CN'
+        with self.app.test_request_context():
+            self.assertEqual(LARGE, '大型')
+            self.assertEqual(MAY, '五月')
+
+    def test_method(self):
+        large = self.xuanzang.message('Large')
+        with self.app.test_request_context():
+            self.assertEqual(large, 'Groß')
+
+    def test_table(self):
+        handle = registry.get('Large')
+        with self.app.test_request_context():
+            self.assertEqual(LARGE, 'Groß')
+            table = get_table(self.xuanzang.get_translations())
+            self.assertEqual(table[handle.id], 'Groß')
+
+            # Tables go away with the catalog
+            self.xuanzang.refresh_translations()
+            table = get_table(self.xuanzang.get_translations())
+            self.assertEqual(table, [])
+
+    def test_lazy_gettext(self):
+        handle = registry.get('Large, lazily')
+        with self.app.test_request_context():
+            self.assertEqual(LAZY_LARGE, 'Large, lazily')
+            self.assertEqual(Labels.may, 'Mai')
+            table = get_table(self.xuanzang.get_translations())
+            self.assertEqual(table[handle.id], 'Large, lazily')
+
+    def test_lazy_gettext_in_function(self):
+        # Strings built at request time are not registered
+        count = len(registry)
+        label = lazy_ugettext('Large, {0}'.format(count))
+        pair = self.xuanzang.lazy_pgettext('month name', 'May')
+        self.assertEqual(len(registry), count)
+        with self.app.test_request_context():
+            self.assertEqual(label, 'Large, {0}'.format(count))
+            self.assertEqual(pair, 'Mai')
+
+    def test_overlay(self):
+        overlay_loader = Mock(return_value={'Large': 'Riesig'})
+        app = self.create_app('de')
+        xuanzang = Xuanzang(app, tenant_selector=lambda: 'acme',
+                            overlay_loader=overlay_loader)
+        with app.test_request_context():
+            self.assertEqual(LARGE, 'Riesig')
+            self.assertEqual(MAY, 'Mai')
+            overlay = xuanzang.get_translations()
+            # Only the base catalog gets a table
+            self.assertFalse(hasattr(overlay, '_xuanzang_handles'))
+            table = get_table(overlay._xuanzang_base)
+            self.assertEqual(table[registry.get('May', 'month name').id],
+                             'Mai')
+            self.assertEqual(table[registry.get('Large').id], None)
+
+    def test_missing(self):
+        with self.app.test_request_context():
+            self.assertEqual(message('Small'), 'Small')
+        self.assertEqual(len(self.collector), 1)
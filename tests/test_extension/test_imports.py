@@ -0,0 +1,30 @@
+from __future__ import absolute_import
+from __future__ import unicode_literals
+
+import os
+import subprocess
+import sys
+import unittest
+
+
+SCRIPT = '''
+import sys
+from flask import Flask
+import flask_xuanzang
+flask_xuanzang.Xuanzang(Flask(__name__))
+print(' '.join(sorted(sys.modules)))
+'''
+
+
+class ImportTestCase(unittest.TestCase):
+    def test_deferred_imports(self):
+        # Importing and initializing the extension must not load Babel and
+        # its CLDR data, nor modules needed only by optional features
+        root = os.path.dirname(os.path.dirname(os.path.dirname(
+            os.path.abspath(__file__))))
+        output = subprocess.check_output([sys.executable, '-c', SCRIPT],
+                                         cwd=root, universal_newlines=True)
+        modules = output.split()
+        self.assertTrue('flask_xuanzang' in modules)
+        for name in ('babel', 'sqlite3', 'concurrent', 'multiprocessing'):
+            self.assertFalse(name in modules, name)
@@ -0,0 +1,91 @@
+# -*- coding: utf-8 -*-
+from __future__ import absolute_import
+from __future__ import unicode_literals
+
+import json
+import unittest
+
+from flask import jsonify
+from mock import patch
+
+from flask_xuanzang import Xuanzang
+from flask_xuanzang import lazy_pgettext, lazy_ugettext, lazy_ungettext
+from flask_xuanzang import resolve_lazy_strings
+from flask_xuanzang.extension import Attan
+
+from tests import XuanzangTestCase
+
+try:
+    from flask_xuanzang.json_provider import XuanzangJSONProvider
+except ImportError:
+    XuanzangJSONProvider = None
+
+
+LARGE = lazy_ugettext('Large')
+
+
+class ResolveLazyStringsTestCase(XuanzangTestCase):
+    def setUp(self):
+        self.app = self.create_app('de')
+        self.xuanzang = Xuanzang(self.app)
+
+    def test_nested(self):
+        with self.app.test_request_context():
+            # Lazy keys are hashed by their translation
+            payload = {
+                'size': LARGE,
+                'items': [
+                    {'count': lazy_ungettext('%(num)s apple',
+                                             '%(num)s apples', 2)},
+                    (lazy_pgettext('month name', 'May'), 5, None),
+                ],
+                LARGE: 'key',
+            }
+            resolved = resolve_lazy_strings(payload)
+        self.assertEqual(resolved, {
+            'size': 'Groß',
+            'items': [{'count': '2 Äpfel'}, ('Mai', 5, None)],
+            'Groß': 'key',
+        })
+        self.assertEqual(type(resolved['size']), type(''))
+
+    def test_looked_up_once(self):
+        payload = [{'size': LARGE, 'month': lazy_pgettext('month name',
+                                                          'May')}
+                   for _ in range(100)]
+        with self.app.test_request_context():
+            with patch.object(Attan, 'get_translations', autospec=True,
+                              side_effect=Attan.get_translations) as get:
+                resolved = resolve_lazy_strings(payload)
+                self.assertEqual(get.call_count, 1)
+        self.assertEqual(resolved[99], {'size': 'Groß', 'month': 'Mai'})
+
+    def test_bound_translator(self):
+        with self.app.test_request_context():
+            translator = self.xuanzang.bind('zh_Hans_CN')
+            chinese = translator.lazy_ugettext('Large')
+            resolved = resolve_lazy_strings([LARGE, chinese])
+        self.assertEqual(resolved, ['Groß', '大型'])
+
+
+@unittest.skipIf(XuanzangJSONProvider is None, 'Requires Flask 2.2')
+class JSONProviderTestCase(XuanzangTestCase):
+    def setUp(self):
+        self.app = self.create_app('de')
+        self.app.json = XuanzangJSONProvider(self.app)
+        self.xuanzang = Xuanzang(self.app)
+
+        @self.app.route('/')
+        def index():
+            return jsonify(sizes=[LARGE] * 3, month=lazy_pgettext(
+                'month name', 'May'))
+
+    def test_jsonify(self):
+        response = self.app.test_client().get('/')
+        data = json.loads(response.get_data(as_text=True))
+        self.assertEqual(data, {'sizes': ['Groß'] * 3, 'month': 'Mai'})
+
+    def test_default(self):
+        with self.app.test_request_context():
+            self.assertEqual(XuanzangJSONProvider.default(LARGE), 'Groß')
+            self.assertEqual(self.app.json.dumps(LARGE), '"Gro\\u00df"')
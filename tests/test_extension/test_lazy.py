@@ -0,0 +1,127 @@
+# -*- coding: utf-8 -*-
+from __future__ import absolute_import
+from __future__ import unicode_literals
+
+import binascii
+import copy
+import json
+import os
+import pickle
+import subprocess
+import sys
+
+from flask import render_template_string
+
+from flask_xuanzang import Xuanzang, LazyString
+from flask_xuanzang import lazy_gettext, lazy_ugettext, lazy_ungettext
+from flask_xuanzang import message
+from flask_xuanzang.handles import registry
+
+from tests import XuanzangTestCase
+
+
+PY2 = (sys.version_info[0] == 2)
+text_type = type('')
+
+# Registers and resolves other messages under the ids the parent process
+# gave its messages, before unpickling the strings it pickled
+UNPICKLE = '''
+import binascii, pickle, sys
+from flask import Flask
+text_type = type(u'')
+from flask_xuanzang import Xuanzang, message
+padding = [message('Padding %d' % i) for i in range(int(sys.argv[3]))]
+app = Flask(__name__)
+app.config.update(XUANZANG_DEFAULT_LOCALE='de',
+                  XUANZANG_TRANSLATION_DIRECTORY=sys.argv[1])
+Xuanzang(app)
+strings = pickle.loads(binascii.unhexlify(sys.argv[2]))
+with app.test_request_context():
+    [text_type(s) for s in padding]
+    sys.stdout.write(binascii.hexlify(
+        u'|'.join(map(text_type, strings)).encode('utf-8')).decode('ascii'))
+'''
+
+
+class LazyStringTestCase(XuanzangTestCase):
+    def setUp(self):
+        self.app = self.create_app('de')
+        self.xuanzang = Xuanzang(self.app)
+
+    def test_compact(self):
+        s = lazy_ugettext('Hello %(name)s', name='x')
+        self.assertTrue(isinstance(s, LazyString))
+        self.assertFalse(hasattr(s, '__dict__'))
+
+    def test_str_protocol(self):
+        large = lazy_ugettext('Large')
+        with self.app.test_request_context():
+            self.assertEqual('{0}'.format(large), 'Groß')
+            self.assertEqual('{0:>5}'.format(large), ' Groß')
+            self.assertEqual(len(large), 4)
+            self.assertEqual(list(large), ['G', 'r', 'o', 'ß'])
+            self.assertEqual(large[1:], 'roß')
+            self.assertTrue('ro' in large)
+            self.assertTrue(large)
+            self.assertEqual(large + '!', 'Groß!')
+            self.assertEqual('!' + large, '!Groß')
+            self.assertEqual(large * 2, 'GroßGroß')
+            self.assertEqual('[%s]' % large, '[Groß]')
+            self.assertEqual(large.lower(), 'groß')
+            self.assertTrue(large < 'Z')
+            self.assertTrue(large > 'A')
+            self.assertEqual(large, lazy_ugettext('Large'))
+            self.assertNotEqual(large, 'Large')
+
+    def test_interpolation(self):
+        apples = lazy_ungettext('%(num)s apple', '%(num)s apples', 2)
+        with self.app.test_request_context():
+            self.assertEqual(text_type(apples), '2 Äpfel')
+            if PY2:
+                self.assertEqual(str(apples), '2 Äpfel'.encode('utf-8'))
+            else:
+                self.assertEqual(str(apples), '2 Äpfel')
+
+    def test_hashable(self):
+        large = lazy_ugettext('Large')
+        with self.app.test_request_context():
+            self.assertEqual(hash(large), hash('Groß'))
+            self.assertEqual({large: 1}['Groß'], 1)
+
+    def test_pickle(self):
+        strings = [message('Large'), message('May', 'month name'),
+                   lazy_gettext('Hello %(name)s', name='x')]
+        root = os.path.dirname(os.path.dirname(os.path.dirname(
+            os.path.abspath(__file__))))
+        output = subprocess.check_output(
+            [sys.executable, '-c', UNPICKLE, self.mo_directory,
+             binascii.hexlify(pickle.dumps(strings)).decode('ascii'),
+             str(len(registry))],
+            cwd=root)
+        restored = binascii.unhexlify(output).decode('utf-8').split('|')
+        self.assertEqual(restored, ['Groß', 'Mai', 'Hello x'])
+
+    def test_copy_outside_context(self):
+        large = lazy_ugettext('Large')
+        copied = copy.deepcopy(large)
+        self.assertTrue(isinstance(copied, LazyString))
+        with self.app.test_request_context():
+            self.assertEqual(copied, 'Groß')
+
+    def test_jinja(self):
+        s = lazy_gettext('<%(tag)s>', tag='b')
+        with self.app.test_request_context():
+            self.assertEqual(render_template_string('{{ s }}', s=s),
+                             '&lt;b&gt;')
+
+    def test_json(self):
+        with self.app.test_request_context():
+            self.assertEqual(
+                json.dumps([lazy_ugettext('Large')], default=text_type,
+                           ensure_ascii=False),
+                '["Groß"]')
+
+    def test_bound_translator(self):
+        with self.app.app_context():
+            translator = self.xuanzang.bind('zh_CN')
+        self.assertEqual(text_type(translator.lazy_ugettext('Large')), '大型')
@@ -0,0 +1,125 @@
+# -*- coding: utf-8 -*-
+from __future__ import absolute_import
+from __future__ import unicode_literals
+
+import os
+import tempfile
+import time
+
+from flask_xuanzang import Xuanzang
+from flask_xuanzang import MappingLoader, SQLiteLoader
+from flask_xuanzang import ugettext, ungettext, pgettext, npgettext
+
+from tests import XuanzangTestCase
+
+
+class MappingLoaderTestCase(XuanzangTestCase):
+    def setUp(self):
+        self.loader = MappingLoader()
+        self.loader.set_messages('de', {
+            'Large': 'Groß',
+            ('%(num)s apple', 0): '%(num)s Apfel',
+            ('%(num)s apple', 1): '%(num)s Äpfel',
+        })
+        self.app = self.create_app('de')
+        self.xuanzang = Xuanzang(self.app, loader=self.loader)
+
+    def test_load(self):
+        with self.app.test_request_context():
+            self.assertEqual(ugettext('Large'), 'Groß')
+            self.assertEqual(
+                ungettext('%(num)s apple', '%(num)s apples', 2), '2 Äpfel')
+            self.assertEqual(ugettext('Small'), 'Small')
+
+    def test_version(self):
+        self.assertEqual(self.loader.version('de'), 1)
+        self.assertEqual(self.loader.version('zh_CN'), 0)
+
+    def test_check_versions(self):
+        attan = self.app.extensions['xuanzang']
+        with self.app.test_request_context():
+            self.assertEqual(ugettext('Large'), 'Groß')
+
+        self.loader.set_messages('de', {'Large': 'Riesig'})
+        # Cached catalogs are served until the versions are checked
+        with self.app.test_request_context():
+            self.assertEqual(ugettext('Large'), 'Groß')
+
+        attan.check_versions()
+        with self.app.test_request_context():
+            self.assertEqual(ugettext('Large'), 'Riesig')
+
+
+class SQLiteLoaderTestCase(XuanzangTestCase):
+    def setUp(self):
+        fd, self.path = tempfile.mkstemp(suffix='.sqlite')
+        os.close(fd)
+        self.loader = SQLiteLoader(self.path)
+        self.loader.set_message('de', 'Large', 'Groß')
+        self.loader.set_message('de', 'May', 'Mai', context='month name')
+        self.loader.set_message('de', 'apple', 'Apfel',
+                                context='fruits', plural_index=0)
+        self.loader.set_message('de', 'apple', 'Äpfel',
+                                context='fruits', plural_index=1)
+        self.app = self.create_app('de')
+        self.xuanzang = Xuanzang(self.app, loader=self.loader)
+
+    def tearDown(self):
+        os.remove(self.path)
+
+    def test_load(self):
+        with self.app.test_request_context():
+            self.assertEqual(ugettext('Large'), 'Groß')
+            self.assertEqual(pgettext('month name', 'May'), 'Mai')
+            self.assertEqual(npgettext('fruits', 'apple', 'apples', 1),
+                             'Apfel')
+            self.assertEqual(npgettext('fruits', 'apple', 'apples', 2),
+                             'Äpfel')
+
+    def test_plural_forms_from_locale(self):
+        self.loader.set_message('zh_Hans_CN', 'apple', '苹果',
+                                context='fruits', plural_index=0)
+        app = self.create_app('zh_CN')
+        Xuanzang(app, loader=self.loader)
+        with app.test_request_context():
+            self.assertEqual(npgettext('fruits', 'apple', 'apples', 2),
+                             '苹果')
+
+    def test_version(self):
+        version = self.loader.version('de')
+        self.loader.set_message('de', 'Large', 'Riesig')
+        self.assertEqual(self.loader.version('de'), version + 1)
+        self.loader.delete_message('de', 'Large')
+        self.assertEqual(self.loader.version('de'), version + 2)
+        self.assertEqual(self.loader.version('fr'), 0)
+
+    def test_refresh_thread(self):
+        self.app.config['XUANZANG_REFRESH_INTERVAL'] = 0.01
+        xuanzang = Xuanzang(self.app, loader=self.loader)
+        attan = self.app.extensions['xuanzang']
+        try:
+            with self.app.test_request_context():
+                self.assertEqual(xuanzang.ugettext('Large'), 'Groß')
+
+            self.loader.delete_message('de', 'Large')
+            deadline = time.time() + 5
+            while time.time() < deadline:
+                with self.app.test_request_context():
+                    if xuanzang.ugettext('Large') == 'Large':
+                        break
+                time.sleep(0.01)
+            else:
+                self.fail('Catalog was not refreshed')
+        finally:
+            attan.refresh_thread.stop()
+
+
+class DirectoryLoaderTestCase(XuanzangTestCase):
+    def test_version(self):
+        app = self.create_app('de')
+        attan = Xuanzang(app).init_attan(app, None)
+        self.assertEqual(
+            attan.loader.version('de'),
+            os.path.getmtime(os.path.join(self.mo_directory, 'de',
+                                          'LC_MESSAGES', 'messages.mo')))
+        self.assertEqual(attan.loader.version('fr'), None)
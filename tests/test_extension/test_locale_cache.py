@@ -0,0 +1,85 @@
+# -*- coding: utf-8 -*-
+from __future__ import absolute_import
+from __future__ import unicode_literals
+
+from mock import Mock
+
+from flask_xuanzang import Xuanzang
+from flask_xuanzang import ugettext
+from flask_xuanzang.cache import TTLCache
+
+from tests import XuanzangTestCase
+
+
+class LocaleCacheTestCase(XuanzangTestCase):
+    def setUp(self):
+        self.app = self.create_app('de')
+        self.locale_selector = Mock(name='locale_selector',
+                                    return_value='zh_CN')
+        self.identity_selector = Mock(name='identity_selector',
+                                      return_value='alice')
+        self.xuanzang = Xuanzang(self.app,
+                                 locale_selector=self.locale_selector,
+                                 identity_selector=self.identity_selector)
+
+    def test_cache_between_requests(self):
+        for _ in range(3):
+            with self.app.test_request_context():
+                self.assertEqual(ugettext('Large'), '大型')
+        self.assertEqual(self.locale_selector.call_count, 1)
+        self.assertEqual(self.identity_selector.call_count, 3)
+
+    def test_cache_per_identity(self):
+        with self.app.test_request_context():
+            ugettext('Large')
+        self.identity_selector.return_value = 'bob'
+        self.locale_selector.return_value = 'de'
+        with self.app.test_request_context():
+            self.assertEqual(ugettext('Large'), 'Groß')
+        self.identity_selector.return_value = 'alice'
+        with self.app.test_request_context():
+            self.assertEqual(ugettext('Large'), '大型')
+        self.assertEqual(self.locale_selector.call_count, 2)
+
+    def test_anonymous(self):
+        self.identity_selector.return_value = None
+        with self.app.test_request_context():
+            ugettext('Large')
+        with self.app.test_request_context():
+            ugettext('Large')
+        self.assertEqual(self.locale_selector.call_count, 2)
+
+    def test_invalidate(self):
+        with self.app.test_request_context():
+            ugettext('Large')
+        self.locale_selector.return_value = 'de'
+        with self.app.test_request_context():
+            self.assertEqual(ugettext('Large'), '大型')
+            self.xuanzang.invalidate_locale('alice')
+            # refresh() only clears the locale of the current context
+            self.xuanzang.refresh()
+            self.assertEqual(ugettext('Large'), 'Groß')
+        self.assertEqual(self.locale_selector.call_count, 2)
+
+    def test_refresh_keeps_identity_cache(self):
+        with self.app.test_request_context():
+            ugettext('Large')
+            self.xuanzang.refresh()
+            ugettext('Large')
+        self.assertEqual(self.locale_selector.call_count, 1)
+        self.assertEqual(self.identity_selector.call_count, 2)
+
+    def test_ttl(self):
+        attan = self.app.extensions['xuanzang']
+        now = [0]
+        attan.locale_cache = TTLCache(10, 300, timer=lambda: now[0])
+        with self.app.test_request_context():
+            ugettext('Large')
+        now[0] = 299
+        with self.app.test_request_context():
+            ugettext('Large')
+        self.assertEqual(self.locale_selector.call_count, 1)
+        now[0] = 300
+        with self.app.test_request_context():
+            ugettext('Large')
+        self.assertEqual(self.locale_selector.call_count, 2)
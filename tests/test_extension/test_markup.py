@@ -0,0 +1,89 @@
+# -*- coding: utf-8 -*-
+from __future__ import absolute_import
+from __future__ import unicode_literals
+
+from flask import render_template_string
+from markupsafe import Markup
+
+from flask_xuanzang import Xuanzang, MappingLoader
+from flask_xuanzang import gettext, lazy_ugettext, ngettext_many
+from flask_xuanzang import ugettext, ungettext
+
+from tests import XuanzangTestCase
+
+
+class MarkupTestCase(XuanzangTestCase):
+    def setUp(self):
+        loader = MappingLoader()
+        loader.set_messages('de', {
+            'Fish & Chips': 'Fisch & Pommes',
+            'Apples & Pears': 'Äpfel & Birnen',
+            'Hello <b>%(name)s</b>': 'Hallo <b>%(name)s</b>',
+            ('%(num)s <apple>', 0): '%(num)s <Apfel>',
+            ('%(num)s <apple>', 1): '%(num)s <Äpfel>',
+        })
+        self.app = self.create_app('de')
+        self.app.config['XUANZANG_MARKUP'] = True
+        self.xuanzang = Xuanzang(self.app, loader=loader)
+
+    def test_disabled_by_default(self):
+        app = self.create_app('de')
+        Xuanzang(app)
+        with app.test_request_context():
+            self.assertFalse(isinstance(ugettext('Large'), Markup))
+
+    def test_escaped_once(self):
+        with self.app.test_request_context():
+            s = ugettext('Fish & Chips')
+            self.assertTrue(isinstance(s, Markup))
+            self.assertEqual(s, 'Fisch &amp; Pommes')
+            self.assertTrue(ugettext('Fish & Chips') is s)
+            # Untranslated messages are escaped as well
+            self.assertEqual(ugettext('<i>'), '&lt;i&gt;')
+            # but not kept, as they may be built at runtime
+            cache = self.xuanzang.get_translations()._xuanzang_markup
+            self.assertEqual(list(cache), ['Fisch & Pommes'])
+
+    def test_gettext(self):
+        # Non-ASCII byte strings on Python 2
+        with self.app.test_request_context():
+            s = gettext('Apples & Pears')
+            self.assertTrue(isinstance(s, Markup))
+            self.assertEqual(s, 'Äpfel &amp; Birnen')
+
+    def test_variables_escaped(self):
+        with self.app.test_request_context():
+            s = ugettext('Hello <b>%(name)s</b>', name='<script>')
+            self.assertEqual(s, 'Hallo &lt;b&gt;&lt;script&gt;&lt;/b&gt;')
+            s = ungettext('%(num)s <apple>', '%(num)s <apples>', 2)
+            self.assertEqual(s, '2 &lt;Äpfel&gt;')
+            self.assertEqual(
+                ngettext_many('%(num)s <apple>', '%(num)s <apples>', [1, 2]),
+                ['1 &lt;Apfel&gt;', '2 &lt;Äpfel&gt;'])
+
+    def test_lazy(self):
+        label = lazy_ugettext('Fish & Chips')
+        with self.app.test_request_context():
+            self.assertEqual(render_template_string('{{ label }}',
+                                                    label=label),
+                             'Fisch &amp; Pommes')
+
+    def test_template(self):
+        with self.app.test_request_context():
+            rendered = render_template_string(
+                '{{ ugettext("Fish & Chips") }}', ugettext=ugettext)
+        self.assertEqual(rendered, 'Fisch &amp; Pommes')
+
+    def test_bind(self):
+        with self.app.app_context():
+            translator = self.xuanzang.bind('de')
+        self.assertEqual(translator.ugettext('Fish & Chips'),
+                         Markup('Fisch &amp; Pommes'))
+
+    def test_new_catalog(self):
+        with self.app.test_request_context():
+            before = ugettext('Fish & Chips')
+            self.xuanzang.refresh_translations()
+            after = ugettext('Fish & Chips')
+        self.assertEqual(before, after)
+        self.assertFalse(before is after)
@@ -0,0 +1,113 @@
+# -*- coding: utf-8 -*-
+from __future__ import absolute_import
+from __future__ import unicode_literals
+
+from decimal import Decimal
+
+from mock import Mock, patch
+
+from flask_xuanzang import Xuanzang
+from flask_xuanzang import gettext, ngettext, pgettext, ugettext
+from flask_xuanzang.extension import Attan
+
+from tests import XuanzangTestCase
+
+
+class RequestMemoTestCase(XuanzangTestCase):
+    def setUp(self):
+        self.app = self.create_app('zh_CN')
+        self.app.config['XUANZANG_REQUEST_MEMO_SIZE'] = 10
+        self.xuanzang = Xuanzang(self.app)
+
+    def get_stats(self, app, xuanzang):
+        with app.app_context():
+            return xuanzang.get_stats()
+
+    def test_disabled_by_default(self):
+        app = self.create_app('zh_CN')
+        xuanzang = Xuanzang(app)
+        with app.test_request_context():
+            self.assertEqual(ugettext('Large'), '大型')
+            self.assertTrue(xuanzang.get_memo() is None)
+        self.assertEqual(self.get_stats(app, xuanzang),
+                         {'memo_hits': 0, 'memo_misses': 0})
+
+    def test_repeated_lookups(self):
+        with self.app.test_request_context():
+            with patch.object(Attan, 'get_translations',
+                              wraps=self.xuanzang.get_attan()
+                                        .get_translations) as m:
+                for _ in range(5):
+                    self.assertEqual(ugettext('Large'), '大型')
+                self.assertEqual(m.call_count, 1)
+            self.assertEqual(pgettext('size', 'Large'),
+                             pgettext('size', 'Large'))
+            self.assertEqual(gettext('Hello %(name)s', name='A'),
+                             gettext('Hello %(name)s', name='A'))
+            self.assertEqual(ngettext('%(num)d apple', '%(num)d apples', 2),
+                             ngettext('%(num)d apple', '%(num)d apples', 2))
+        stats = self.get_stats(self.app, self.xuanzang)
+        self.assertEqual(stats['memo_hits'], 7)
+        self.assertEqual(stats['memo_misses'], 4)
+
+    def test_arguments_in_key(self):
+        with self.app.test_request_context():
+            self.assertNotEqual(
+                ngettext('%(num)d apple', '%(num)d apples', 1),
+                ngettext('%(num)d apple', '%(num)d apples', 2))
+            self.assertNotEqual(gettext('Hello %(name)s', name='A'),
+                                gettext('Hello %(name)s', name='B'))
+
+    def test_types_in_key(self):
+        # Values comparing equal may format differently
+        with self.app.test_request_context():
+            self.assertEqual(ngettext('%(num)s item', '%(num)s items', 1),
+                             '1 item')
+            self.assertEqual(ngettext('%(num)s item', '%(num)s items', 1.0),
+                             '1.0 item')
+            self.assertEqual(gettext('Total: %(p)s', p=Decimal('2.50')),
+                             'Total: 2.50')
+            self.assertEqual(gettext('Total: %(p)s', p=2.5), 'Total: 2.5')
+            # Even values of the same type, so such calls are not memoized
+            self.assertEqual(gettext('Price %(p)s', p=Decimal('2.5')),
+                             'Price 2.5')
+            self.assertEqual(gettext('Price %(p)s', p=Decimal('2.50')),
+                             'Price 2.50')
+            # Only the call with an int was memoized
+            self.assertEqual(len(self.xuanzang.get_memo()), 1)
+            self.assertEqual(gettext('Flag: %(f)s', f=True), 'Flag: True')
+            self.assertEqual(gettext('Flag: %(f)s', f=1), 'Flag: 1')
+
+    def test_bounded(self):
+        with self.app.test_request_context():
+            for i in range(12):
+                ugettext('message {0}'.format(i))
+            self.assertEqual(len(self.xuanzang.get_memo()), 10)
+            ugettext('message 11')
+        stats = self.get_stats(self.app, self.xuanzang)
+        self.assertEqual(stats['memo_hits'], 0)
+
+    def test_unhashable_variables(self):
+        with self.app.test_request_context():
+            self.assertEqual(gettext('%(x)s', x=[1]), '[1]')
+            self.assertEqual(len(self.xuanzang.get_memo()), 0)
+
+    def test_per_context(self):
+        with self.app.test_request_context():
+            ugettext('Large')
+        with self.app.test_request_context():
+            ugettext('Large')
+        self.assertEqual(self.get_stats(self.app, self.xuanzang),
+                         {'memo_hits': 0, 'memo_misses': 2})
+
+    def test_refresh(self):
+        locale_selector = Mock(return_value='zh_CN')
+        app = self.create_app('zh_CN')
+        app.config['XUANZANG_REQUEST_MEMO_SIZE'] = 10
+        xuanzang = Xuanzang(app, locale_selector=locale_selector)
+        with app.test_request_context():
+            self.assertEqual(ugettext('Large'), '大型')
+            locale_selector.return_value = 'de'
+            xuanzang.refresh()
+            self.assertEqual(ugettext('Large'), 'Groß')
+        self.assertEqual(self.get_stats(app, xuanzang)['memo_misses'], 2)
@@ -0,0 +1,129 @@
+# -*- coding: utf-8 -*-
+from __future__ import absolute_import
+from __future__ import unicode_literals
+
+import datetime
+
+from babel.core import Locale
+from markupsafe import Markup, escape
+
+from flask_xuanzang import Xuanzang, MappingLoader, MessageFormatError
+from flask_xuanzang import lazy_ugettext, ugettext
+from flask_xuanzang.dates import DateFormatter
+from flask_xuanzang.messageformat import compile_message
+
+from tests import XuanzangTestCase
+
+
+def format(message, locale='en', **args):
+    locale = Locale.parse(locale)
+    return compile_message(message, locale, DateFormatter(locale))(args)
+
+
+class CompileMessageTestCase(XuanzangTestCase):
+    def test_simple(self):
+        self.assertEqual(format('Hello {name}!', name='Ann'), 'Hello Ann!')
+        self.assertEqual(format('No arguments'), 'No arguments')
+
+    def test_quoting(self):
+        self.assertEqual(format("I''m '{literal}' {x}", x=1),
+                         "I'm {literal} 1")
+        self.assertEqual(format("It's"), "It's")
+
+    def test_number(self):
+        self.assertEqual(format('{n, number}', 'de', n=1234.5), '1.234,5')
+        self.assertEqual(format('{n, number, integer}', n=1234.5), '1,234')
+        self.assertEqual(format('{n, number, percent}', n=0.25), '25%')
+        self.assertEqual(format('{n, number, 00.00}', n=5), '05.00')
+        self.assertEqual(format('{n, number, #,##0.0}', n=12), '12.0')
+
+    def test_date(self):
+        date = datetime.date(2016, 11, 8)
+        self.assertEqual(format('{d, date, short}', 'de', d=date),
+                         '08.11.16')
+
+    def test_select(self):
+        message = '{gender, select, female {She} male {He} other {They}}'
+        self.assertEqual(format(message, gender='female'), 'She')
+        self.assertEqual(format(message, gender='x'), 'They')
+
+    def test_plural(self):
+        message = ('{n, plural, =0 {no apples} one {# apple} '
+                   'other {# apples}}')
+        self.assertEqual(format(message, n=0), 'no apples')
+        self.assertEqual(format(message, n=1), '1 apple')
+        self.assertEqual(format(message, n=1200), '1,200 apples')
+
+    def test_plural_rules_of_locale(self):
+        message = '{n, plural, one {#: one} few {#: few} many {#: many} ' \
+                  'other {#: other}}'
+        self.assertEqual(format(message, 'ru', n=3), '3: few')
+        self.assertEqual(format(message, 'ru', n=5), '5: many')
+        self.assertEqual(format(message, 'ru', n=21), '21: one')
+
+    def test_offset_and_nesting(self):
+        message = ('{host} invited {n, plural, offset:1 =0 {nobody} '
+                   '=1 {{guest}} other {{guest} and # others}}'
+                   ' to {gender, select, female {her} other {their}} party')
+        self.assertEqual(format(message, host='Ann', gender='female', n=3,
+                                guest='Bob'),
+                         'Ann invited Bob and 2 others to her party')
+
+    def test_ordinal(self):
+        message = ('{n, selectordinal, one {#st} two {#nd} few {#rd} '
+                   'other {#th}}')
+        self.assertEqual([format(message, n=n) for n in (1, 2, 3, 4, 11)],
+                         ['1st', '2nd', '3rd', '4th', '11th'])
+
+    def test_escape(self):
+        locale = Locale.parse('en')
+        func = compile_message('<b>{name}</b> & {n, plural, other {#}}',
+                               locale, DateFormatter(locale), escape)
+        result = func({'name': '<i>', 'n': 2})
+        self.assertTrue(isinstance(result, Markup))
+        self.assertEqual(result, '&lt;b&gt;&lt;i&gt;&lt;/b&gt; &amp; 2')
+
+    def test_errors(self):
+        for message in ('{', '{name', '}', '{n, plural, one {x}}',
+                        '{n, spellout}', '{n, select, other {x}'):
+            self.assertRaises(MessageFormatError, format, message, n=1)
+
+
+class MessageSyntaxTestCase(XuanzangTestCase):
+    def setUp(self):
+        loader = MappingLoader()
+        loader.set_messages('de', {
+            'You have {n, plural, one {# message} other {# messages}}':
+            'Sie haben {n, plural, one {# Nachricht} '
+            'other {# Nachrichten}}',
+            "Don''t": "Nicht",
+        })
+        self.app = self.create_app('de')
+        self.app.config['XUANZANG_MESSAGE_SYNTAX'] = 'icu'
+        self.xuanzang = Xuanzang(self.app, loader=loader)
+
+    def test_gettext(self):
+        message = 'You have {n, plural, one {# message} other {# messages}}'
+        with self.app.test_request_context():
+            self.assertEqual(ugettext(message, n=1), 'Sie haben 1 Nachricht')
+            self.assertEqual(ugettext(message, n=1000),
+                             'Sie haben 1.000 Nachrichten')
+            self.assertEqual(ugettext("Don''t"), 'Nicht')
+            self.assertEqual(ugettext("Can''t"), "Can't")
+            self.assertEqual(str(lazy_ugettext("Can''t")), "Can't")
+
+    def test_compiled_once_per_catalog(self):
+        with self.app.test_request_context():
+            ugettext('Hello {name}', name='a')
+            t = self.xuanzang.get_translations()
+            func = t._xuanzang_compiled['Hello {name}', False]
+            ugettext('Hello {name}', name='b')
+            self.assertTrue(
+                t._xuanzang_compiled['Hello {name}', False] is func)
+
+    def test_markup(self):
+        self.app.config['XUANZANG_MARKUP'] = True
+        xuanzang = Xuanzang(self.app)
+        with self.app.test_request_context():
+            result = xuanzang.ugettext('<{name}>', name='&')
+        self.assertEqual(result, Markup('&lt;&amp;&gt;'))
@@ -0,0 +1,137 @@
+# -*- coding: utf-8 -*-
+from __future__ import absolute_import
+from __future__ import unicode_literals
+
+import io
+import json
+import os
+import tempfile
+import time
+
+from babel.support import Locale
+from mock import Mock
+
+from flask_xuanzang import Xuanzang, MissingTranslationCollector
+from flask_xuanzang import ugettext, ungettext, pgettext, npgettext
+
+from tests import XuanzangTestCase
+
+
+class MissingTestCase(XuanzangTestCase):
+    def setUp(self):
+        self.app = self.create_app('de')
+        self.callback = Mock(name='callback')
+        self.collector = MissingTranslationCollector(callback=self.callback,
+                                                     flush_interval=None)
+        self.xuanzang = Xuanzang(self.app, missing_collector=self.collector)
+
+    def test_translated(self):
+        with self.app.test_request_context():
+            ugettext('Large')
+            ungettext('%(num)s apple', '%(num)s apples', 2)
+            pgettext('month name', 'May')
+            npgettext('fruits', 'apple', 'apples', 1)
+        self.assertEqual(len(self.collector), 0)
+
+    def test_untranslated(self):
+        de = Locale.parse('de')
+        with self.app.test_request_context():
+            self.assertEqual(ugettext('Small'), 'Small')
+            ungettext('%(num)s pear', '%(num)s pears', 2)
+            pgettext('month name', 'June')
+            npgettext('fruits', 'pear', 'pears', 1)
+            self.xuanzang.ugettext('Tiny')
+        self.assertTrue((de, None, 'Small') in self.collector)
+        self.assertTrue((de, None, '%(num)s pear') in self.collector)
+        self.assertTrue((de, 'month name', 'June') in self.collector)
+        self.assertTrue((de, 'fruits', 'pear') in self.collector)
+        self.assertTrue((de, None, 'Tiny') in self.collector)
+
+    def test_dedupe(self):
+        with self.app.test_request_context():
+            ugettext('Small')
+            ugettext('Small')
+        self.collector.flush()
+        self.callback.assert_called_once_with([
+            {'locale': 'de', 'context': None, 'msgid': 'Small'},
+        ])
+
+        # Already flushed messages are not reported again
+        with self.app.test_request_context():
+            ugettext('Small')
+        self.collector.flush()
+        self.assertEqual(self.callback.call_count, 1)
+
+    def test_sample_rate(self):
+        self.collector.sample_rate = 0.0
+        with self.app.test_request_context():
+            ugettext('Small')
+        self.assertEqual(len(self.collector), 0)
+
+    def test_max_size(self):
+        self.collector.max_size = 1
+        with self.app.test_request_context():
+            ugettext('Small')
+            ugettext('Tiny')
+        self.assertEqual(len(self.collector), 1)
+        self.assertEqual(self.collector.dropped, 1)
+
+    def test_empty_collector(self):
+        # An empty collector is falsy but still replaces the default
+        xuanzang = Xuanzang(missing_collector=Mock(name='default'))
+        app = self.create_app('de')
+        xuanzang.init_app(app, missing_collector=self.collector)
+        self.assertEqual(len(self.collector), 0)
+        self.assertTrue(app.extensions['xuanzang'].missing_collector is
+                        self.collector)
+
+
+class MissingFileTestCase(XuanzangTestCase):
+    def setUp(self):
+        fd, self.path = tempfile.mkstemp(suffix='.jsonl')
+        os.close(fd)
+
+    def tearDown(self):
+        os.remove(self.path)
+
+    def test_flush_to_file(self):
+        collector = MissingTranslationCollector(path=self.path,
+                                                flush_interval=None)
+        collector.record(Locale.parse('de'), None, 'Größe')
+        collector.record(Locale.parse('zh_CN'), 'fruits', 'pear')
+        collector.flush()
+
+        with io.open(self.path, encoding='utf-8') as f:
+            records = [json.loads(line) for line in f]
+        self.assertEqual(records, [
+            {'locale': 'de', 'context': None, 'msgid': 'Größe'},
+            {'locale': 'zh_Hans_CN', 'context': 'fruits', 'msgid': 'pear'},
+        ])
+
+    def test_background_flush(self):
+        callback = Mock(name='callback')
+        collector = MissingTranslationCollector(callback=callback,
+                                                flush_interval=0.01)
+        collector.record(Locale.parse('de'), None, 'Small')
+        collector.close()
+        callback.assert_called_once_with([
+            {'locale': 'de', 'context': None, 'msgid': 'Small'},
+        ])
+
+    def test_background_flush_error(self):
+        callback = Mock(name='callback', side_effect=[IOError, None])
+        collector = MissingTranslationCollector(callback=callback,
+                                                flush_interval=0.01)
+        collector.record(Locale.parse('de'), None, 'Small')
+        collector.record(Locale.parse('de'), None, 'Large')
+        # The thread survives a failed flush and keeps flushing
+        deadline = time.time() + 5
+        while callback.call_count < 2 and time.time() < deadline:
+            if callback.call_count == 1 and not collector._pending:
+                collector.record(Locale.parse('de'), None, 'Tiny')
+            time.sleep(0.01)
+        self.assertEqual(callback.call_count, 2)
+        collector.close()
+        self.assertEqual(callback.call_args[0][0], [
+            {'locale': 'de', 'context': None, 'msgid': 'Tiny'},
+        ])
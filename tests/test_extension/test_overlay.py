@@ -0,0 +1,100 @@
+# -*- coding: utf-8 -*-
+from __future__ import absolute_import
+from __future__ import unicode_literals
+
+from mock import Mock
+
+from flask_xuanzang import Xuanzang
+from flask_xuanzang import ugettext, ungettext, pgettext, npgettext
+
+from tests import XuanzangTestCase
+
+
+OVERRIDES = {
+    'acme': {
+        'Large': 'Riesig',
+        ('%(num)s apple', 1): '%(num)s Äpfelchen',
+        'month name\x04May': 'Wonnemonat',
+    },
+}
+
+
+class OverlayTestCase(XuanzangTestCase):
+    def setUp(self):
+        self.app = self.create_app('de')
+        self.tenant_selector = Mock(name='tenant_selector', return_value=None)
+        self.overlay_loader = Mock(
+            name='overlay_loader',
+            side_effect=lambda tenant, locale: OVERRIDES.get(tenant))
+        self.xuanzang = Xuanzang(self.app,
+                                 tenant_selector=self.tenant_selector,
+                                 overlay_loader=self.overlay_loader)
+
+    def test_no_tenant(self):
+        with self.app.test_request_context():
+            self.assertEqual(ugettext('Large'), 'Groß')
+        self.assertEqual(self.overlay_loader.call_count, 0)
+
+    def test_tenant_without_overrides(self):
+        self.tenant_selector.return_value = 'initech'
+        with self.app.test_request_context():
+            self.assertEqual(ugettext('Large'), 'Groß')
+
+    def test_overrides(self):
+        self.tenant_selector.return_value = 'acme'
+        with self.app.test_request_context():
+            self.assertEqual(ugettext('Large'), 'Riesig')
+            self.assertEqual(pgettext('month name', 'May'), 'Wonnemonat')
+            self.assertEqual(
+                ungettext('%(num)s apple', '%(num)s apples', 1), '1 Apfel')
+            self.assertEqual(
+                ungettext('%(num)s apple', '%(num)s apples', 2),
+                '2 Äpfelchen')
+            # Messages not overridden come from the shared catalog
+            self.assertEqual(npgettext('fruits', 'apple', 'apples', 2),
+                             'Äpfel')
+
+    def test_tenants_share_base_catalog(self):
+        self.tenant_selector.return_value = 'acme'
+        with self.app.test_request_context():
+            ugettext('Large')
+        self.tenant_selector.return_value = 'initech'
+        with self.app.test_request_context():
+            self.assertEqual(ugettext('Large'), 'Groß')
+
+        attan = self.app.extensions['xuanzang']
+        self.assertEqual(len(attan.translation_cache), 1)
+
+    def test_overlay_cache(self):
+        self.tenant_selector.return_value = 'acme'
+        with self.app.test_request_context():
+            ugettext('Large')
+        with self.app.test_request_context():
+            ugettext('Large')
+        self.assertEqual(self.overlay_loader.call_count, 1)
+
+        with self.app.test_request_context():
+            self.xuanzang.refresh_overlays('acme')
+            ugettext('Large')
+        self.assertEqual(self.overlay_loader.call_count, 2)
+
+    def test_overlay_cache_eviction(self):
+        attan = self.app.extensions['xuanzang']
+        attan.overlay_cache.maxsize = 2
+        for tenant in ('a', 'b', 'c', 'a'):
+            self.tenant_selector.return_value = tenant
+            with self.app.test_request_context():
+                ugettext('Large')
+        self.assertEqual(len(attan.overlay_cache), 2)
+        self.assertEqual(self.overlay_loader.call_count, 4)
+
+    def test_tenant_cached_in_request(self):
+        self.tenant_selector.return_value = 'acme'
+        with self.app.test_request_context():
+            ugettext('Large')
+            ugettext('Large')
+            self.assertEqual(self.tenant_selector.call_count, 1)
+
+            self.xuanzang.refresh()
+            ugettext('Large')
+            self.assertEqual(self.tenant_selector.call_count, 2)
@@ -0,0 +1,84 @@
+# -*- coding: utf-8 -*-
+from __future__ import absolute_import
+from __future__ import unicode_literals
+
+import sys
+import unittest
+
+from mock import Mock
+
+from flask_xuanzang import Xuanzang
+from flask_xuanzang import ngettext_many
+from flask_xuanzang.plural import compile_plural, parse_plural_forms
+
+from tests import XuanzangTestCase
+
+
+PY2 = (sys.version_info[0] == 2)
+
+
+class CompilePluralTestCase(unittest.TestCase):
+    def test_parse_plural_forms(self):
+        self.assertEqual(parse_plural_forms('nplurals=2; plural=(n != 1)'),
+                         '(n != 1)')
+        self.assertEqual(parse_plural_forms('nplurals=1; plural=0;'), '0')
+        self.assertEqual(parse_plural_forms('nplurals=1'), None)
+        self.assertEqual(parse_plural_forms(None), None)
+
+    def test_constant(self):
+        plural = compile_plural('0')
+        self.assertEqual([plural(n) for n in (0, 1, 2, 10 ** 6)],
+                         [0, 0, 0, 0])
+
+    def test_known_expression(self):
+        plural = compile_plural('(n != 1)')
+        self.assertEqual([plural(n) for n in (0, 1, 2, 10 ** 6)],
+                         [1, 0, 1, 1])
+
+    def test_generic_expression(self):
+        # Russian
+        plural = compile_plural(
+            'n%10==1 && n%100!=11 ? 0 : '
+            'n%10>=2 && n%10<=4 && (n%100<10 || n%100>=20) ? 1 : 2',
+            cache_size=100)
+        # Both cached and uncached counts give the same result
+        self.assertEqual([plural(n) for n in (1, 2, 5, 11, 21, 22, 25)],
+                         [0, 1, 2, 2, 0, 1, 2])
+        self.assertEqual([plural(n) for n in (101, 102, 105, 111, 1021)],
+                         [0, 1, 2, 2, 0])
+
+
+class NgettextManyTestCase(XuanzangTestCase):
+    def setUp(self):
+        self.app = self.create_app('de')
+        self.locale_selector = Mock(name='locale_selector', return_value=None)
+        self.xuanzang = Xuanzang(self.app,
+                                 locale_selector=self.locale_selector)
+
+    def test_ngettext_many(self):
+        with self.app.test_request_context():
+            messages = ngettext_many('%(num)s apple', '%(num)s apples',
+                                     [1, 2, 0, 1, 2000])
+            expected = ['1 Apfel', '2 Äpfel', '0 Äpfel', '1 Apfel',
+                        '2000 Äpfel']
+            if PY2:
+                expected = [m.encode('utf-8') for m in expected]
+            self.assertEqual(messages, expected)
+
+    def test_ngettext_many_variables(self):
+        with self.app.test_request_context():
+            # A native string, as ngettext returns bytes on Python 2
+            messages = self.xuanzang.ngettext_many(
+                '%(num)s apple', '%(num)s apples', [1, 2], num=str('n'))
+            expected = ['n Apfel', 'n Äpfel']
+            if PY2:
+                expected = [m.encode('utf-8') for m in expected]
+            self.assertEqual(messages, expected)
+
+    def test_untranslated(self):
+        # Untranslated messages still fall back on `num == 1`
+        self.locale_selector.return_value = 'zh_CN'
+        with self.app.test_request_context():
+            messages = ngettext_many('%(num)s pear', '%(num)s pears',
+                                     [1, 2, 1])
+            self.assertEqual(messages, ['1 pear', '2 pears', '1 pear'])
@@ -0,0 +1,119 @@
+# -*- coding: utf-8 -*-
+from __future__ import absolute_import
+from __future__ import unicode_literals
+
+import os
+import shutil
+import tempfile
+import threading
+
+from flask_xuanzang import Xuanzang, MappingLoader
+from flask_xuanzang import ugettext
+
+from tests import XuanzangTestCase
+
+
+class GatedLoader(MappingLoader):
+    def __init__(self):
+        super(GatedLoader, self).__init__()
+        self.gate = threading.Event()
+        self.gate.set()
+        self.failing = set()
+
+    def load(self, locale):
+        self.gate.wait()
+        if str(locale) in self.failing:
+            raise ValueError('Broken catalog')
+        return super(GatedLoader, self).load(locale)
+
+
+class BackgroundRefreshTestCase(XuanzangTestCase):
+    def setUp(self):
+        self.loader = GatedLoader()
+        self.loader.set_messages('de', {'Large': 'Groß'})
+        self.loader.set_messages('zh_Hans_CN', {'Large': '大型'})
+        self.app = self.create_app('de')
+        self.xuanzang = Xuanzang(self.app, loader=self.loader)
+        with self.app.test_request_context():
+            ugettext('Large')
+
+    def test_serve_stale_while_reloading(self):
+        self.loader.set_messages('de', {'Large': 'Riesig'})
+        self.loader.gate.clear()
+        with self.app.test_request_context():
+            future = self.xuanzang.refresh_translations(background=True)
+            # The old catalog is served without blocking
+            self.assertEqual(ugettext('Large'), 'Groß')
+        self.loader.gate.set()
+
+        report = future.result(timeout=5)
+        self.assertEqual([str(locale) for locale in report.durations], ['de'])
+        self.assertEqual(report.errors, {})
+        with self.app.test_request_context():
+            self.assertEqual(ugettext('Large'), 'Riesig')
+
+    def test_keep_catalog_on_failure(self):
+        self.loader.failing.add('de')
+        with self.app.test_request_context():
+            future = self.xuanzang.refresh_translations(background=True)
+        report = future.result(timeout=5)
+        self.assertEqual([str(locale) for locale in report.errors], ['de'])
+        error, = report.errors.values()
+        self.assertTrue(isinstance(error, ValueError))
+        with self.app.test_request_context():
+            self.assertEqual(ugettext('Large'), 'Groß')
+
+    def test_report(self):
+        attan = self.app.extensions['xuanzang']
+        attan.locale_selector = lambda: 'zh_CN'
+        with self.app.test_request_context():
+            ugettext('Large')
+        self.loader.failing.add('zh_Hans_CN')
+
+        report = attan.refresh_translations(background=True).result(5)
+        self.assertEqual(sorted(str(locale) for locale in report.durations),
+                         ['de', 'zh_Hans_CN'])
+        self.assertEqual([str(locale) for locale in report.errors],
+                         ['zh_Hans_CN'])
+        self.assertTrue(attan.last_refresh_report is report)
+
+    def test_unexpected_failure(self):
+        attan = self.app.extensions['xuanzang']
+
+        def swap_translations(reloaded):
+            raise RuntimeError('Broken swap')
+
+        attan._swap_translations = swap_translations
+        future = attan.refresh_translations(background=True)
+        self.assertRaises(RuntimeError, future.result, 5)
+        with self.app.test_request_context():
+            self.assertEqual(ugettext('Large'), 'Groß')
+
+
+class BackgroundRefreshDirectoryTestCase(XuanzangTestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        shutil.rmtree(self.directory)
+        shutil.copytree(self.mo_directory, self.directory)
+        self.app = self.create_app('de')
+        self.app.config['XUANZANG_TRANSLATION_DIRECTORY'] = self.directory
+        self.xuanzang = Xuanzang(self.app)
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def test_keep_catalog_on_parse_failure(self):
+        with self.app.test_request_context():
+            self.assertEqual(ugettext('Large'), 'Groß')
+
+        mo_file = os.path.join(self.directory, 'de',
+                               'LC_MESSAGES', 'messages.mo')
+        with open(mo_file, 'wb') as f:
+            f.write(b'not a catalog')
+
+        with self.app.test_request_context():
+            future = self.xuanzang.refresh_translations(background=True)
+        report = future.result(timeout=5)
+        self.assertEqual([str(locale) for locale in report.errors], ['de'])
+        with self.app.test_request_context():
+            self.assertEqual(ugettext('Large'), 'Groß')
@@ -0,0 +1,112 @@
+# -*- coding: utf-8 -*-
+from __future__ import absolute_import
+from __future__ import unicode_literals
+
+from flask import request
+from mock import Mock
+
+from flask_xuanzang import Xuanzang, MappingLoader
+from flask_xuanzang import ugettext, url_for
+from flask_xuanzang.routing import get_route_index
+
+from tests import XuanzangTestCase
+
+
+class RoutingTestCase(XuanzangTestCase):
+    def setUp(self):
+        self.loader = MappingLoader()
+        self.loader.set_messages('de', {
+            'url\x04products': 'produkte',
+            'url\x04about': 'über-uns',
+            'url\x04new': 'neu',
+            'Large': 'Groß',
+        })
+        self.loader.set_messages('en', {})
+        self.app = self.create_app('en')
+        self.app.config['XUANZANG_URL_LOCALES'] = ['en', 'de']
+        self.selector = Mock(return_value='en')
+        self.xuanzang = Xuanzang(self.app, locale_selector=self.selector,
+                                 loader=self.loader)
+
+        @self.app.route('/products/<int:id>')
+        def product(id):
+            return '{0} {1} {2}'.format(id, request.path, ugettext('Large'))
+
+        @self.app.route('/about')
+        def about():
+            return url_for('product', id=7)
+
+        @self.app.route('/files/<path:name>/products')
+        def files(name):
+            return name
+
+        @self.app.route('/tags/<name>')
+        def tag(name):
+            return name
+
+        @self.app.route('/products/new')
+        def new_product():
+            return 'new'
+
+        self.client = self.app.test_client()
+
+    def get(self, url):
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, 200, url)
+        return response.get_data(as_text=True)
+
+    def test_resolve(self):
+        self.assertEqual(self.get('/de/produkte/42'), '42 /products/42 Groß')
+        self.assertEqual(self.get('/en/products/42'),
+                         '42 /products/42 Large')
+        self.assertEqual(self.get('/de/%C3%BCber-uns'), '/de/produkte/7')
+        self.assertFalse(self.selector.called)
+
+        # Paths without a locale prefix are left to the selector
+        self.assertEqual(self.get('/products/42'), '42 /products/42 Large')
+        self.assertTrue(self.selector.called)
+        self.assertEqual(self.client.get('/fr/products/42').status_code, 404)
+
+    def test_resolve_static_segments_only(self):
+        # Variable parts equal to a localized slug are left as is
+        self.assertEqual(self.get('/de/tags/neu'), 'neu')
+        self.assertEqual(self.get('/de/produkte/neu'), 'new')
+        self.assertEqual(self.get('/de/files/neu/produkte'), 'neu')
+
+    def test_url_for(self):
+        with self.app.test_request_context('/'):
+            self.assertEqual(url_for('product', id=3), '/en/products/3')
+            self.assertEqual(url_for('product', 'de', id=3, page=2),
+                             '/de/produkte/3?page=2')
+            self.assertEqual(url_for('about', _locale='de'),
+                             '/de/%C3%BCber-uns')
+            self.assertEqual(url_for('about', _locale='de', _external=True),
+                             'http://localhost/de/%C3%BCber-uns')
+            # Only static segments are translated
+            self.assertEqual(url_for('files', _locale='de', name='products'),
+                             '/de/files/products/produkte')
+            # Locales without a prefix get the URL of Flask
+            self.assertEqual(url_for('about', _locale='fr'), '/about')
+
+    def test_disabled(self):
+        app = self.create_app('de')
+        Xuanzang(app, loader=self.loader)
+        app.add_url_rule('/products', 'products', lambda: 'ok')
+        with app.test_request_context('/'):
+            self.assertEqual(url_for('products'), '/products')
+        self.assertEqual(app.test_client().get('/de/produkte').status_code,
+                         404)
+
+    def test_index_per_catalog(self):
+        attan = self.app.extensions['xuanzang']
+        with self.app.test_request_context('/'):
+            url_for('product', _locale='de', id=1)
+        translations = attan.load_translations(attan.routing.prefixes['de'])
+        index = get_route_index(translations, 'url')
+        self.assertTrue(get_route_index(translations, 'url') is index)
+        self.assertEqual(index.localized['products'], 'produkte')
+
+        self.loader.set_messages('de', {'url\x04products': 'waren'})
+        with self.app.app_context():
+            self.xuanzang.refresh_translations()
+        self.assertEqual(self.get('/de/waren/42'), '42 /products/42 Large')
@@ -0,0 +1,89 @@
+# -*- coding: utf-8 -*-
+from __future__ import absolute_import
+from __future__ import unicode_literals
+
+import gc
+import os
+
+from flask_xuanzang import Xuanzang
+from flask_xuanzang import ugettext
+from flask_xuanzang.loaders import DirectoryLoader
+from flask_xuanzang.shared import registry
+
+from tests import XuanzangTestCase
+
+
+class SharedCatalogsTestCase(XuanzangTestCase):
+    def setUp(self):
+        # Release the catalogs of the applications of previous tests
+        gc.collect()
+
+    def create_shared_app(self, directory=None, **options):
+        app = self.create_app('de')
+        app.config['XUANZANG_SHARE_CATALOGS'] = True
+        if directory is not None:
+            app.config['XUANZANG_TRANSLATION_DIRECTORY'] = directory
+        Xuanzang(app, **options)
+        return app
+
+    def get_catalog(self, app):
+        with app.test_request_context():
+            self.assertEqual(ugettext('Large'), 'Groß')
+            return app.extensions['xuanzang'].get_translations()
+
+    def key(self):
+        loader = DirectoryLoader(self.mo_directory)
+        return (loader.shared_key(), False)
+
+    def test_shared(self):
+        app_a = self.create_shared_app()
+        app_b = self.create_shared_app(os.path.join(self.mo_directory, '.'))
+        self.assertTrue(self.get_catalog(app_a) is self.get_catalog(app_b))
+        self.assertEqual(registry._sets[self.key()].refcount, 2)
+
+    def test_not_shared_by_default(self):
+        app_a = self.create_app('de')
+        Xuanzang(app_a)
+        app_b = self.create_shared_app()
+        self.assertFalse(self.get_catalog(app_a) is self.get_catalog(app_b))
+
+    def test_compact_not_shared_with_plain(self):
+        app_a = self.create_shared_app()
+        app_b = self.create_app('de')
+        app_b.config.update(XUANZANG_SHARE_CATALOGS=True,
+                            XUANZANG_COMPACT_CATALOGS=True)
+        Xuanzang(app_b)
+        self.assertFalse(self.get_catalog(app_a) is self.get_catalog(app_b))
+
+    def test_refresh_per_directory(self):
+        app_a = self.create_shared_app()
+        app_b = self.create_shared_app()
+        before = self.get_catalog(app_b)
+        with app_a.app_context():
+            app_a.extensions['xuanzang'].refresh_translations()
+        after = self.get_catalog(app_b)
+        self.assertFalse(after is before)
+        self.assertTrue(self.get_catalog(app_a) is after)
+
+    def test_overlay_follows_reload(self):
+        app_a = self.create_shared_app()
+        app_b = self.create_shared_app(
+            tenant_selector=lambda: 'acme',
+            overlay_loader=lambda tenant, locale: {'Small': 'Winzig'})
+        overlay = self.get_catalog(app_b)
+        with app_a.app_context():
+            app_a.extensions['xuanzang'].refresh_translations()
+        self.get_catalog(app_a)
+        reloaded = self.get_catalog(app_b)
+        self.assertFalse(reloaded is overlay)
+        self.assertTrue(reloaded._fallback is self.get_catalog(app_a))
+
+    def test_released(self):
+        app_a = self.create_shared_app()
+        app_b = self.create_shared_app()
+        self.get_catalog(app_a)
+        app_a.extensions['xuanzang'].close()
+        self.assertEqual(registry._sets[self.key()].refcount, 1)
+        del app_a, app_b
+        gc.collect()
+        self.assertFalse(self.key() in registry)